@@ -1,6 +1,6 @@
 # api.py
 from fastapi import APIRouter
-from app.api.v1.endpoints import applications, customers, licenses, activations, validation, activation_forms, auth
+from app.api.v1.endpoints import applications, customers, licenses, activations, validation, activation_forms, auth, stats, admin
 
 api_router = APIRouter()
 
@@ -12,3 +12,5 @@ api_router.include_router(licenses.router, prefix="/licenses", tags=["Licenses"]
 api_router.include_router(activations.router, prefix="/activations", tags=["Activations"])
 api_router.include_router(validation.router, prefix="/validation", tags=["Validation"])
 api_router.include_router(activation_forms.router, prefix="/activation-forms", tags=["Activation Forms"])
+api_router.include_router(stats.router, prefix="/stats", tags=["Statistics"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Administration"])
\ No newline at end of file
@@ -1,51 +1,98 @@
-from fastapi import APIRouter, Depends, status
-from typing import List
-from app.services.activation_form_service import ActivationFormService
+import csv
+import io
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database.postgres import get_async_session
+from app.services.activation_form_service import ActivationFormService, stream_offline_activation_codes
 from app.models.schemas import (
     ActivationFormCreate, ActivationFormResponse, ActivationFormComplete,
     OfflineActivationCodeCreate, OfflineActivationCodeResponse
 )
-from app.dependencies import get_activation_form_service
+from app.models.database import ActivationFormStatus, User
+from app.config import settings
+from app.dependencies import require_activation_read, require_license_write
 
 router = APIRouter()
 
 @router.post("/", response_model=ActivationFormResponse, status_code=status.HTTP_201_CREATED)
-def create_activation_form(
+async def create_activation_form(
     form_data: ActivationFormCreate,
-    service: ActivationFormService = Depends(get_activation_form_service)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Create a new activation form request (for offline computers)"""
-    return service.create_activation_form(form_data)
+    return await db.run_sync(lambda db: ActivationFormService(db).create_activation_form(form_data))
 
 @router.post("/complete", response_model=ActivationFormResponse)
-def complete_activation_form(
+async def complete_activation_form(
     complete_data: ActivationFormComplete,
-    service: ActivationFormService = Depends(get_activation_form_service)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Complete an activation form with activation code"""
-    return service.complete_activation_form(complete_data)
+    return await db.run_sync(lambda db: ActivationFormService(db).complete_activation_form(complete_data))
 
 @router.post("/offline-codes", response_model=List[OfflineActivationCodeResponse])
-def generate_offline_codes(
+async def generate_offline_codes(
     code_data: OfflineActivationCodeCreate,
-    service: ActivationFormService = Depends(get_activation_form_service)
+    current_user: User = Depends(require_license_write()),
+    db: AsyncSession = Depends(get_async_session)
 ):
-    """Generate offline activation codes for a license"""
-    return service.generate_offline_activation_codes(code_data)
+    """Generate offline activation codes for a license you own"""
+    if code_data.quantity > settings.offline_code_json_max_quantity:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.offline_code_json_max_quantity} codes are returned as JSON; "
+                   f"use /offline-codes/export for larger quantities"
+        )
+    return await db.run_sync(
+        lambda db: ActivationFormService(db).generate_offline_activation_codes(code_data, current_user)
+    )
+
+@router.post("/offline-codes/export")
+async def export_offline_codes(
+    code_data: OfflineActivationCodeCreate,
+    current_user: User = Depends(require_license_write()),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """Generate offline activation codes for a license you own as a streamed CSV download"""
+    batches = await stream_offline_activation_codes(db, code_data, current_user)
+    
+    async def csv_lines():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["activation_code", "license_key_id", "machine_id", "expires_at"])
+        async for batch in batches:
+            for code in batch:
+                writer.writerow([code.activation_code, code.license_key_id, code.machine_id or "", code.expires_at.isoformat()])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    filename = f"offline-codes-license-{code_data.license_key_id}.csv"
+    return StreamingResponse(
+        csv_lines(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.get("/", response_model=List[ActivationFormResponse])
-def list_activation_forms(
+async def list_activation_forms(
     skip: int = 0,
     limit: int = 100,
-    service: ActivationFormService = Depends(get_activation_form_service)
+    status: Optional[ActivationFormStatus] = None,
+    current_user: User = Depends(require_activation_read()),
+    db: AsyncSession = Depends(get_async_session)
 ):
-    """List all activation forms"""
-    return service.list_activation_forms(skip=skip, limit=limit)
+    """List activation forms for your licenses, optionally filtered by status"""
+    return await db.run_sync(
+        lambda db: ActivationFormService(db).list_activation_forms(skip=skip, limit=limit, status=status, owner=current_user)
+    )
 
 @router.get("/{form_id}", response_model=ActivationFormResponse)
-def get_activation_form(
+async def get_activation_form(
     form_id: int,
-    service: ActivationFormService = Depends(get_activation_form_service)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Get a specific activation form"""
-    return service.get_activation_form(form_id) 
\ No newline at end of file
+    return await db.run_sync(lambda db: ActivationFormService(db).get_activation_form(form_id)) 
\ No newline at end of file
@@ -1,39 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database.postgres import get_async_session
 from app.services.activation_service import ActivationService
-from app.models.schemas import ActivationResponse
+from app.models.schemas import ActivationResponse, ActivationBulkDeactivate, ActivationBulkDeactivateResponse
 from app.models.database import User
-from app.dependencies import get_activation_service, require_activation_read, require_activation_delete
+from app.dependencies import require_activation_read, require_activation_delete
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ActivationResponse])
-def list_activations(
+async def list_activations(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(require_activation_read()),
-    service: ActivationService = Depends(get_activation_service)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """List activations for the authenticated user"""
-    return service.list_activations_for_user(current_user, skip=skip, limit=limit)
+    return await db.run_sync(
+        lambda db: ActivationService(db).list_activations_for_user(current_user, skip=skip, limit=limit)
+    )
 
 @router.get("/license/{license_id}", response_model=List[ActivationResponse])
-def get_license_activations(
+async def get_license_activations(
     license_id: int,
     current_user: User = Depends(require_activation_read()),
-    service: ActivationService = Depends(get_activation_service)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Get all activations for a specific license (user must own the license)"""
-    return service.get_activations_for_license(license_id, current_user)
+    return await db.run_sync(lambda db: ActivationService(db).get_activations_for_license(license_id, current_user))
+
+@router.post("/bulk-deactivate", response_model=ActivationBulkDeactivateResponse)
+async def deactivate_machines(
+    bulk_data: ActivationBulkDeactivate,
+    current_user: User = Depends(require_activation_delete()),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """Deactivate many machines at once (ids the user does not own are skipped)"""
+    deactivated = await db.run_sync(
+        lambda db: ActivationService(db).deactivate_machines(bulk_data.activation_ids, current_user)
+    )
+    return ActivationBulkDeactivateResponse(
+        requested=len(bulk_data.activation_ids),
+        deactivated=deactivated
+    )
 
 @router.delete("/{activation_id}")
-def deactivate_machine(
+async def deactivate_machine(
     activation_id: int,
     current_user: User = Depends(require_activation_delete()),
-    service: ActivationService = Depends(get_activation_service)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Deactivate a machine (user must own the activation)"""
-    success = service.deactivate_machine(activation_id, current_user)
+    success = await db.run_sync(lambda db: ActivationService(db).deactivate_machine(activation_id, current_user))
     if not success:
         raise HTTPException(status_code=404, detail="Activation not found or access denied")
     return {"message": "Machine deactivated successfully"}
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+System administration endpoints
+"""
+from fastapi import APIRouter, Depends
+
+from app.config import settings
+from app.database.pool import pool_statistics, select_pool_profile
+from app.models.schemas import DatabasePoolsResponse
+from app.models.database import User
+from app.dependencies import require_admin
+
+router = APIRouter()
+
+
+@router.get("/database/pools", response_model=DatabasePoolsResponse)
+async def get_database_pools(
+    current_user: User = Depends(require_admin())
+) -> DatabasePoolsResponse:
+    """Connection pool statistics for this worker (system admin only)"""
+    return DatabasePoolsResponse(
+        profile=select_pool_profile(),
+        mode=settings.database_pool_mode,
+        pools=pool_statistics()
+    )
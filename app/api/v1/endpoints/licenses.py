@@ -4,11 +4,14 @@ License endpoints for managing license keys
 from typing import List, Union
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.services.license_service import LicenseService
-from app.models.schemas import LicenseKeyCreate, LicenseKeyResponse, LicenseKeyUpdate, LicenseKeyWithRelationsResponse
+from app.services.license_service import AsyncLicenseService
+from app.models.schemas import (
+    LicenseKeyCreate, LicenseKeyResponse, LicenseKeyUpdate, LicenseKeyWithRelationsResponse,
+    LicenseBulkStatusUpdate, LicenseBulkStatusResponse
+)
 from app.models.database import User
 from app.dependencies import (
-    get_license_service, require_license_read, require_license_write, 
+    conditional_get, get_license_service, require_license_read, require_license_write, 
     require_license_delete
 )
 
@@ -16,58 +19,67 @@ router = APIRouter()
 
 
 @router.post("/", response_model=LicenseKeyResponse, status_code=status.HTTP_201_CREATED)
-def create_license(
+async def create_license(
     license_data: LicenseKeyCreate,
     current_user: User = Depends(require_license_write()),
-    service: LicenseService = Depends(get_license_service)
+    service: AsyncLicenseService = Depends(get_license_service)
 ) -> LicenseKeyResponse:
     """Create a new license key"""
-    return service.create_license(license_data, current_user)
+    return await service.create_license(license_data, current_user)
 
 
 @router.get("/", response_model=List[Union[LicenseKeyResponse, LicenseKeyWithRelationsResponse]])
-def list_licenses(
+async def list_licenses(
     skip: int = 0,
     limit: int = 100,
     include_relations: bool = False,
-    current_user: User = Depends(require_license_read()),
-    service: LicenseService = Depends(get_license_service)
+    current_user: User = Depends(conditional_get(require_license_read())),
+    service: AsyncLicenseService = Depends(get_license_service)
 ) -> List[Union[LicenseKeyResponse, LicenseKeyWithRelationsResponse]]:
     """List all licenses for the authenticated user"""
-    return service.list_licenses(current_user, skip=skip, limit=limit, include_relations=include_relations)
+    return await service.list_licenses(current_user, skip=skip, limit=limit, include_relations=include_relations)
+
 
 
+@router.post("/bulk-status", response_model=LicenseBulkStatusResponse)
+async def bulk_update_license_status(
+    bulk_update: LicenseBulkStatusUpdate,
+    current_user: User = Depends(require_license_write()),
+    service: AsyncLicenseService = Depends(get_license_service)
+) -> LicenseBulkStatusResponse:
+    """Block, unblock, revoke or suspend every license matching a filter (use dry_run to count first)"""
+    return await service.bulk_update_status(bulk_update, current_user)
 
 
 @router.get("/{license_id}", response_model=LicenseKeyResponse)
-def get_license(
+async def get_license(
     license_id: int,
-    current_user: User = Depends(require_license_read()),
-    service: LicenseService = Depends(get_license_service)
+    current_user: User = Depends(conditional_get(require_license_read())),
+    service: AsyncLicenseService = Depends(get_license_service)
 ) -> LicenseKeyResponse:
     """Get a specific license"""
-    return service.get_license(license_id, current_user)
+    return await service.get_license(license_id, current_user)
 
 
 @router.put("/{license_id}", response_model=LicenseKeyResponse)
-def update_license(
+async def update_license(
     license_id: int,
     license_update: LicenseKeyUpdate,
     current_user: User = Depends(require_license_write()),
-    service: LicenseService = Depends(get_license_service)
+    service: AsyncLicenseService = Depends(get_license_service)
 ) -> LicenseKeyResponse:
     """Update a license"""
-    return service.update_license(license_id, license_update, current_user)
+    return await service.update_license(license_id, license_update, current_user)
 
 
 @router.delete("/{license_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_license(
+async def delete_license(
     license_id: int,
     current_user: User = Depends(require_license_delete()),
-    service: LicenseService = Depends(get_license_service)
+    service: AsyncLicenseService = Depends(get_license_service)
 ):
     """Delete a license"""
-    success = service.delete_license(license_id, current_user)
+    success = await service.delete_license(license_id, current_user)
     if not success:
         raise HTTPException(status_code=404, detail="License not found")
     
@@ -75,20 +87,20 @@ def delete_license(
 
 
 @router.post("/{license_id}/block", response_model=LicenseKeyResponse)
-def block_license(
+async def block_license(
     license_id: int,
     current_user: User = Depends(require_license_write()),
-    service: LicenseService = Depends(get_license_service)
+    service: AsyncLicenseService = Depends(get_license_service)
 ) -> LicenseKeyResponse:
     """Block a license key"""
-    return service.block_license(license_id, current_user)
+    return await service.block_license(license_id, current_user)
 
 
 @router.post("/{license_id}/unblock", response_model=LicenseKeyResponse)
-def unblock_license(
+async def unblock_license(
     license_id: int,
     current_user: User = Depends(require_license_write()),
-    service: LicenseService = Depends(get_license_service)
+    service: AsyncLicenseService = Depends(get_license_service)
 ) -> LicenseKeyResponse:
     """Unblock a license key"""
-    return service.unblock_license(license_id, current_user)
\ No newline at end of file
+    return await service.unblock_license(license_id, current_user)
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Stats endpoints for the dashboard
+"""
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database.postgres import get_async_session
+from app.services.stats_service import StatsService
+from app.models.schemas import DashboardStatsResponse
+from app.models.database import User
+from app.dependencies import require_license_read
+
+router = APIRouter()
+
+
+@router.get("/", response_model=DashboardStatsResponse)
+async def get_stats(
+    current_user: User = Depends(require_license_read()),
+    db: AsyncSession = Depends(get_async_session)
+) -> DashboardStatsResponse:
+    """Get dashboard counters for the authenticated user"""
+    return await db.run_sync(lambda db: StatsService(db).get_stats(current_user))
@@ -1,26 +1,30 @@
 from fastapi import APIRouter, Depends, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database.postgres import get_async_session
 from app.services.validation_service import ValidationService
 from app.models.schemas import LicenseValidationRequest, LicenseValidationResponse
-from app.dependencies import get_validation_service
+from app.models.database import ActivationEventType
 
 router = APIRouter()
 
 @router.post("/", response_model=LicenseValidationResponse)
-def validate_license(
+async def validate_license(
     request: LicenseValidationRequest,
     client_request: Request,
-    service: ValidationService = Depends(get_validation_service)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Validate a license key and machine combination"""
     client_ip = client_request.client.host if client_request.client else None
-    return service.validate_license(request, client_ip)
+    return await db.run_sync(lambda db: ValidationService(db).validate_license(request, client_ip))
 
 @router.post("/heartbeat", response_model=LicenseValidationResponse)
-def license_heartbeat(
+async def license_heartbeat(
     request: LicenseValidationRequest,
     client_request: Request,
-    service: ValidationService = Depends(get_validation_service)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """Send a heartbeat to keep activation alive (same as validation)"""
     client_ip = client_request.client.host if client_request.client else None
-    return service.validate_license(request, client_ip)
\ No newline at end of file
+    return await db.run_sync(
+        lambda db: ValidationService(db).validate_license(request, client_ip, event_type=ActivationEventType.HEARTBEAT)
+    )
\ No newline at end of file
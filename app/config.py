@@ -42,6 +42,99 @@ class Settings(BaseSettings):
         description="PostgreSQL port"
     )
     
+    # Startup
+    database_schema_check: Literal["revision", "create_all", "off"] = Field(
+        default="revision",
+        description="revision checks the Alembic revision at startup; create_all creates missing tables "
+                    "(throwaway databases only); off skips both"
+    )
+    database_ready_timeout_seconds: float = Field(
+        default=30.0,
+        description="Seconds to wait for PostgreSQL at startup"
+    )
+    database_ready_max_backoff_seconds: float = Field(
+        default=2.0,
+        description="Longest pause between PostgreSQL readiness attempts (backoff doubles from 50ms)"
+    )
+    
+    # Connection pool
+    database_pool_profile: Optional[Literal["development", "production", "docker"]] = Field(
+        default=None,
+        description="Pool size profile (default: docker in Docker, else production or development by NODE_ENV)"
+    )
+    database_pool_mode: Literal["queue", "pgbouncer"] = Field(
+        default="queue",
+        description="queue keeps a connection pool per worker; pgbouncer opens a connection per checkout "
+                    "through PgBouncer transaction pooling, without server-side prepared statements"
+    )
+    database_pool_size: Optional[int] = Field(
+        default=None,
+        description="Pool size per worker (overrides the profile)"
+    )
+    database_max_overflow: Optional[int] = Field(
+        default=None,
+        description="Connections per worker allowed beyond the pool size (overrides the profile)"
+    )
+    database_pool_timeout_seconds: float = Field(
+        default=30.0,
+        description="Seconds a request waits for a free connection before failing"
+    )
+    database_pool_liveness_interval_seconds: int = Field(
+        default=30,
+        description="Seconds between background pings of idle pooled connections (0 disables the job)"
+    )
+    
+    # Read replicas
+    database_replica_urls: List[str] = Field(
+        default=[],
+        description="Read replica connection URLs for read-only queries (JSON list; empty routes everything to the primary)"
+    )
+    database_replica_max_lag_seconds: float = Field(
+        default=5.0,
+        description="Replicas lagging the primary by more than this are skipped"
+    )
+    database_replica_check_interval_seconds: int = Field(
+        default=5,
+        description="Seconds between replica lag checks"
+    )
+    database_read_your_writes_seconds: float = Field(
+        default=10.0,
+        description="Seconds a user's reads stay on the primary after they write"
+    )
+    
+    # Statement caching
+    sql_compiled_cache_size: int = Field(
+        default=1000,
+        description="Compiled SQL statements cached per engine"
+    )
+    asyncpg_prepared_statement_cache_size: int = Field(
+        default=500,
+        description="Prepared statements asyncpg keeps per connection"
+    )
+    
+    # Cache invalidation
+    cache_invalidation_listen: bool = Field(
+        default=True,
+        description="Evict local cache entries on NOTIFY from other workers (PostgreSQL LISTEN/NOTIFY)"
+    )
+    cache_invalidation_channel: str = Field(
+        default="cache_invalidation",
+        description="PostgreSQL NOTIFY channel for cache invalidations"
+    )
+    cache_invalidation_database_url: Optional[str] = Field(
+        default=None,
+        description="Direct PostgreSQL URL for the LISTEN connection (required behind PgBouncer "
+                    "transaction pooling, which does not support LISTEN); defaults to DATABASE_URL"
+    )
+    cache_invalidation_keepalive_seconds: float = Field(
+        default=30.0,
+        description="Seconds between keepalive queries on the LISTEN connection"
+    )
+    cache_invalidation_max_backoff_seconds: float = Field(
+        default=30.0,
+        description="Longest wait between LISTEN reconnection attempts"
+    )
+    
     # App Managed Database Settings
     app_managed_db: bool = Field(
         default=False,
@@ -71,6 +164,15 @@ class Settings(BaseSettings):
         default="your-super-secret-key-change-in-production-use-openssl-rand-hex-32",
         description="Secret key for JWT tokens"
     )
+    api_token_cache_seconds: float = Field(
+        default=60.0,
+        description="Seconds a verified API token is kept in worker memory (0 disables the cache); "
+                    "changes made through the API evict it in every worker, other changes wait for expiry"
+    )
+    api_token_last_used_interval_seconds: float = Field(
+        default=60.0,
+        description="Seconds between last_used_at writes for an API token answered from the cache"
+    )
     
     # License settings
     license_key_length: int = Field(
@@ -85,6 +187,72 @@ class Settings(BaseSettings):
         default=1,
         description="Default maximum activations per license"
     )
+    bulk_status_chunk_size: int = Field(
+        default=1000,
+        description="Licenses updated per statement in bulk status changes"
+    )
+    stats_reconcile_interval_seconds: int = Field(
+        default=900,
+        description="Seconds between dashboard counter recounts (0 disables the job)"
+    )
+    heartbeat_write_interval_seconds: int = Field(
+        default=60,
+        description="Minimum seconds between last_heartbeat writes for the same activation"
+    )
+    activation_heartbeat_ttl_seconds: int = Field(
+        default=90 * 24 * 3600,
+        description="Seconds without a heartbeat before an activation is reaped (per-application override, 0 disables)"
+    )
+    activation_reaper_interval_seconds: int = Field(
+        default=300,
+        description="Seconds between stale activation reaper runs (0 disables the job)"
+    )
+    activation_reaper_batch_size: int = Field(
+        default=500,
+        description="Stale activations reaped per statement"
+    )
+    activation_form_sweep_interval_seconds: int = Field(
+        default=300,
+        description="Seconds between sweeps that expire pending forms and unused offline codes (0 disables the job)"
+    )
+    activation_form_sweep_batch_size: int = Field(
+        default=1000,
+        description="Activation forms or offline codes swept per statement"
+    )
+    offline_code_batch_size: int = Field(
+        default=1000,
+        description="Offline activation codes inserted per statement"
+    )
+    offline_code_max_quantity: int = Field(
+        default=100000,
+        description="Most offline activation codes generated per request"
+    )
+    offline_code_json_max_quantity: int = Field(
+        default=1000,
+        description="Most offline activation codes returned as JSON (larger requests use the CSV export)"
+    )
+    
+    # Activation event history
+    activation_event_batch_size: int = Field(
+        default=500,
+        description="Activation events written per INSERT (a full buffer wakes the background flush)"
+    )
+    activation_event_flush_interval_seconds: int = Field(
+        default=5,
+        description="Seconds between background flushes of buffered activation events"
+    )
+    activation_event_retention_months: int = Field(
+        default=12,
+        description="Months of activation event history kept before partitions are dropped"
+    )
+    activation_event_partitions_ahead: int = Field(
+        default=2,
+        description="Monthly activation event partitions created ahead of time"
+    )
+    activation_event_maintenance_interval_seconds: int = Field(
+        default=3600,
+        description="Seconds between activation event partition maintenance runs"
+    )
     
     # API settings
     api_v1_prefix: str = Field(
@@ -96,6 +264,24 @@ class Settings(BaseSettings):
         description="CORS allowed origins"
     )
     
+    # Response compression
+    compression_minimum_size: int = Field(
+        default=4096,
+        description="Responses smaller than this many bytes are sent uncompressed"
+    )
+    compression_excluded_paths: List[str] = Field(
+        default=["/api/v1/validation", "/health"],
+        description="Path prefixes never compressed (small, latency-sensitive responses)"
+    )
+    compression_gzip_level: int = Field(
+        default=6,
+        description="gzip compression level (1-9)"
+    )
+    compression_brotli_quality: int = Field(
+        default=4,
+        description="Brotli quality (0-11) when the brotli package is installed"
+    )
+    
     # Rate limiting
     rate_limit_requests: int = Field(
         default=100,
@@ -126,15 +312,17 @@ class Settings(BaseSettings):
     def construct_database_url(self):
         """Construct database URL if not provided"""
         if not self.database_url or self.database_url.strip() == "":
-            # Check if app-managed PostgreSQL container is running
-            try:
-                from app.scripts.db_management import is_app_managed_postgres_running, get_app_managed_postgres_url
-                if self.app_managed_db and is_app_managed_postgres_running():
-                    self.database_url = get_app_managed_postgres_url()
-                    logger.info(f"Using app-managed PostgreSQL: {self.database_url}")
-                    return self
-            except ImportError:
-                pass
+            # Check if app-managed PostgreSQL container is running (only when enabled:
+            # the check shells out to docker)
+            if self.app_managed_db:
+                try:
+                    from app.scripts.db_management import is_app_managed_postgres_running, get_app_managed_postgres_url
+                    if is_app_managed_postgres_running():
+                        self.database_url = get_app_managed_postgres_url()
+                        logger.info(f"Using app-managed PostgreSQL: {self.database_url}")
+                        return self
+                except ImportError:
+                    pass
             
             # Use PostgreSQL with environment settings
             if self.postgres_password:
@@ -0,0 +1,93 @@
+"""
+In-process caches shared by the service layer (kept coherent across workers
+by app.database.invalidation)
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+# Cache names
+API_TOKEN_CACHE = "api_token"  # keyed by API token hash
+
+
+class LocalCache:
+    """Thread-safe TTL cache held in worker memory"""
+
+    def __init__(self, name: str, ttl_seconds: float = 60, max_entries: int = 10000):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value for the configured TTL"""
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Drop the oldest insertion to stay bounded
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Evict a single key"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_many(self, keys: Iterable[Hashable]) -> int:
+        """Evict several keys under one lock acquisition"""
+        evicted = 0
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        """Evict everything"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_caches: Dict[str, LocalCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name: str, ttl_seconds: float = 60, max_entries: int = 10000) -> LocalCache:
+    """Get (or create) a named cache"""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = LocalCache(name, ttl_seconds=ttl_seconds, max_entries=max_entries)
+            _caches[name] = cache
+        return cache
+
+
+def invalidate(name: str, keys: Iterable[Hashable]) -> int:
+    """Evict keys from a named cache, if that cache exists in this worker"""
+    cache = _caches.get(name)
+    if cache is None:
+        return 0
+    return cache.invalidate_many(keys)
+
+
+def clear_all() -> None:
+    """Evict every entry from every cache in this worker"""
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
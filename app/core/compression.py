@@ -0,0 +1,154 @@
+"""
+Negotiated gzip/brotli response compression for large JSON responses
+"""
+import asyncio
+import gzip
+from typing import List, Optional, Sequence
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/graphql-response+json")
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """Codings the client accepts (q > 0), most preferred first"""
+    weighted = []
+    for position, part in enumerate(accept_encoding.split(",")):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            weighted.append((-quality, position, coding))
+    return [coding for _, _, coding in sorted(weighted)]
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """br when the client takes it and brotli is installed, else gzip, else None"""
+    if not accept_encoding:
+        return None
+    for coding in accepted_encodings(accept_encoding):
+        if coding == "br" and brotli is not None:
+            return "br"
+        if coding == "gzip":
+            return "gzip"
+        if coding == "*":
+            return "br" if brotli is not None else "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """Compress a response body with the chosen coding"""
+    if encoding == "br":
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """Compress complete (non-streamed) responses of at least minimum_size bytes
+
+    Small responses and excluded paths (license validation) go out untouched:
+    compressing them costs more latency than the bytes it saves. Compression
+    runs in a worker thread so large bodies do not stall the event loop.
+    Streamed responses are passed through as they are.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 4096,
+        excluded_paths: Sequence[str] = (),
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.excluded_paths = tuple(excluded_paths)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self, encoding, send).run(scope, receive)
+
+
+class _CompressingResponder:
+    """Holds back the response start until the body shows whether to compress it"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.middleware.minimum_size:
+            # Streamed or small: send as is
+            self.passthrough = True
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        compressed = await asyncio.to_thread(
+            compress, body, self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        headers = MutableHeaders(raw=self.start["headers"])
+        if len(compressed) >= len(body):
+            headers.add_vary_header("Accept-Encoding")
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The encoded bytes differ from the identity representation
+            headers["ETag"] = f"W/{etag}"
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": compressed})
@@ -128,26 +128,27 @@ def get_database_config(environment: str = "development") -> Dict[str, Any]:
     # Import here to avoid circular import
     from app.config import settings
     
+    # Sizes of the one pool each server worker keeps: every endpoint and background
+    # job runs on the async engine (sync services through AsyncSession.run_sync).
+    # Scripts and CLI tools open their own sync engine with the same sizes.
+    # Dead connections are found by the periodic liveness check, not a pre-ping per checkout
     return {
         "development": {
             "url": settings.database_url,
             "pool_size": 5,
             "max_overflow": 10,
-            "pool_pre_ping": True,
             "pool_recycle": 300
         },
         "production": {
             "url": settings.database_url,
             "pool_size": 20,
             "max_overflow": 30,
-            "pool_pre_ping": True,
             "pool_recycle": 3600
         },
         "docker": {
             "url": settings.database_url,
             "pool_size": 10,
             "max_overflow": 20,
-            "pool_pre_ping": True,
             "pool_recycle": 300
         }
     }[environment]
@@ -0,0 +1,21 @@
+"""
+Weak ETags derived from a per-user change version rather than the response body
+"""
+from typing import Optional
+from app.config import settings
+
+
+def user_etag(user_id: int, change_version: int) -> str:
+    """Weak ETag for everything the user can read at this change version (the app
+    version is included so a deploy that changes response shapes revalidates)"""
+    return f'W/"{user_id}-{change_version}-{settings.app_version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
@@ -0,0 +1,29 @@
+"""
+ASGI apps built on first request, keeping optional subsystems out of startup
+"""
+import asyncio
+from typing import Callable, Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class LazyASGIApp:
+    """Build the wrapped app (and import what it needs) on the first request"""
+
+    def __init__(self, factory: Callable[[], ASGIApp]):
+        self.factory = factory
+        self._app: Optional[ASGIApp] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def load(self) -> ASGIApp:
+        """The wrapped app, building it once (imports run in a thread, off the event loop)"""
+        if self._app is None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._app is None:
+                    self._app = await asyncio.to_thread(self.factory)
+        return self._app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        app = await self.load()
+        await app(scope, receive, send)
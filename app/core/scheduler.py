@@ -0,0 +1,102 @@
+"""
+Periodic background jobs run inside each worker's event loop
+"""
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run a job every interval: blocking jobs in a worker thread, coroutine
+    functions on the event loop (for work on the loop's own connections)"""
+
+    def __init__(self, name: str, interval_seconds: float, job: Callable[[], object], run_at_start: bool = False):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.job = job
+        self.run_at_start = run_at_start
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    async def run_once(self) -> None:
+        """Run the job once, logging any failure"""
+        try:
+            if asyncio.iscoroutinefunction(self.job):
+                result = await self.job()
+            else:
+                result = await asyncio.to_thread(self.job)
+            logger.debug(f"Periodic task {self.name} finished: {result}")
+        except Exception:
+            logger.exception(f"Periodic task {self.name} failed")
+
+    async def _run(self) -> None:
+        if self.run_at_start:
+            await self.run_once()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.run_once()
+
+    def start(self) -> None:
+        """Start the loop (no-op when the interval is disabled or already running)"""
+        if self.interval_seconds <= 0 or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name=f"periodic:{self.name}")
+        logger.info(f"Started periodic task {self.name} every {self.interval_seconds}s")
+
+    def wake(self) -> bool:
+        """Run the job now instead of at the end of the interval (safe from any thread);
+        returns False when the loop is not running"""
+        if self._task is None:
+            return False
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:  # the loop has closed
+            return False
+        return True
+
+    async def stop(self) -> None:
+        """Cancel the loop and wait for it to finish"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_tasks: List[PeriodicTask] = []
+
+
+def register_periodic_task(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], object],
+    run_at_start: bool = False
+) -> PeriodicTask:
+    """Register a job to be started with the application"""
+    task = PeriodicTask(name, interval_seconds, job, run_at_start=run_at_start)
+    _tasks.append(task)
+    return task
+
+
+def start_periodic_tasks() -> None:
+    """Start every registered job"""
+    for task in _tasks:
+        task.start()
+
+
+async def stop_periodic_tasks() -> None:
+    """Stop every registered job"""
+    for task in _tasks:
+        await task.stop()
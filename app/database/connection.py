@@ -3,7 +3,8 @@ from sqlmodel import SQLModel, create_engine, Session
 from typing import Generator
 import logging
 from app.config import settings
-from app.core.constants import get_database_config, is_docker_environment
+from app.database.pool import engine_options, pool_config, select_pool_profile
+from app.database.replicas import RoutingSession
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -18,22 +19,15 @@ def get_database_type():
     else:
         return "Unknown"
 
-# Get database configuration based on environment
-env = "docker" if is_docker_environment() else "development"
-db_config = get_database_config(env)
+# Get pool configuration for the selected profile
+env = select_pool_profile()
+db_config = pool_config()
 
-# PostgreSQL connection
-connect_args = {}
-
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug,
-    connect_args=connect_args,
-    pool_pre_ping=db_config["pool_pre_ping"],
-    pool_recycle=db_config["pool_recycle"],
-    pool_size=db_config["pool_size"],
-    max_overflow=db_config["max_overflow"]
-)
+# PostgreSQL connection for scripts and CLI tools. The server never checks out
+# from it: requests and background jobs share the async engine's pool in
+# app/database/postgres.py, running sync services through AsyncSession.run_sync.
+# Its pool opens connections on first use, so a server worker holds none here.
+engine = create_engine(settings.database_url, **engine_options(db_config))
 
 def create_db_and_tables():
     """Create database tables"""
@@ -43,6 +37,6 @@ def create_db_and_tables():
     logger.info("Database tables created successfully")
 
 def get_session() -> Generator[Session, None, None]:
-    """Get database session"""
-    with Session(engine) as session:
+    """Get a sync database session for scripts (read-only service methods may use a replica)"""
+    with RoutingSession(engine) as session:
         yield session
\ No newline at end of file
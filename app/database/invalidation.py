@@ -0,0 +1,161 @@
+"""
+Cross-worker cache invalidation over PostgreSQL LISTEN/NOTIFY: services queue
+evictions on their session, the commit sends them as NOTIFY messages, and every
+worker LISTENs on one asyncpg connection and evicts the entries from its caches
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core import cache
+
+logger = logging.getLogger(__name__)
+
+# Session.info key: cache name -> keys to evict once the transaction commits
+PENDING_INVALIDATIONS = "pending_invalidations"
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+INITIAL_BACKOFF_SECONDS = 0.5
+
+
+def invalidate_on_commit(db, name: str, keys: Iterable[Hashable]) -> None:
+    """Evict keys from a named cache in every worker when the session's transaction
+    commits (nothing is evicted or sent if it rolls back)"""
+    session = getattr(db, "sync_session", db)
+    pending: Dict[str, Set[Hashable]] = session.info.setdefault(PENDING_INVALIDATIONS, {})
+    pending.setdefault(name, set()).update(keys)
+
+
+def invalidation_payloads(name: str, keys: Iterable[Hashable]) -> List[str]:
+    """JSON NOTIFY payloads carrying the keys, split to fit the payload limit"""
+    overhead = len(json.dumps({"cache": name, "keys": []}))
+    payloads, batch, size = [], [], overhead
+    for key in keys:
+        key_size = len(json.dumps(key)) + 2  # separator
+        if batch and size + key_size > MAX_PAYLOAD_BYTES:
+            payloads.append(json.dumps({"cache": name, "keys": batch}))
+            batch, size = [], overhead
+        batch.append(key)
+        size += key_size
+    if batch:
+        payloads.append(json.dumps({"cache": name, "keys": batch}))
+    return payloads
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_invalidations(session):
+    # NOTIFY is transactional: other workers only hear it if this commit succeeds
+    for name, keys in session.info.get(PENDING_INVALIDATIONS, {}).items():
+        for payload in invalidation_payloads(name, keys):
+            session.execute(select(func.pg_notify(settings.cache_invalidation_channel, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_local(session):
+    for name, keys in session.info.pop(PENDING_INVALIDATIONS, {}).items():
+        cache.invalidate(name, keys)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session, previous_transaction):
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+class InvalidationListener:
+    """The worker's LISTEN connection. It reconnects with exponential backoff, and
+    local caches are flushed around every gap, since notifications sent while it
+    was disconnected are lost"""
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self.connected = False
+        self.received = 0
+        self.gaps = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        """Evict the keys a NOTIFY message names from this worker's cache"""
+        try:
+            message = json.loads(payload)
+            cache.invalidate(message["cache"], message["keys"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed cache invalidation: {payload[:200]}")
+            return
+        self.received += 1
+
+    async def _watch(self, connection: asyncpg.Connection, lost: asyncio.Event) -> None:
+        """Return once the connection is closed or stops answering keepalives"""
+        keepalive = settings.cache_invalidation_keepalive_seconds
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(lost.wait(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                await asyncio.wait_for(connection.execute("SELECT 1"), timeout=keepalive)
+
+    async def _run(self) -> None:
+        backoff = INITIAL_BACKOFF_SECONDS
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self.on_notification)
+                # Entries cached before LISTEN started may already be stale
+                cache.clear_all()
+                self.connected = True
+                backoff = INITIAL_BACKOFF_SECONDS
+                logger.info(f"Listening for cache invalidations on {self.channel}")
+                await self._watch(connection, lost)
+                logger.warning("Cache invalidation connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed: {e}; retrying in {backoff:.1f}s")
+            finally:
+                if self.connected:
+                    self.gaps += 1
+                    cache.clear_all()
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, settings.cache_invalidation_max_backoff_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="cache-invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+listener = InvalidationListener(
+    settings.cache_invalidation_database_url or settings.database_url,
+    settings.cache_invalidation_channel
+)
+
+
+def start_invalidation_listener() -> None:
+    """Start this worker's LISTEN connection (no-op when disabled)"""
+    if settings.cache_invalidation_listen:
+        listener.start()
+
+
+async def stop_invalidation_listener() -> None:
+    await listener.stop()
@@ -0,0 +1,236 @@
+"""
+Connection pool configuration and observability: the pool profile, the
+PgBouncer (NullPool) mode, checkout wait statistics and background liveness checks
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from app.config import settings, is_production
+from app.core.constants import get_database_config, is_docker_environment
+
+logger = logging.getLogger(__name__)
+
+PGBOUNCER_MODE = "pgbouncer"
+
+
+class CheckoutStats:
+    """Running totals of the time spent obtaining connections from a pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait_seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.in_use += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def returned(self) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+
+class _TimedCheckout:
+    """Pool mixin measuring how long each checkout waits (queueing for a free
+    connection or opening a new one)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.checkout_stats.record(time.perf_counter() - start, timed_out=False)
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        self.checkout_stats.returned()
+        super()._do_return_conn(record)
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool; keep the totals across it
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def select_pool_profile() -> str:
+    """Pool profile from DATABASE_POOL_PROFILE, else docker/production/development by environment"""
+    if settings.database_pool_profile:
+        return settings.database_pool_profile
+    if is_docker_environment():
+        return "docker"
+    return "production" if is_production else "development"
+
+
+def pool_config() -> Dict[str, Any]:
+    """Pool sizes for the selected profile with any DATABASE_*_POOL_SIZE overrides applied"""
+    config = dict(get_database_config(select_pool_profile()))
+    overrides = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+    }
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    return config
+
+
+def is_pgbouncer_mode() -> bool:
+    """Whether connections go through PgBouncer in transaction pooling mode"""
+    return settings.database_pool_mode == PGBOUNCER_MODE
+
+
+def engine_options(config: Dict[str, Any], is_async: bool = False) -> Dict[str, Any]:
+    """create_engine/create_async_engine keyword arguments for the configured pool mode"""
+    options: Dict[str, Any] = {
+        "echo": settings.debug,
+        "query_cache_size": settings.sql_compiled_cache_size,
+    }
+    if is_pgbouncer_mode():
+        # PgBouncer owns the pooling: open a connection per checkout and hand it straight back
+        options["poolclass"] = TimedNullPool
+        if is_async:
+            # A transaction-pooled server connection may already hold (or later lose) any
+            # given statement name, so asyncpg must not cache or reuse prepared statements
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        pool_size=config["pool_size"],
+        max_overflow=config["max_overflow"],
+        pool_recycle=config["pool_recycle"],
+        pool_timeout=settings.database_pool_timeout_seconds,
+    )
+    if is_async:
+        options["connect_args"] = {"prepared_statement_cache_size": settings.asyncpg_prepared_statement_cache_size}
+    return options
+
+
+class PoolHealth:
+    """A registered engine and the outcome of its last liveness check"""
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.alive: Optional[bool] = None
+        self.checked_at: Optional[float] = None
+
+    @property
+    def pool(self):
+        return self.engine.sync_engine.pool
+
+    def idle_connections(self) -> int:
+        """Connections waiting in the pool (none are kept in PgBouncer mode)"""
+        pool = self.pool
+        return pool.checkedin() if isinstance(pool, QueuePool) else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Point-in-time pool statistics"""
+        pool = self.pool
+        queued = isinstance(pool, QueuePool)
+        checkout_stats: Optional[CheckoutStats] = getattr(pool, "checkout_stats", None)
+        checkouts = checkout_stats.checkouts if checkout_stats else 0
+        timeouts = checkout_stats.timeouts if checkout_stats else 0
+        total_wait = checkout_stats.total_wait_seconds if checkout_stats else 0.0
+        return {
+            "name": self.name,
+            "pool_class": type(pool).__name__,
+            "size": pool.size() if queued else 0,
+            "checked_in": pool.checkedin() if queued else 0,
+            "checked_out": pool.checkedout() if queued else (checkout_stats.in_use if checkout_stats else 0),
+            "overflow": pool.overflow() if queued else 0,
+            "max_overflow": pool._max_overflow if queued else 0,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "total_wait_ms": round(total_wait * 1000, 3),
+            "avg_wait_ms": round(total_wait / (checkouts + timeouts) * 1000, 3) if checkouts + timeouts else 0.0,
+            "max_wait_ms": round(checkout_stats.max_wait_seconds * 1000, 3) if checkout_stats else 0.0,
+            "alive": self.alive,
+            "seconds_since_liveness_check": (
+                round(time.monotonic() - self.checked_at, 1) if self.checked_at is not None else None
+            ),
+        }
+
+
+_pools: List[PoolHealth] = []
+
+
+def register_pool(name: str, engine: AsyncEngine) -> None:
+    """Track a server engine's pool for statistics and liveness checks"""
+    _pools.append(PoolHealth(name, engine))
+
+
+def pool_statistics() -> List[Dict[str, Any]]:
+    """Statistics for every registered pool"""
+    return [health.stats() for health in _pools]
+
+
+def _record_liveness(health: PoolHealth, error: Optional[Exception]) -> None:
+    if error is not None:
+        logger.warning(f"Pool {health.name} liveness check failed: {error}")
+    health.alive = error is None
+    health.checked_at = time.monotonic()
+
+
+async def _ping(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+# Pools hand out idle connections oldest first, so pinging once per idle
+# connection touches each of them. A dead one makes SQLAlchemy invalidate
+# every connection opened before it; the retry then checks a fresh connection
+# so a single stale socket is not reported as the database being down.
+async def check_pool_liveness() -> Dict[str, Optional[bool]]:
+    """Ping idle connections in every pool (must run on the event loop that owns them)"""
+    for health in _pools:
+        error = None
+        for _ in range(max(health.idle_connections(), 1)):
+            try:
+                await _ping(health.engine)
+            except Exception as e:
+                error = e
+                break
+        if error is not None:
+            try:
+                await _ping(health.engine)
+                error = None
+            except Exception as e:
+                error = e
+        _record_liveness(health, error)
+    return {health.name: health.alive for health in _pools}
@@ -2,29 +2,38 @@ import asyncio
 import socket
 import time
 import logging
+from typing import Set, Tuple
 import asyncpg
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.config import settings
+from app.core.constants import PROJECT_ROOT
+from app.database.connection import db_config
+from app.database.pool import engine_options, register_pool
+from app.database.replicas import RoutingSession
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
-# Create async engine for PostgreSQL
+class SchemaRevisionError(RuntimeError):
+    """The database is not migrated to the revision this code expects"""
+
+# Create async engine for PostgreSQL: the worker's only pool, shared by every
+# endpoint and background job (sync services run on it through run_sync)
 async_engine = create_async_engine(
     settings.database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=5,
-    max_overflow=10
+    **engine_options(db_config, is_async=True)
 )
+register_pool("primary", async_engine)
 
 # Create async session factory
 async_session = sessionmaker(
     async_engine, 
     class_=AsyncSession, 
+    sync_session_class=RoutingSession,
     expire_on_commit=False
 )
 
@@ -33,28 +42,31 @@ async def get_async_session() -> AsyncSession:
     async with async_session() as session:
         yield session
 
-async def wait_for_postgres_ready(uri: str = None, timeout: int = 30):
-    """Wait for PostgreSQL to be ready"""
+async def wait_for_postgres_ready(uri: str = None, timeout: float = None):
+    """Wait for PostgreSQL to be ready, retrying with exponential backoff"""
     if uri is None:
         uri = settings.database_url
+    if timeout is None:
+        timeout = settings.database_ready_timeout_seconds
     
-    # Convert to asyncpg format
-    raw_uri = uri.replace("postgresql://", "postgresql+asyncpg://", 1)
     logger.info(f"Waiting for PostgreSQL at {uri}")
     
-    start = asyncio.get_event_loop().time()
+    start = time.monotonic()
+    delay = 0.05
     while True:
+        remaining = timeout - (time.monotonic() - start)
         try:
-            conn = await asyncpg.connect(raw_uri.replace("postgresql+asyncpg://", "postgresql://", 1))
+            conn = await asyncpg.connect(uri, timeout=max(remaining, 0.1))
             await conn.execute("SELECT 1")
             await conn.close()
-            logger.info("PostgreSQL is ready")
+            logger.info(f"PostgreSQL is ready after {time.monotonic() - start:.2f}s")
             return
         except Exception as e:
-            if asyncio.get_event_loop().time() - start > timeout:
+            if time.monotonic() - start + delay > timeout:
                 raise TimeoutError(f"PostgreSQL did not become ready: {e}")
-            logger.info(f"Still waiting... ({asyncio.get_event_loop().time() - start:.1f}s)")
-            await asyncio.sleep(1)
+            logger.info(f"Still waiting... ({time.monotonic() - start:.1f}s, retrying in {delay:.2f}s)")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.database_ready_max_backoff_seconds)
 
 async def init_postgres_schema():
     """Initialize PostgreSQL schema"""
@@ -63,13 +75,52 @@ async def init_postgres_schema():
         await conn.run_sync(SQLModel.metadata.create_all)
     logger.info("PostgreSQL schema initialized")
 
+def expected_schema_revisions() -> Tuple[Set[str], Set[str]]:
+    """Head revision(s) and every known revision of the Alembic migrations shipped with this code"""
+    # Alembic is only needed for this one lookup: keep it out of module import
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    
+    script = ScriptDirectory.from_config(Config(str(PROJECT_ROOT / "alembic.ini")))
+    return set(script.get_heads()), {revision.revision for revision in script.walk_revisions()}
+
+async def check_schema_revision():
+    """Check the database is migrated to this code's Alembic head (instead of create_all)"""
+    async with async_engine.connect() as conn:
+        if await conn.scalar(text("SELECT to_regclass('alembic_version')")) is None:
+            raise SchemaRevisionError(
+                "Database has no alembic_version table: run `python -m alembic upgrade head` "
+                "(or set DATABASE_SCHEMA_CHECK=create_all for a throwaway database)"
+            )
+        current = set((await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars().all())
+    
+    heads, known = expected_schema_revisions()
+    if current == heads:
+        logger.info(f"Database schema is at revision {', '.join(sorted(current))}")
+        return
+    if current <= known:
+        raise SchemaRevisionError(
+            f"Database schema is at revision {', '.join(sorted(current)) or 'none'}, "
+            f"expected {', '.join(sorted(heads))}: run `python -m alembic upgrade head`"
+        )
+    # A newer deploy may migrate before this one is replaced; its schema stays compatible
+    logger.warning(
+        f"Database schema revision {', '.join(sorted(current))} is newer than this code's "
+        f"{', '.join(sorted(heads))}"
+    )
+
 async def check_postgres_connection():
     """Check if PostgreSQL connection is working"""
     try:
         async with async_engine.begin() as conn:
-            result = await conn.execute("SELECT 1")
+            await conn.execute(text("SELECT 1"))
             logger.info("PostgreSQL connection successful")
             return True
     except Exception as e:
         logger.error(f"PostgreSQL connection failed: {e}")
-        return False 
\ No newline at end of file
+        return False
+
+async def close_postgres_connections():
+    """Close every pooled async connection"""
+    await async_engine.dispose()
+    logger.info("PostgreSQL async pool closed")
@@ -0,0 +1,207 @@
+"""
+Read replica routing: read-only service methods go to a healthy replica,
+everything else (and any user who just wrote) stays on the primary
+"""
+import asyncio
+import functools
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.sql.dml import UpdateBase
+from sqlmodel import Session
+from app.config import settings
+from app.database.pool import engine_options, pool_config, register_pool
+from app.models.database import User
+
+logger = logging.getLogger(__name__)
+
+# Session.info keys
+USE_REPLICA = "use_replica"
+WROTE = "wrote"
+USER_ID = "user_id"
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+# from a streaming primary (an idle primary makes the replay timestamp look old)
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+             AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class Replica:
+    """One read replica with a sync and an async engine and its last measured lag (the
+    server only uses the async engine; the sync one serves scripts and opens on first use)"""
+
+    def __init__(self, url: str, db_config: Dict):
+        self.url = url
+        self.engine = create_engine(url, **engine_options(db_config))
+        self.async_engine = create_async_engine(
+            url.replace("postgresql://", "postgresql+asyncpg://", 1),
+            **engine_options(db_config, is_async=True)
+        )
+        register_pool(f"replica {self.engine.url.host}", self.async_engine)
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+
+    @property
+    def is_usable(self) -> bool:
+        """Recently measured and within the allowed lag"""
+        if self.lag_seconds is None or self.checked_at is None:
+            return False
+        # A stale measurement says nothing about the replica now
+        if time.monotonic() - self.checked_at > 3 * settings.database_replica_check_interval_seconds:
+            return False
+        return self.lag_seconds <= settings.database_replica_max_lag_seconds
+
+    async def check_lag(self) -> Optional[float]:
+        """Measure replication lag (None when the replica is unreachable)"""
+        try:
+            async with self.async_engine.connect() as conn:
+                self.lag_seconds = float((await conn.execute(text(REPLICA_LAG_SQL))).scalar())
+        except Exception as e:
+            logger.warning(f"Replica {self.engine.url.host} lag check failed: {e}")
+            self.lag_seconds = None
+        self.checked_at = time.monotonic()
+        return self.lag_seconds
+
+    def bind_for(self, primary: Engine) -> Engine:
+        """The engine matching the primary's flavour (async sessions need the async engine)"""
+        return self.async_engine.sync_engine if primary.dialect.is_async else self.engine
+
+
+replicas: List[Replica] = [Replica(url, pool_config()) for url in settings.database_replica_urls]
+_round_robin = itertools.count()
+
+# Monotonic time of each user's last committed write (read-your-writes)
+_last_write: Dict[int, float] = {}
+
+
+def choose_replica() -> Optional[Replica]:
+    """Next usable replica in round-robin order, or None to use the primary"""
+    usable = [replica for replica in replicas if replica.is_usable]
+    if not usable:
+        return None
+    return usable[next(_round_robin) % len(usable)]
+
+
+async def check_replica_lag() -> Dict[str, Optional[float]]:
+    """Measure every replica's lag (run periodically, on the event loop that owns the pools)"""
+    return {replica.engine.url.host: await replica.check_lag() for replica in replicas}
+
+
+def recently_wrote(user_id: int) -> bool:
+    """Whether the user committed a write within the read-your-writes window"""
+    wrote_at = _last_write.get(user_id)
+    return wrote_at is not None and time.monotonic() - wrote_at < settings.database_read_your_writes_seconds
+
+
+def remember_write(user_id: int, seconds_ago: float) -> None:
+    """Note a write the user made through another worker, so read-your-writes covers it here too"""
+    wrote_at = time.monotonic() - max(seconds_ago, 0.0)
+    if wrote_at > _last_write.get(user_id, float("-inf")):
+        _last_write[user_id] = wrote_at
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica while USE_REPLICA is set in its info"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kw)
+        if not self.info.get(USE_REPLICA) or self._flushing or self.info.get(WROTE):
+            return primary
+        if isinstance(clause, UpdateBase) or getattr(clause, "_for_update_arg", None) is not None:
+            return primary
+        user_id = self.info.get(USER_ID)
+        if user_id is not None and recently_wrote(user_id):
+            return primary
+        replica = choose_replica()
+        return replica.bind_for(primary) if replica else primary
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _track_statement_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_flush_writes(session, flush_context):
+    session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session):
+    if session.info.pop(WROTE, False) and session.info.get(USER_ID) is not None:
+        _last_write[session.info[USER_ID]] = time.monotonic()
+
+
+@event.listens_for(RoutingSession, "after_soft_rollback")
+def _forget_write(session, previous_transaction):
+    session.info.pop(WROTE, None)
+
+
+def _routing_session(db) -> Optional[RoutingSession]:
+    """The RoutingSession behind a sync or async session, if it is one"""
+    session = getattr(db, "sync_session", db)
+    return session if isinstance(session, RoutingSession) else None
+
+
+def tag_session_user(db, user_id: int) -> None:
+    """Attribute the session's writes to a user for read-your-writes routing"""
+    session = _routing_session(db)
+    if session is not None:
+        session.info[USER_ID] = user_id
+
+
+@contextmanager
+def use_replica(db) -> Iterator[bool]:
+    """Route the session's reads to a replica inside the block; yields whether that may happen"""
+    session = _routing_session(db)
+    if session is None or not replicas:
+        yield False
+        return
+    if session.info.get(USE_REPLICA):
+        # Already inside an outer block, which restores the flag
+        yield True
+        return
+    session.info[USE_REPLICA] = True
+    try:
+        yield True
+    finally:
+        session.info.pop(USE_REPLICA, None)
+
+
+def _tag_user_argument(db, args: tuple, kwargs: dict) -> None:
+    """Tie the session to the User passed to a service method, if any"""
+    for value in itertools.chain(args, kwargs.values()):
+        if isinstance(value, User):
+            tag_session_user(db, value.id)
+            return
+
+
+def read_replica(method: Callable) -> Callable:
+    """Let a read-only service method run its queries on a replica (a User argument
+    keeps that user's reads on the primary right after they write)"""
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            _tag_user_argument(self.db, args, kwargs)
+            with use_replica(self.db):
+                return await method(self, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        _tag_user_argument(self.db, args, kwargs)
+        with use_replica(self.db):
+            return method(self, *args, **kwargs)
+    return wrapper
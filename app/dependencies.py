@@ -1,51 +1,43 @@
 # dependencies.py
-from typing import Generator, List, Optional, Annotated
-from sqlmodel import Session
-from fastapi import Depends, HTTPException, status
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Annotated
+from sqlmodel.ext.asyncio.session import AsyncSession
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.database.connection import get_session
-from app.services.customer_service import CustomerService
-from app.services.application_service import ApplicationService
-from app.services.license_service import LicenseService
-from app.services.activation_service import ActivationService
-from app.services.validation_service import ValidationService
-from app.services.activation_form_service import ActivationFormService
-from app.services.auth_service import AuthService
+from app.database.postgres import get_async_session
+from app.database.replicas import remember_write, tag_session_user
+from app.services.customer_service import AsyncCustomerService
+from app.services.application_service import AsyncApplicationService
+from app.services.license_service import AsyncLicenseService
+from app.services.auth_service import AsyncAuthService
+from app.services.stats_service import get_change_version_async
 from app.models.database import User, TokenScope
 from app.core.auth_config import get_user_permissions
+from app.core.etag import etag_matches, user_etag
 
 # Security scheme
 security = HTTPBearer(auto_error=False)  # ← Don't raise error if missing
 
-def get_db() -> Session:
-    """Database dependency"""
-    return next(get_session())
+# Every endpoint runs on the async engine's pool. Admin CRUD and auth use async
+# services; activation, validation, activation form and stats endpoints take the
+# request's AsyncSession and run their sync services through db.run_sync, so a
+# request authenticates and does its work on one connection.
+async def get_auth_service(db: AsyncSession = Depends(get_async_session)) -> AsyncAuthService:
+    return AsyncAuthService(db)
 
-def get_auth_service(db: Session = Depends(get_session)) -> AuthService:
-    return AuthService(db)
+async def get_customer_service(db: AsyncSession = Depends(get_async_session)) -> AsyncCustomerService:
+    return AsyncCustomerService(db)
 
-def get_customer_service(db: Session = Depends(get_session)) -> CustomerService:
-    return CustomerService(db)
+async def get_application_service(db: AsyncSession = Depends(get_async_session)) -> AsyncApplicationService:
+    return AsyncApplicationService(db)
 
-def get_application_service(db: Session = Depends(get_session)) -> ApplicationService:
-    return ApplicationService(db)
-
-def get_license_service(db: Session = Depends(get_session)) -> LicenseService:
-    return LicenseService(db)
-
-def get_activation_service(db: Session = Depends(get_session)) -> ActivationService:
-    return ActivationService(db)
-
-def get_validation_service(db: Session = Depends(get_session)) -> ValidationService:
-    return ValidationService(db)
-
-def get_activation_form_service(db: Session = Depends(get_session)) -> ActivationFormService:
-    return ActivationFormService(db)
+async def get_license_service(db: AsyncSession = Depends(get_async_session)) -> AsyncLicenseService:
+    return AsyncLicenseService(db)
 
 # Unified authentication - handles both session tokens and API tokens
 async def get_current_user(
     bearer_credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ) -> User:
     """Get current user from session token or API token"""
     
@@ -60,15 +52,17 @@ async def get_current_user(
     
     # Try API token first (they start with 'lt_')
     if token.startswith('lt_'):
-        result = auth_service.verify_api_token(token)
+        result = await auth_service.verify_api_token(token)
         if result:
             user, scopes = result
+            tag_session_user(auth_service.db, user.id)
             return user
     
     # Try session token (they start with 'st_')
     if token.startswith('st_'):
-        user = auth_service.verify_session_token(token)
+        user = await auth_service.verify_session_token(token)
         if user:
+            tag_session_user(auth_service.db, user.id)
             return user
     
     # If neither worked, raise authentication error
@@ -81,7 +75,7 @@ async def get_current_user(
 # For endpoints that need scopes - accepts both session tokens (full permissions) and API tokens (subset permissions)
 async def get_current_user_with_scopes(
     bearer_credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ) -> tuple[User, List[TokenScope]]:
     """Get current user and scopes - accepts both session tokens (full) and API tokens (subset)"""
     if not bearer_credentials:
@@ -95,14 +89,16 @@ async def get_current_user_with_scopes(
     
     # Try API token first (they start with 'lt_')
     if token.startswith('lt_'):
-        result = auth_service.verify_api_token(token)
+        result = await auth_service.verify_api_token(token)
         if result:
+            tag_session_user(auth_service.db, result[0].id)
             return result
     
     # Try session token (they start with 'st_') - session tokens have full permissions
     if token.startswith('st_'):
-        user = auth_service.verify_session_token(token)
+        user = await auth_service.verify_session_token(token)
         if user:
+            tag_session_user(auth_service.db, user.id)
             # Session tokens have all permissions based on user's roles
             from app.core.auth_config import get_user_permissions
             permissions = get_user_permissions(user.business_role, user.system_role)
@@ -228,7 +224,7 @@ def require_developer_or_above():
 # Optional authentication - for endpoints that work with or without auth
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ) -> Optional[User]:
     """Get current user if authenticated, None otherwise"""
     if not credentials:
@@ -317,4 +313,34 @@ def get_user_context():
         user_and_scopes: tuple[User, List[TokenScope]] = Depends(get_current_user_with_scopes)
     ) -> tuple[User, List[TokenScope]]:
         return user_and_scopes
-    return get_context
\ No newline at end of file
+    return get_context
+
+# Conditional GET for tenant data (licenses, customers, applications)
+def conditional_get(require_read: Callable) -> Callable:
+    """Wrap a read permission dependency with ETag handling: If-None-Match is answered
+    with 304 from the user's change version alone, before the endpoint runs its query"""
+    async def check_etag(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(require_read),
+        db: AsyncSession = Depends(get_async_session)
+    ) -> User:
+        # Read on the primary: a lagging replica could pair a new version with old rows
+        change_version, changed_at = await get_change_version_async(db, current_user.id)
+        if changed_at is not None:
+            # The write may have gone through another worker; keep this user's reads on
+            # the primary until replicas have caught up with it
+            if changed_at.tzinfo is None:
+                changed_at = changed_at.replace(tzinfo=timezone.utc)
+            remember_write(current_user.id, (datetime.now(timezone.utc) - changed_at).total_seconds())
+        
+        headers = {
+            "ETag": user_etag(current_user.id, change_version),
+            "Cache-Control": "private, no-cache",
+            "Vary": "Authorization",
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        return current_user
+    return check_etag
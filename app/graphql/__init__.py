@@ -0,0 +1,3 @@
+"""
+Read-only GraphQL API over the license services, mounted at /graphql
+"""
@@ -0,0 +1,39 @@
+"""
+Per-request GraphQL context: the authenticated user, their scopes, the
+request's session and its DataLoaders
+"""
+import asyncio
+from typing import List, Tuple
+from fastapi import Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+from strawberry.fastapi import BaseContext
+from app.core.exceptions import PermissionDeniedException
+from app.database.postgres import get_async_session
+from app.dependencies import get_current_user_with_scopes
+from app.graphql.loaders import GraphQLLoaders
+from app.models.database import TokenScope, User
+
+
+class GraphQLContext(BaseContext):
+    def __init__(self, db: AsyncSession, user: User, scopes: List[TokenScope]):
+        super().__init__()
+        self.db = db
+        self.user = user
+        self.scopes = scopes
+        # Resolvers run concurrently; the session must only see one statement at a time
+        self.db_lock = asyncio.Lock()
+        self.loaders = GraphQLLoaders(db, user, self.db_lock)
+
+    def require_scope(self, scope: TokenScope) -> None:
+        """Raise unless the token grants the scope (the same scopes the REST endpoints require)"""
+        if scope not in self.scopes:
+            raise PermissionDeniedException(f"Insufficient permissions. Required scope: {scope.value}")
+
+
+async def get_graphql_context(
+    user_and_scopes: Tuple[User, List[TokenScope]] = Depends(get_current_user_with_scopes),
+    db: AsyncSession = Depends(get_async_session)
+) -> GraphQLContext:
+    """Build the context for one GraphQL request"""
+    user, scopes = user_and_scopes
+    return GraphQLContext(db, user, scopes)
@@ -0,0 +1,119 @@
+"""
+Per-request DataLoaders: each relation resolver's keys are batched into one
+owner-scoped SELECT ... WHERE key IN (...), so nested queries run a constant
+number of statements however many rows they return
+"""
+import asyncio
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from strawberry.dataloader import DataLoader
+from app.database.replicas import use_replica
+from app.models.database import Activation, ActivationForm, Application, Customer, LicenseKey, User
+from app.models.schemas import (
+    ActivationFormResponse, ActivationResponse, ApplicationResponse, CustomerResponse, LicenseKeyResponse
+)
+from app.services.activation_form_service import ActivationFormService
+from app.services.activation_service import ActivationService
+from app.services.application_service import ApplicationService
+from app.services.customer_service import CustomerService
+from app.services.license_service import LicenseService
+
+
+def _one_per_key(rows: list, keys: List[int], key: Callable[[Any], int]) -> List[Optional[Any]]:
+    """Loader results in key order, None where nothing matched"""
+    found = {key(row): row for row in rows}
+    return [found.get(k) for k in keys]
+
+
+def _many_per_key(rows: list, keys: List[int], key: Callable[[Any], int]) -> List[List[Any]]:
+    """Loader results grouped by key, in key order"""
+    grouped: Dict[int, List[Any]] = defaultdict(list)
+    for row in rows:
+        grouped[key(row)].append(row)
+    return [grouped.get(k, []) for k in keys]
+
+
+class GraphQLLoaders:
+    """DataLoaders for one request, all reading through the request's session"""
+
+    def __init__(self, db: AsyncSession, user: User, db_lock: asyncio.Lock):
+        self.db = db
+        self.user = user
+        # Loaders dispatch concurrently but an AsyncSession runs one statement at a time
+        self.db_lock = db_lock
+
+        # The services' converters keep GraphQL and REST responses identical
+        self._customers = CustomerService(db)
+        self._applications = ApplicationService(db)
+        self._licenses = LicenseService(db)
+        self._activations = ActivationService(db)
+        self._activation_forms = ActivationFormService(db)
+
+        self.customer = DataLoader(load_fn=self._load_customers)
+        self.application = DataLoader(load_fn=self._load_applications)
+        self.license = DataLoader(load_fn=self._load_licenses)
+        self.licenses_by_customer = DataLoader(load_fn=self._load_licenses_by_customer)
+        self.licenses_by_application = DataLoader(load_fn=self._load_licenses_by_application)
+        self.activations_by_license = DataLoader(load_fn=self._load_activations_by_license)
+        self.activation_forms_by_license = DataLoader(load_fn=self._load_activation_forms_by_license)
+
+    async def _all(self, statement) -> list:
+        async with self.db_lock:
+            with use_replica(self.db):
+                return (await self.db.exec(statement)).all()
+
+    async def _load_customers(self, keys: List[int]) -> List[Optional[CustomerResponse]]:
+        rows = await self._all(
+            select(Customer).where(Customer.id.in_(keys), Customer.user_id == self.user.id)
+        )
+        return _one_per_key([self._customers._to_response(row) for row in rows], keys, lambda c: c.id)
+
+    async def _load_applications(self, keys: List[int]) -> List[Optional[ApplicationResponse]]:
+        rows = await self._all(
+            select(Application).where(Application.id.in_(keys), Application.user_id == self.user.id)
+        )
+        return _one_per_key([self._applications._to_response(row) for row in rows], keys, lambda a: a.id)
+
+    async def _load_licenses(self, keys: List[int]) -> List[Optional[LicenseKeyResponse]]:
+        rows = await self._all(
+            select(LicenseKey).where(LicenseKey.id.in_(keys), LicenseKey.owner_user_id == self.user.id)
+        )
+        return _one_per_key([self._licenses._to_response(row) for row in rows], keys, lambda l: l.id)
+
+    async def _load_licenses_by_customer(self, keys: List[int]) -> List[List[LicenseKeyResponse]]:
+        rows = await self._all(
+            select(LicenseKey)
+            .where(LicenseKey.customer_id.in_(keys), LicenseKey.owner_user_id == self.user.id)
+            .order_by(LicenseKey.id)
+        )
+        return _many_per_key([self._licenses._to_response(row) for row in rows], keys, lambda l: l.customer_id)
+
+    async def _load_licenses_by_application(self, keys: List[int]) -> List[List[LicenseKeyResponse]]:
+        rows = await self._all(
+            select(LicenseKey)
+            .where(LicenseKey.application_id.in_(keys), LicenseKey.owner_user_id == self.user.id)
+            .order_by(LicenseKey.id)
+        )
+        return _many_per_key([self._licenses._to_response(row) for row in rows], keys, lambda l: l.application_id)
+
+    async def _load_activations_by_license(self, keys: List[int]) -> List[List[ActivationResponse]]:
+        rows = await self._all(
+            select(Activation)
+            .where(Activation.license_key_id.in_(keys), Activation.owner_user_id == self.user.id)
+            .order_by(Activation.id)
+        )
+        return _many_per_key([self._activations._to_response(row) for row in rows], keys, lambda a: a.license_key_id)
+
+    async def _load_activation_forms_by_license(self, keys: List[int]) -> List[List[ActivationFormResponse]]:
+        # Forms carry no owner: the join to their license scopes them to the user
+        rows = await self._all(
+            select(ActivationForm)
+            .join(LicenseKey, LicenseKey.id == ActivationForm.license_key_id)
+            .where(ActivationForm.license_key_id.in_(keys), LicenseKey.owner_user_id == self.user.id)
+            .order_by(ActivationForm.id)
+        )
+        return _many_per_key(
+            [self._activation_forms._to_response(row) for row in rows], keys, lambda f: f.license_key_id
+        )
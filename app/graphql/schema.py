@@ -0,0 +1,119 @@
+"""
+GraphQL schema: read-only root queries backed by the async services
+"""
+from typing import List, Optional
+import strawberry
+from strawberry.types import Info
+from app.core.exceptions import ApplicationNotFoundException, CustomerNotFoundException, LicenseNotFoundException
+from app.graphql.types import Activation, ActivationForm, Application, Customer, License
+from app.models.database import ActivationFormStatus, TokenScope
+from app.services.activation_form_service import ActivationFormService
+from app.services.activation_service import ActivationService
+from app.services.application_service import AsyncApplicationService
+from app.services.customer_service import AsyncCustomerService
+from app.services.license_service import AsyncLicenseService
+
+MAX_PAGE_SIZE = 1000
+
+
+def _page(limit: int) -> int:
+    return max(0, min(limit, MAX_PAGE_SIZE))
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def licenses(self, info: Info, skip: int = 0, limit: int = 100) -> List[License]:
+        """Licenses owned by the authenticated user"""
+        context = info.context
+        context.require_scope(TokenScope.LICENSE_READ)
+        async with context.db_lock:
+            licenses = await AsyncLicenseService(context.db).list_licenses(context.user, skip, _page(limit))
+        return [License.from_pydantic(license_key) for license_key in licenses]
+
+    @strawberry.field
+    async def license(self, info: Info, id: int) -> Optional[License]:
+        context = info.context
+        context.require_scope(TokenScope.LICENSE_READ)
+        try:
+            async with context.db_lock:
+                license_key = await AsyncLicenseService(context.db).get_license(id, context.user)
+        except LicenseNotFoundException:
+            return None
+        return License.from_pydantic(license_key)
+
+    @strawberry.field
+    async def customers(self, info: Info, skip: int = 0, limit: int = 100) -> List[Customer]:
+        """Customers owned by the authenticated user"""
+        context = info.context
+        context.require_scope(TokenScope.CUSTOMER_READ)
+        async with context.db_lock:
+            customers = await AsyncCustomerService(context.db).list_customers(context.user, skip, _page(limit))
+        return [Customer.from_pydantic(customer) for customer in customers]
+
+    @strawberry.field
+    async def customer(self, info: Info, id: int) -> Optional[Customer]:
+        context = info.context
+        context.require_scope(TokenScope.CUSTOMER_READ)
+        try:
+            async with context.db_lock:
+                customer = await AsyncCustomerService(context.db).get_customer(id, context.user)
+        except CustomerNotFoundException:
+            return None
+        return Customer.from_pydantic(customer)
+
+    @strawberry.field
+    async def applications(self, info: Info, skip: int = 0, limit: int = 100) -> List[Application]:
+        """Applications owned by the authenticated user"""
+        context = info.context
+        context.require_scope(TokenScope.APPLICATION_READ)
+        async with context.db_lock:
+            applications = await AsyncApplicationService(context.db).list_applications(
+                context.user, skip, _page(limit)
+            )
+        return [Application.from_pydantic(application) for application in applications]
+
+    @strawberry.field
+    async def application(self, info: Info, id: int) -> Optional[Application]:
+        context = info.context
+        context.require_scope(TokenScope.APPLICATION_READ)
+        try:
+            async with context.db_lock:
+                application = await AsyncApplicationService(context.db).get_application(id, context.user)
+        except ApplicationNotFoundException:
+            return None
+        return Application.from_pydantic(application)
+
+    @strawberry.field
+    async def activations(self, info: Info, skip: int = 0, limit: int = 100) -> List[Activation]:
+        """Activations of the authenticated user's licenses"""
+        context = info.context
+        context.require_scope(TokenScope.ACTIVATION_READ)
+        # The activation services are synchronous: run them on the session's sync side
+        async with context.db_lock:
+            activations = await context.db.run_sync(
+                lambda db: ActivationService(db).list_activations_for_user(context.user, skip, _page(limit))
+            )
+        return [Activation.from_pydantic(activation) for activation in activations]
+
+    @strawberry.field
+    async def activation_forms(
+        self,
+        info: Info,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[ActivationFormStatus] = None
+    ) -> List[ActivationForm]:
+        """Activation forms for the authenticated user's licenses"""
+        context = info.context
+        context.require_scope(TokenScope.ACTIVATION_READ)
+        async with context.db_lock:
+            forms = await context.db.run_sync(
+                lambda db: ActivationFormService(db).list_activation_forms(
+                    skip, _page(limit), status, owner=context.user
+                )
+            )
+        return [ActivationForm.from_pydantic(form) for form in forms]
+
+
+schema = strawberry.Schema(query=Query)
@@ -0,0 +1,127 @@
+"""
+GraphQL types mirroring the REST response schemas, with relation fields
+resolved through the request's DataLoaders
+"""
+from typing import Annotated, List, Optional
+import strawberry
+from strawberry.scalars import JSON
+from strawberry.types import Info
+from app.models.database import TokenScope
+from app.models.schemas import (
+    ActivationFormResponse, ActivationResponse, ApplicationResponse, CustomerResponse, LicenseKeyResponse
+)
+
+# License refers back to the types defined before it
+LazyLicense = Annotated["License", strawberry.lazy("app.graphql.types")]
+
+
+@strawberry.experimental.pydantic.type(model=CustomerResponse)
+class Customer:
+    id: strawberry.auto
+    name: strawberry.auto
+    email: strawberry.auto
+    company: strawberry.auto
+    created_at: strawberry.auto
+
+    @strawberry.field
+    async def licenses(self, info: Info) -> List[LazyLicense]:
+        info.context.require_scope(TokenScope.LICENSE_READ)
+        licenses = await info.context.loaders.licenses_by_customer.load(self.id)
+        return [License.from_pydantic(license_key) for license_key in licenses]
+
+
+@strawberry.experimental.pydantic.type(model=ApplicationResponse)
+class Application:
+    id: strawberry.auto
+    name: strawberry.auto
+    version: strawberry.auto
+    description: strawberry.auto
+    features: Optional[JSON]
+    heartbeat_ttl_seconds: strawberry.auto
+    created_at: strawberry.auto
+
+    @strawberry.field
+    async def licenses(self, info: Info) -> List[LazyLicense]:
+        info.context.require_scope(TokenScope.LICENSE_READ)
+        licenses = await info.context.loaders.licenses_by_application.load(self.id)
+        return [License.from_pydantic(license_key) for license_key in licenses]
+
+
+@strawberry.experimental.pydantic.type(model=ActivationResponse)
+class Activation:
+    id: strawberry.auto
+    license_key_id: strawberry.auto
+    machine_id: strawberry.auto
+    machine_name: strawberry.auto
+    ip_address: strawberry.auto
+    status: strawberry.auto
+    activated_at: strawberry.auto
+    last_heartbeat: strawberry.auto
+
+    @strawberry.field
+    async def license(self, info: Info) -> Optional[LazyLicense]:
+        info.context.require_scope(TokenScope.LICENSE_READ)
+        license_key = await info.context.loaders.license.load(self.license_key_id)
+        return License.from_pydantic(license_key) if license_key else None
+
+
+@strawberry.experimental.pydantic.type(model=ActivationFormResponse)
+class ActivationForm:
+    id: strawberry.auto
+    license_key_id: strawberry.auto
+    machine_id: strawberry.auto
+    machine_name: strawberry.auto
+    request_code: strawberry.auto
+    activation_code: strawberry.auto
+    status: strawberry.auto
+    expires_at: strawberry.auto
+    created_at: strawberry.auto
+    completed_at: strawberry.auto
+
+    @strawberry.field
+    async def license(self, info: Info) -> Optional[LazyLicense]:
+        info.context.require_scope(TokenScope.LICENSE_READ)
+        license_key = await info.context.loaders.license.load(self.license_key_id)
+        return License.from_pydantic(license_key) if license_key else None
+
+
+# The key itself is never readable after creation, so license_key is not exposed
+@strawberry.experimental.pydantic.type(model=LicenseKeyResponse)
+class License:
+    id: strawberry.auto
+    customer_id: strawberry.auto
+    application_id: strawberry.auto
+    status: strawberry.auto
+    expires_at: strawberry.auto
+    max_activations: strawberry.auto
+    current_activations: strawberry.auto
+    features: Optional[JSON]
+    notes: strawberry.auto
+    created_at: strawberry.auto
+    updated_at: strawberry.auto
+
+    @strawberry.field
+    async def customer(self, info: Info) -> Optional[Customer]:
+        info.context.require_scope(TokenScope.CUSTOMER_READ)
+        if self.customer_id is None:
+            return None
+        customer = await info.context.loaders.customer.load(self.customer_id)
+        return Customer.from_pydantic(customer) if customer else None
+
+    @strawberry.field
+    async def application(self, info: Info) -> Optional[Application]:
+        info.context.require_scope(TokenScope.APPLICATION_READ)
+        application = await info.context.loaders.application.load(self.application_id)
+        return Application.from_pydantic(application) if application else None
+
+    @strawberry.field
+    async def activations(self, info: Info) -> List[Activation]:
+        info.context.require_scope(TokenScope.ACTIVATION_READ)
+        activations = await info.context.loaders.activations_by_license.load(self.id)
+        return [Activation.from_pydantic(activation) for activation in activations]
+
+    @strawberry.field
+    async def activation_forms(self, info: Info) -> List[ActivationForm]:
+        info.context.require_scope(TokenScope.ACTIVATION_READ)
+        forms = await info.context.loaders.activation_forms_by_license.load(self.id)
+        return [ActivationForm.from_pydantic(form) for form in forms]
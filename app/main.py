@@ -9,21 +9,59 @@ import logging.config
 
 import app.config as config
 from app.config import settings
-from app.database.connection import create_db_and_tables
-from app.database.postgres import wait_for_postgres_ready, init_postgres_schema, check_postgres_connection
+from app.database.postgres import (
+    wait_for_postgres_ready, check_schema_revision, init_postgres_schema, check_postgres_connection,
+    close_postgres_connections
+)
 from app.api.v1.api import api_router
-from app.graphql.schema import schema
-from app.graphql.context import get_graphql_context
-from strawberry.fastapi import GraphQLRouter
-from strawberry.asgi import GraphQL
+from app.core.compression import CompressionMiddleware
+from app.core.lazy import LazyASGIApp
 from app.core.exceptions import LicenseManagementException, map_to_http_exception
 from app.core.constants import ensure_directories, LOGGING_CONFIG
-from app.scripts.db_management import start_app_managed_postgres, stop_app_managed_postgres
+from app.core.scheduler import register_periodic_task, start_periodic_tasks, stop_periodic_tasks
+from app.services.stats_service import reconcile_all_stats
+from app.services.activation_event_service import (
+    flush_activation_events, maintain_activation_event_partitions, set_activation_event_flusher
+)
+from app.services.activation_service import reap_stale_activations
+from app.services.activation_form_service import sweep_expired_activation_forms
+from app.database.invalidation import start_invalidation_listener, stop_invalidation_listener
+from app.database.replicas import check_replica_lag, replicas
+from app.database.pool import check_pool_liveness
 
 # Configure logging
 logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger("app")
 
+# Background jobs
+register_periodic_task("stats-reconcile", settings.stats_reconcile_interval_seconds, reconcile_all_stats)
+register_periodic_task(
+    "activation-event-partitions",
+    settings.activation_event_maintenance_interval_seconds,
+    maintain_activation_event_partitions,
+    run_at_start=True
+)
+activation_event_flush = register_periodic_task(
+    "activation-event-flush",
+    settings.activation_event_flush_interval_seconds,
+    flush_activation_events
+)
+set_activation_event_flusher(activation_event_flush.wake)
+register_periodic_task("activation-reaper", settings.activation_reaper_interval_seconds, reap_stale_activations)
+register_periodic_task(
+    "activation-form-sweep",
+    settings.activation_form_sweep_interval_seconds,
+    sweep_expired_activation_forms
+)
+register_periodic_task("pool-liveness", settings.database_pool_liveness_interval_seconds, check_pool_liveness)
+if replicas:
+    register_periodic_task(
+        "replica-lag-check",
+        settings.database_replica_check_interval_seconds,
+        check_replica_lag,
+        run_at_start=True
+    )
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -33,6 +71,7 @@ async def lifespan(app: FastAPI):
     
     # Start app-managed PostgreSQL container if enabled
     if settings.app_managed_db:
+        from app.scripts.db_management import start_app_managed_postgres
         logger.info("Starting app-managed PostgreSQL container...")
         start_app_managed_postgres()
     
@@ -40,17 +79,28 @@ async def lifespan(app: FastAPI):
     logger.info("Waiting for PostgreSQL to be ready...")
     try:
         await wait_for_postgres_ready()
-        await init_postgres_schema()
+        if settings.database_schema_check == "revision":
+            await check_schema_revision()
+        elif settings.database_schema_check == "create_all":
+            await init_postgres_schema()
     except Exception as e:
         logger.error(f"Failed to initialize PostgreSQL: {e}")
         raise
     
+    start_periodic_tasks()
+    start_invalidation_listener()
+    
     logger.info("Application startup complete!")
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    await stop_invalidation_listener()
+    await stop_periodic_tasks()
+    await flush_activation_events()
+    await close_postgres_connections()
     # if settings.app_managed_db:
+    #     from app.scripts.db_management import stop_app_managed_postgres
     #     logger.info("Stopping app-managed PostgreSQL container...")
     #     stop_app_managed_postgres()
 
@@ -68,6 +118,8 @@ app = FastAPI(
         {"name": "Activations", "description": "License activation endpoints"},
         {"name": "Validation", "description": "License validation endpoints"},
         {"name": "Activation Forms", "description": "Activation form management endpoints"},
+        {"name": "Statistics", "description": "Dashboard statistics endpoints"},
+        {"name": "Administration", "description": "System administration endpoints"},
     ]
 )
 
@@ -86,6 +138,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large list responses (validation and other small payloads are left alone)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    excluded_paths=settings.compression_excluded_paths,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+
 # Add debug middleware to log all requests
 @app.middleware("http")
 async def debug_middleware(request: Request, call_next):
@@ -160,11 +221,27 @@ async def license_exception_handler(request: Request, exc: LicenseManagementExce
 # Include API routes
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
-# Add GraphQL endpoint
-graphql_app = GraphQLRouter(schema, context_getter=get_graphql_context)
-app.include_router(graphql_app, prefix="/graphql")
+# Add GraphQL endpoint (strawberry and the schema are imported on the first GraphQL request)
+def create_graphql_app() -> FastAPI:
+    from strawberry.fastapi import GraphQLRouter
+    from app.graphql.schema import schema
+    from app.graphql.context import get_graphql_context
+
+    graphql = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+    graphql.include_router(GraphQLRouter(schema, context_getter=get_graphql_context), prefix="/graphql")
+    return graphql
+
+def create_graphql_playground():
+    from strawberry.asgi import GraphQL
+    from app.graphql.schema import schema
+
+    return GraphQL(schema)
+
+graphql_app = LazyASGIApp(create_graphql_app)
+app.add_route("/graphql", graphql_app, methods=["GET", "POST"])
+app.add_websocket_route("/graphql", graphql_app)
 
-app.add_route("/graphql-playground", GraphQL(schema))
+app.add_route("/graphql-playground", LazyASGIApp(create_graphql_playground))
 
 
 # Health check endpoint
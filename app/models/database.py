@@ -2,7 +2,7 @@ from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import List, Optional, Dict, Any
 from sqlmodel import Field, Relationship, SQLModel
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import BigInteger, Column, Index, UniqueConstraint, text
 
 # Enums
 class LicenseStatus(str, Enum):
@@ -17,6 +17,17 @@ class ActivationStatus(str, Enum):
     ACTIVE = "active"
     INACTIVE = "inactive"
 
+class ActivationFormStatus(str, Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    EXPIRED = "expired"
+
+class ActivationEventType(str, Enum):
+    VALIDATE = "validate"
+    ACTIVATE = "activate"
+    HEARTBEAT = "heartbeat"
+    DEACTIVATE = "deactivate"
+
 class UserRole(str, Enum):
     """Business roles for license management"""
     USER = "user"          # Standard user (manages own resources)
@@ -76,7 +87,7 @@ class User(UserBase, table=True):
 
 # Session model for login sessions (temporary, full permissions)
 class SessionBase(SQLModel):
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     session_token: str = Field(unique=True, index=True, max_length=255)
     is_revoked: bool = Field(default=False)  # For immediate revocation
     expires_at: datetime = Field()
@@ -101,7 +112,7 @@ class APITokenBase(SQLModel):
 
 class APIToken(APITokenBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     
     # Relationships
     user: User = Relationship(back_populates="api_tokens")
@@ -131,7 +142,8 @@ class ApplicationBase(SQLModel):
     version: str = Field(max_length=50)
     description: Optional[str] = Field(default=None)
     features: Optional[str] = Field(default=None)
-    user_id: int = Field(foreign_key="user.id")  # ADD THIS
+    heartbeat_ttl_seconds: Optional[int] = Field(default=None)  # None uses the global TTL, 0 never reaps
+    user_id: int = Field(foreign_key="user.id", index=True)  # ADD THIS
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class Application(ApplicationBase, table=True):
@@ -144,10 +156,10 @@ class Application(ApplicationBase, table=True):
 
 class LicenseKeyBase(SQLModel):
     key_hash: str = Field(unique=True, index=True)
-    customer_id: Optional[int] = Field(foreign_key="customer.id", default=None)
-    application_id: int = Field(foreign_key="application.id")
+    customer_id: Optional[int] = Field(foreign_key="customer.id", default=None, index=True)
+    application_id: int = Field(foreign_key="application.id", index=True)
     status: LicenseStatus = Field(default=LicenseStatus.ACTIVE)
-    expires_at: Optional[datetime] = Field(default=None)
+    expires_at: Optional[datetime] = Field(default=None, index=True)
     max_activations: int = Field(default=1)
     current_activations: int = Field(default=0)
     features: Optional[str] = Field(default=None)  # JSON string of enabled features
@@ -158,6 +170,7 @@ class LicenseKeyBase(SQLModel):
 
 class LicenseKey(LicenseKeyBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+    owner_user_id: int = Field(foreign_key="user.id")  # Denormalized from customer.user_id
 
     # Relationships
     customer: Customer = Relationship(back_populates="license_keys")
@@ -167,6 +180,15 @@ class LicenseKey(LicenseKeyBase, table=True):
         back_populates="license_key"
     )
 
+    __table_args__ = (
+        Index("ix_licensekey_owner_user_id_id", "owner_user_id", "id"),
+        # Dashboard counts of active licenses about to expire
+        Index(
+            "ix_licensekey_active_owner_expires_at", "owner_user_id", "expires_at",
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
+    )
+
 
 class ActivationBase(SQLModel):
     license_key_id: int = Field(foreign_key="licensekey.id")
@@ -180,10 +202,47 @@ class ActivationBase(SQLModel):
 
 class Activation(ActivationBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+    owner_user_id: int = Field(foreign_key="user.id")  # Denormalized from licensekey.owner_user_id
 
     # Relationships
     license_key: LicenseKey = Relationship(back_populates="activations")
 
+    __table_args__ = (
+        Index("ix_activation_license_key_machine_status", "license_key_id", "machine_id", "status"),
+        Index("ix_activation_owner_user_id_id", "owner_user_id", "id"),
+        Index(
+            "ix_activation_active_last_heartbeat", "last_heartbeat",
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
+    )
+
+
+# Append-only activation history, range-partitioned by month on occurred_at.
+# No foreign keys: history outlives the licenses and activations it describes.
+class ActivationEvent(SQLModel, table=True):
+    __tablename__ = "activation_event"
+
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(BigInteger, primary_key=True, autoincrement=True)
+    )
+    occurred_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        primary_key=True  # Partition key must be part of the primary key
+    )
+    event_type: ActivationEventType = Field()
+    license_key_id: int = Field()
+    activation_id: Optional[int] = Field(default=None)
+    owner_user_id: int = Field()
+    machine_id: str = Field(max_length=255)
+    ip_address: Optional[str] = Field(default=None, max_length=45)
+
+    __table_args__ = (
+        Index("ix_activation_event_license_key_id_occurred_at", "license_key_id", "occurred_at"),
+        Index("ix_activation_event_owner_user_id_occurred_at", "owner_user_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
 # New models for activation forms
 class ActivationFormBase(SQLModel):
     license_key_id: int = Field(foreign_key="licensekey.id")
@@ -191,7 +250,7 @@ class ActivationFormBase(SQLModel):
         max_length=255
     )  # Hardware fingerprint from offline computer
     machine_name: Optional[str] = Field(default=None, max_length=255)
-    request_code: str = Field(max_length=255)  # Code generated by offline computer
+    request_code: str = Field(max_length=255, unique=True, index=True)  # Code generated by offline computer
     activation_code: Optional[str] = Field(
         default=None, max_length=255
     )  # Code to activate offline
@@ -209,6 +268,13 @@ class ActivationForm(ActivationFormBase, table=True):
     # Relationships
     license_key: LicenseKey = Relationship(back_populates="activation_forms")
 
+    __table_args__ = (
+        Index(
+            "ix_activationform_pending_expires_at", "expires_at",
+            postgresql_where=text("status = 'pending'")
+        ),
+    )
+
 
 # Offline activation codes for batch generation
 class OfflineActivationCodeBase(SQLModel):
@@ -225,3 +291,30 @@ class OfflineActivationCodeBase(SQLModel):
 
 class OfflineActivationCode(OfflineActivationCodeBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+
+    __table_args__ = (
+        Index(
+            "ix_offlineactivationcode_unused_expires_at", "expires_at",
+            postgresql_where=text("NOT is_used")
+        ),
+    )
+
+
+# Per-user dashboard counters and change version, maintained incrementally by the services
+class UserStats(SQLModel, table=True):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    customers: int = Field(default=0)
+    applications: int = Field(default=0)
+    licenses_active: int = Field(default=0)
+    licenses_expired: int = Field(default=0)
+    licenses_suspended: int = Field(default=0)
+    licenses_revoked: int = Field(default=0)
+    licenses_blocked: int = Field(default=0)
+    active_activations: int = Field(default=0)
+    change_version: int = Field(
+        default=0,
+        sa_column=Column(BigInteger, nullable=False, server_default="0")
+    )  # Bumped by every write by the user's services (list and detail ETags)
+    changed_at: Optional[datetime] = Field(default=None)  # Last write by the user's services
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    reconciled_at: Optional[datetime] = Field(default=None)  # Last full recount
@@ -138,6 +138,7 @@ class ApplicationCreate(BaseModel):
     version: str
     description: Optional[str] = None
     features: Optional[Dict[str, Any]] = None
+    heartbeat_ttl_seconds: Optional[int] = Field(default=None, ge=0)
     # user_id will be set from authentication context
 
 
@@ -147,6 +148,7 @@ class ApplicationResponse(BaseModel):
     version: str
     description: Optional[str]
     features: Optional[Dict[str, Any]]
+    heartbeat_ttl_seconds: Optional[int] = None
     created_at: datetime
 
 
@@ -155,6 +157,7 @@ class ApplicationUpdate(BaseModel):
     version: Optional[str] = None
     description: Optional[str] = None
     features: Optional[Dict[str, Any]] = None
+    heartbeat_ttl_seconds: Optional[int] = Field(default=None, ge=0)
 
 
 class LicenseKeyCreate(BaseModel):
@@ -202,6 +205,45 @@ class LicenseKeyUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class LicenseKeyWithRelationsResponse(LicenseKeyResponse):
+    customer: CustomerResponse
+    application: ApplicationResponse
+
+
+class LicenseBulkStatusAction(str, Enum):
+    BLOCK = "block"
+    UNBLOCK = "unblock"
+    REVOKE = "revoke"
+    SUSPEND = "suspend"
+
+
+class LicenseBulkStatusUpdate(BaseModel):
+    action: LicenseBulkStatusAction
+    # Filters (combined with AND, always scoped to the caller's licenses)
+    customer_id: Optional[int] = None
+    application_id: Optional[int] = None
+    status: Optional[LicenseStatus] = None
+    expires_after: Optional[datetime] = None
+    expires_before: Optional[datetime] = None
+    license_ids: Optional[List[int]] = None
+    dry_run: bool = False
+
+    @validator("dry_run", always=True)
+    def require_filter(cls, v, values):
+        filters = ("customer_id", "application_id", "status", "expires_after", "expires_before", "license_ids")
+        if all(values.get(name) is None for name in filters):
+            raise ValueError("At least one filter is required for a bulk status change")
+        return v
+
+
+class LicenseBulkStatusResponse(BaseModel):
+    action: LicenseBulkStatusAction
+    target_status: LicenseStatus
+    matched: int
+    updated: int
+    dry_run: bool
+
+
 class ActivationCreate(BaseModel):
     license_key: str  # The actual license key
     machine_id: str
@@ -219,6 +261,66 @@ class ActivationResponse(BaseModel):
     last_heartbeat: datetime
 
 
+class ActivationBulkDeactivate(BaseModel):
+    activation_ids: List[int]
+
+    @validator("activation_ids")
+    def validate_activation_ids(cls, v):
+        if not v:
+            raise ValueError("At least one activation id is required")
+        if len(v) > 10000:
+            raise ValueError("At most 10000 activations can be deactivated per request")
+        return list(set(v))
+
+
+class ActivationBulkDeactivateResponse(BaseModel):
+    requested: int
+    deactivated: int
+
+
+class LicenseStatusCounts(BaseModel):
+    active: int = 0
+    expired: int = 0
+    suspended: int = 0
+    revoked: int = 0
+    blocked: int = 0
+
+
+class DashboardStatsResponse(BaseModel):
+    licenses: LicenseStatusCounts
+    total_licenses: int
+    active_activations: int
+    customers: int
+    applications: int
+    expiring_7_days: int
+    expiring_30_days: int
+    updated_at: datetime
+    reconciled_at: Optional[datetime]
+
+
+class PoolStatsResponse(BaseModel):
+    name: str
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    total_wait_ms: float
+    avg_wait_ms: float
+    max_wait_ms: float
+    alive: Optional[bool]
+    seconds_since_liveness_check: Optional[float]
+
+
+class DatabasePoolsResponse(BaseModel):
+    profile: str
+    mode: str
+    pools: List[PoolStatsResponse]
+
+
 class ActivationFormCreate(BaseModel):
     license_key: str  # The actual license key
     machine_id: str
@@ -248,6 +350,15 @@ class OfflineActivationCodeCreate(BaseModel):
     machine_id: Optional[str] = None
     quantity: int = 1
 
+    @validator("quantity")
+    def validate_quantity(cls, v):
+        from app.config import settings
+        if v < 1:
+            raise ValueError("At least one code is required")
+        if v > settings.offline_code_max_quantity:
+            raise ValueError(f"At most {settings.offline_code_max_quantity} codes can be generated per request")
+        return v
+
 
 class OfflineActivationCodeResponse(BaseModel):
     id: int
@@ -0,0 +1,255 @@
+"""
+Activation event history: buffered appends and monthly partition upkeep
+"""
+import logging
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlmodel import Session
+from app.config import settings
+from app.database.connection import engine
+from app.database.postgres import async_session
+from app.models.database import ActivationEvent, ActivationEventType
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = ActivationEvent.__tablename__
+PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+# Only one worker changes the partitions at a time
+PARTITION_LOCK_SQL = "SELECT pg_try_advisory_xact_lock(hashtext('activation_event_partitions'))"
+
+# PostgreSQL's error for a row whose partition key falls outside every partition
+NO_PARTITION_ERROR = f'no partition of relation "{PARENT_TABLE}" found for row'
+
+# Partitions attached to the parent table (resolved through the search_path)
+LIST_PARTITIONS_SQL = """
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = CAST(:parent AS regclass)
+"""
+
+
+def month_start(year: int, month: int) -> datetime:
+    """First instant of a month, normalising month overflow in either direction"""
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1)
+
+
+def partition_name(start: datetime) -> str:
+    """Partition table name for the month starting at start"""
+    return f"{PARENT_TABLE}_p{start.year:04d}_{start.month:02d}"
+
+
+def database_unreachable(error: Exception) -> bool:
+    """Whether a write failed for want of a connection rather than because of its rows"""
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(error, (OperationalError, InterfaceError))
+    return isinstance(error, OSError)
+
+
+class ActivationEventBuffer:
+    """Thread-safe buffer of pending events, written in multi-row batches"""
+
+    def __init__(self, batch_size: int, max_pending: Optional[int] = None):
+        self.batch_size = batch_size
+        # Events kept for a retry while the database is unreachable
+        self.max_pending = max_pending or batch_size * 10
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def add(self, event: Dict[str, Any]) -> bool:
+        """Queue an event; returns True once a full batch is waiting"""
+        with self._lock:
+            self._events.append(event)
+            return len(self._events) >= self.batch_size
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take every queued event"""
+        with self._lock:
+            events, self._events = self._events, []
+            return events
+
+    def requeue(self, events: List[Dict[str, Any]]) -> None:
+        """Put unwritten events back ahead of newer ones, dropping the oldest beyond max_pending"""
+        with self._lock:
+            self._events[:0] = events
+            overflow = len(self._events) - self.max_pending
+            if overflow > 0:
+                del self._events[:overflow]
+                logger.warning(f"Dropped {overflow} activation events while the database was unreachable")
+
+    def flush(self, db: Session) -> int:
+        """Write queued events on db with one multi-row INSERT per batch"""
+        # One flusher at a time keeps batches whole and ordered
+        with self._flush_lock:
+            events = self.drain()
+            written = 0
+            for offset in range(0, len(events), self.batch_size):
+                try:
+                    written += self._write(db, events[offset:offset + self.batch_size])
+                except Exception:
+                    # Failures _write does not pin on rows (a lost connection): keep this batch
+                    # and the rest for the next flush
+                    logger.exception(f"Activation event flush failed; {len(events) - offset} events kept for retry")
+                    self.requeue(events[offset:])
+                    break
+            return written
+
+    def _write(self, db: Session, events: List[Dict[str, Any]], partitions_checked: bool = False) -> int:
+        """Insert events in one transaction; a batch the database rejects is split so that
+        only the rows that fail on their own are dropped"""
+        try:
+            db.execute(insert(ActivationEvent), events)
+            db.commit()
+            return len(events)
+        except DBAPIError as e:
+            db.rollback()
+            if database_unreachable(e):
+                raise
+            error = e
+        # Retried outside the except block, so a dropped row's log is not chained to every split above it
+        if not partitions_checked and NO_PARTITION_ERROR in str(error.orig):
+            # The partition job has not created this month yet: create it and retry once
+            ActivationEventService(db).ensure_partitions()
+            return self._write(db, events, partitions_checked=True)
+        if len(events) == 1:
+            # History is best effort: never let it fail the request that triggered the flush
+            logger.error(f"Dropped activation event {events[0]}: {error.orig}")
+            return 0
+        middle = len(events) // 2
+        return (self._write(db, events[:middle], partitions_checked=True)
+                + self._write(db, events[middle:], partitions_checked=True))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+_buffer = ActivationEventBuffer(settings.activation_event_batch_size)
+
+# Wakes the background flusher; returns False when it is not running
+_wake_flusher: Optional[Callable[[], bool]] = None
+
+
+def set_activation_event_flusher(wake: Callable[[], bool]) -> None:
+    """Hand full batches to the background flush job instead of the request that filled them"""
+    global _wake_flusher
+    _wake_flusher = wake
+
+
+def record_activation_event(
+    event_type: ActivationEventType,
+    license_key_id: int,
+    owner_user_id: int,
+    machine_id: str,
+    activation_id: Optional[int] = None,
+    ip_address: Optional[str] = None
+) -> None:
+    """Queue an activation event; flushed by the background job, which is woken early
+    once a batch fills"""
+    batch_full = _buffer.add({
+        "occurred_at": datetime.now(timezone.utc),
+        "event_type": event_type,
+        "license_key_id": license_key_id,
+        "owner_user_id": owner_user_id,
+        "machine_id": machine_id,
+        "activation_id": activation_id,
+        "ip_address": ip_address,
+    })
+    if batch_full and (_wake_flusher is None or not _wake_flusher()):
+        # No background flusher running (scripts and CLI tools): write the batch here
+        with Session(engine) as db:
+            _buffer.flush(db)
+
+
+async def flush_activation_events() -> int:
+    """Write every queued event (run periodically and at shutdown)"""
+    async with async_session() as db:
+        return await db.run_sync(_buffer.flush)
+
+
+class ActivationEventService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _lock_partitions(self) -> bool:
+        """Take the partition maintenance lock for this transaction (False if another worker has it)"""
+        if self.db.execute(text(PARTITION_LOCK_SQL)).scalar():
+            return True
+        self.db.rollback()
+        return False
+
+    def list_partitions(self) -> List[str]:
+        """Names of the monthly partitions currently attached"""
+        rows = self.db.execute(text(LIST_PARTITIONS_SQL), {"parent": PARENT_TABLE}).scalars().all()
+        return sorted(name for name in rows if PARTITION_NAME.match(name))
+
+    def ensure_partitions(self, months_ahead: Optional[int] = None) -> List[str]:
+        """Create the partitions for this month and the next few months"""
+        if months_ahead is None:
+            months_ahead = settings.activation_event_partitions_ahead
+        # Skip if another worker is already creating them
+        if not self._lock_partitions():
+            return []
+        now = datetime.now(timezone.utc)
+        existing = set(self.list_partitions())
+
+        created = []
+        for offset in range(months_ahead + 1):
+            start = month_start(now.year, now.month + offset)
+            end = month_start(start.year, start.month + 1)
+            name = partition_name(start)
+            if name in existing:
+                continue
+            self.db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+            created.append(name)
+        self.db.commit()
+
+        return created
+
+    def drop_expired_partitions(self, retention_months: Optional[int] = None) -> List[str]:
+        """Detach and drop partitions that end before the retention cutoff"""
+        if retention_months is None:
+            retention_months = settings.activation_event_retention_months
+        now = datetime.now(timezone.utc)
+        cutoff = month_start(now.year, now.month - retention_months)
+        # Skip if another worker is already dropping them
+        if not self._lock_partitions():
+            return []
+
+        dropped = []
+        for name in self.list_partitions():
+            year, month = (int(part) for part in PARTITION_NAME.match(name).groups())
+            partition_end = month_start(year, month + 1)
+            if partition_end > cutoff:
+                continue
+            # Dropping a whole partition removes its rows and indexes without a DELETE or vacuum
+            self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            self.db.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+        self.db.commit()
+
+        return dropped
+
+
+def _maintain_partitions(db: Session) -> Tuple[List[str], List[str]]:
+    service = ActivationEventService(db)
+    return service.ensure_partitions(), service.drop_expired_partitions()
+
+
+async def maintain_activation_event_partitions() -> Dict[str, List[str]]:
+    """Create upcoming partitions and drop expired ones (run periodically)"""
+    async with async_session() as db:
+        created, dropped = await db.run_sync(_maintain_partitions)
+    if created or dropped:
+        logger.info(f"Activation event partitions created={created} dropped={dropped}")
+    return {"created": created, "dropped": dropped}
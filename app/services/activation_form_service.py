@@ -1,17 +1,35 @@
-from typing import List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, timedelta, timezone
+import logging
 import secrets
 import hashlib
 import json
 
-from app.models.database import ActivationForm, OfflineActivationCode, LicenseKey, Activation
+from app.config import settings
+from app.database.postgres import async_session
+from app.models.database import (
+    ActivationForm, ActivationFormStatus, ActivationEventType, ActivationStatus, OfflineActivationCode,
+    LicenseKey, Activation, User
+)
 from app.models.schemas import (
     ActivationFormCreate, ActivationFormResponse, ActivationFormComplete,
     OfflineActivationCodeCreate, OfflineActivationCodeResponse
 )
 from app.core.exceptions import LicenseNotFoundException, ActivationFormNotFoundException
+from app.utils.license_generator import generate_activation_codes
 from app.services.license_service import LicenseService
+from app.services.activation_event_service import record_activation_event
+from app.services.stats_service import record_stats_delta
+from app.database.replicas import read_replica
+
+logger = logging.getLogger(__name__)
+
+# Fresh draws allowed per batch when generated codes collide with existing ones
+MAX_CODE_COLLISION_RETRIES = 5
 
 class ActivationFormService:
     def __init__(self, db: Session):
@@ -49,7 +67,7 @@ class ActivationFormService:
             machine_id=form_data.machine_id,
             machine_name=form_data.machine_name,
             request_code=request_code,
-            status="pending"
+            status=ActivationFormStatus.PENDING.value
         )
         
         self.db.add(db_form)
@@ -59,7 +77,9 @@ class ActivationFormService:
         return self._to_response(db_form)
     
     def complete_activation_form(self, complete_data: ActivationFormComplete) -> ActivationFormResponse:
-        """Complete an activation form with activation code"""
+        """Complete an activation form with activation code (one transaction, one commit)"""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # expires_at is stored as naive UTC
+        
         # Find the activation form
         form = self.db.exec(
             select(ActivationForm).where(ActivationForm.request_code == complete_data.request_code)
@@ -68,76 +88,191 @@ class ActivationFormService:
         if not form:
             raise ActivationFormNotFoundException("Activation form not found")
         
-        if form.status != "pending":
+        if form.status != ActivationFormStatus.PENDING.value:
             raise ValueError("Activation form is not pending")
         
-        if form.expires_at <= datetime.now(timezone.utc):
+        if form.expires_at <= now:
             raise ValueError("Activation form has expired")
         
-        # Verify activation code
-        if not self._verify_activation_code(form.license_key_id, complete_data.activation_code):
-            raise ValueError("Invalid activation code")
+        # Each step below is a conditional UPDATE that either claims its row or
+        # matches nothing, so concurrent completions cannot both get through;
+        # any failure rolls back the steps already taken
+        try:
+            completed_form = self.db.execute(
+                update(ActivationForm)
+                .where(
+                    ActivationForm.id == form.id,
+                    ActivationForm.status == ActivationFormStatus.PENDING.value
+                )
+                .values(
+                    status=ActivationFormStatus.COMPLETED.value,
+                    activation_code=complete_data.activation_code,
+                    completed_at=now
+                )
+                .returning(*ActivationForm.__table__.c)
+                .execution_options(synchronize_session=False)
+            ).first()
+            if not completed_form:
+                raise ValueError("Activation form is not pending")
+            
+            if not self._redeem_activation_code(form.license_key_id, complete_data.activation_code, now):
+                raise ValueError("Invalid activation code")
+            
+            # Take a seat on the license
+            seat = self.db.execute(
+                update(LicenseKey)
+                .where(
+                    LicenseKey.id == form.license_key_id,
+                    LicenseKey.current_activations < LicenseKey.max_activations
+                )
+                .values(current_activations=LicenseKey.current_activations + 1)
+                .returning(LicenseKey.owner_user_id)
+                .execution_options(synchronize_session=False)
+            ).first()
+            if not seat:
+                raise ValueError("Maximum activations reached")
+            
+            # Create activation
+            activation = Activation(
+                license_key_id=form.license_key_id,
+                machine_id=form.machine_id,
+                machine_name=form.machine_name,
+                status=ActivationStatus.ACTIVE,
+                owner_user_id=seat.owner_user_id
+            )
+            self.db.add(activation)
+            self.db.flush()
+            activation_id = activation.id
+            
+            record_stats_delta(self.db, seat.owner_user_id, active_activations=1)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         
-        # Create activation
-        activation = Activation(
-            license_key_id=form.license_key_id,
-            machine_id=form.machine_id,
-            machine_name=form.machine_name,
-            status="active"
+        record_activation_event(
+            ActivationEventType.ACTIVATE, form.license_key_id, seat.owner_user_id,
+            completed_form.machine_id, activation_id=activation_id
         )
         
-        # Update license activation count
-        license_key = self.db.get(LicenseKey, form.license_key_id)
-        license_key.current_activations += 1
-        
-        # Mark form as completed
-        form.status = "completed"
-        form.activation_code = complete_data.activation_code
-        form.completed_at = datetime.now(timezone.utc)
-        
-        self.db.add(activation)
-        self.db.add(license_key)
-        self.db.add(form)
+        return self._to_response(completed_form)
+    
+    def generate_offline_activation_codes(
+        self, code_data: OfflineActivationCodeCreate, owner: User
+    ) -> List[OfflineActivationCodeResponse]:
+        """Generate offline activation codes for a license (with ownership check)"""
+        self.check_offline_code_license(code_data, owner)
+        return [
+            self._to_offline_response(code)
+            for count in offline_code_batch_sizes(code_data.quantity)
+            for code in self.insert_offline_code_batch(code_data, count)
+        ]
+    
+    def check_offline_code_license(self, code_data: OfflineActivationCodeCreate, owner: User) -> None:
+        """Raise unless owner owns the license the codes are for"""
+        if not self.license_service._get_owned(code_data.license_key_id, owner):
+            raise LicenseNotFoundException(code_data.license_key_id)
+    
+    def insert_offline_code_batch(self, code_data: OfflineActivationCodeCreate, count: int) -> list:
+        """Insert and commit one batch of count codes, returning the rows"""
+        batch = self._insert_offline_code_batch(code_data.license_key_id, code_data.machine_id, count)
         self.db.commit()
-        self.db.refresh(form)
-        
-        return self._to_response(form)
+        return batch
     
-    def generate_offline_activation_codes(self, code_data: OfflineActivationCodeCreate) -> List[OfflineActivationCodeResponse]:
-        """Generate offline activation codes for a license"""
-        # Verify license exists
-        license_key = self.db.get(LicenseKey, code_data.license_key_id)
-        if not license_key:
-            raise LicenseNotFoundException(f"License {code_data.license_key_id} not found")
+    def _insert_offline_code_batch(self, license_key_id: int, machine_id: Optional[str], count: int) -> list:
+        """Insert count codes with multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING"""
+        inserted = []
+        missing = count
+        for _ in range(MAX_CODE_COLLISION_RETRIES):
+            codes = generate_activation_codes(missing)
+            rows = self.db.execute(
+                insert(OfflineActivationCode)
+                .values([
+                    {"license_key_id": license_key_id, "activation_code": code, "machine_id": machine_id}
+                    for code in codes
+                ])
+                .on_conflict_do_nothing(index_elements=[OfflineActivationCode.activation_code])
+                .returning(*OfflineActivationCode.__table__.c)
+            ).all()
+            inserted.extend(rows)
+            # Only codes that collided are drawn again
+            missing -= len(rows)
+            if missing == 0:
+                return inserted
         
-        codes = []
-        for _ in range(code_data.quantity):
-            activation_code = self._generate_activation_code()
-            
-            db_code = OfflineActivationCode(
-                license_key_id=code_data.license_key_id,
-                activation_code=activation_code,
-                machine_id=code_data.machine_id
+        raise RuntimeError(f"Could not generate {missing} unique activation codes")
+    
+    @read_replica
+    def list_activation_forms(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[ActivationFormStatus] = None,
+        owner: Optional[User] = None
+    ) -> List[ActivationFormResponse]:
+        """List activation forms, optionally only those in one status or for one owner's licenses"""
+        query = select(ActivationForm)
+        if status is not None:
+            query = query.where(ActivationForm.status == status.value)
+        if owner is not None:
+            query = query.join(LicenseKey, LicenseKey.id == ActivationForm.license_key_id).where(
+                LicenseKey.owner_user_id == owner.id
             )
-            
-            self.db.add(db_code)
-            codes.append(db_code)
+        forms = self.db.exec(query.offset(skip).limit(limit)).all()
         
-        self.db.commit()
+        return [self._to_response(form) for form in forms]
+    
+    def sweep_expired(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """Expire overdue pending forms and delete overdue unused offline codes, in batches"""
+        batch_size = batch_size or settings.activation_form_sweep_batch_size
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # expires_at is stored as naive UTC
         
-        # Refresh all codes
-        for code in codes:
-            self.db.refresh(code)
+        # Both statements claim rows through the partial indexes and skip rows
+        # another worker or an in-flight completion holds
+        overdue_forms = (
+            select(ActivationForm.id)
+            .where(
+                ActivationForm.status == ActivationFormStatus.PENDING.value,
+                ActivationForm.expires_at <= now
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        overdue_codes = (
+            select(OfflineActivationCode.id)
+            .where(
+                OfflineActivationCode.is_used == False,
+                OfflineActivationCode.expires_at <= now
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
         
-        return [self._to_offline_response(code) for code in codes]
-    
-    def list_activation_forms(self, skip: int = 0, limit: int = 100) -> List[ActivationFormResponse]:
-        """List activation forms"""
-        forms = self.db.exec(
-            select(ActivationForm).offset(skip).limit(limit)
-        ).all()
+        forms_expired = self._sweep_batches(
+            update(ActivationForm)
+            .where(ActivationForm.id.in_(overdue_forms.scalar_subquery()))
+            .values(status=ActivationFormStatus.EXPIRED.value)
+            .execution_options(synchronize_session=False),
+            batch_size
+        )
+        codes_deleted = self._sweep_batches(
+            delete(OfflineActivationCode)
+            .where(OfflineActivationCode.id.in_(overdue_codes.scalar_subquery()))
+            .execution_options(synchronize_session=False),
+            batch_size
+        )
         
-        return [self._to_response(form) for form in forms]
+        return {"forms_expired": forms_expired, "codes_deleted": codes_deleted}
+    
+    def _sweep_batches(self, statement, batch_size: int) -> int:
+        """Run a batch statement, committing each batch, until a short batch"""
+        total = 0
+        while True:
+            swept = self.db.execute(statement).rowcount
+            self.db.commit()
+            total += swept
+            if swept < batch_size:
+                return total
     
     def get_activation_form(self, form_id: int) -> ActivationFormResponse:
         """Get activation form by ID"""
@@ -154,31 +289,24 @@ class ActivationFormService:
         combined = f"{machine_id}:{random_data}:{datetime.now(timezone.utc).isoformat()}"
         return hashlib.sha256(combined.encode()).hexdigest()[:16].upper()
     
-    def _generate_activation_code(self) -> str:
-        """Generate a unique activation code"""
-        # Generate 16-character alphanumeric code
-        return ''.join(secrets.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789') for _ in range(16))
-    
-    def _verify_activation_code(self, license_key_id: int, activation_code: str) -> bool:
-        """Verify an activation code"""
-        code = self.db.exec(
-            select(OfflineActivationCode).where(
+    def _redeem_activation_code(self, license_key_id: int, activation_code: str, now: datetime) -> bool:
+        """Mark an unused, unexpired activation code used in one statement (no commit)"""
+        # A concurrent redeemer of the same code waits on the row lock, then
+        # re-checks NOT is_used against the committed row and matches nothing
+        redeemed = self.db.execute(
+            update(OfflineActivationCode)
+            .where(
                 OfflineActivationCode.license_key_id == license_key_id,
                 OfflineActivationCode.activation_code == activation_code,
                 OfflineActivationCode.is_used == False,
-                OfflineActivationCode.expires_at > datetime.now(timezone.utc)
+                OfflineActivationCode.expires_at > now
             )
+            .values(is_used=True, used_at=now)
+            .returning(OfflineActivationCode.id)
+            .execution_options(synchronize_session=False)
         ).first()
         
-        if code:
-            # Mark as used
-            code.is_used = True
-            code.used_at = datetime.now(timezone.utc)
-            self.db.add(code)
-            self.db.commit()
-            return True
-        
-        return False
+        return redeemed is not None
     
     def _to_response(self, form: ActivationForm) -> ActivationFormResponse:
         """Convert database model to response schema"""
@@ -206,4 +334,44 @@ class ActivationFormService:
             expires_at=code.expires_at,
             created_at=code.created_at,
             used_at=code.used_at
-        ) 
\ No newline at end of file
+        ) 
+
+
+def offline_code_batch_sizes(quantity: int) -> Iterator[int]:
+    """Split a code quantity into insert batches of at most offline_code_batch_size"""
+    for offset in range(0, quantity, settings.offline_code_batch_size):
+        yield min(quantity - offset, settings.offline_code_batch_size)
+
+
+async def stream_offline_activation_codes(
+    db: AsyncSession, code_data: OfflineActivationCodeCreate, owner: User
+) -> AsyncIterator[list]:
+    """Generate offline activation codes batch by batch, yielding each committed batch of rows
+    
+    Ownership is checked on the request's session before anything is generated.
+    The batches are inserted through a session the generator opens and closes
+    itself, so a streamed response does not depend on the request's session
+    outliving the endpoint.
+    """
+    await db.run_sync(lambda db: ActivationFormService(db).check_offline_code_license(code_data, owner))
+    
+    async def batches() -> AsyncIterator[list]:
+        async with async_session() as batch_db:
+            for count in offline_code_batch_sizes(code_data.quantity):
+                yield await batch_db.run_sync(
+                    lambda db: ActivationFormService(db).insert_offline_code_batch(code_data, count)
+                )
+    
+    return batches()
+
+
+async def sweep_expired_activation_forms() -> Dict[str, int]:
+    """Expire overdue activation forms and offline codes (run periodically)"""
+    async with async_session() as db:
+        result = await db.run_sync(lambda db: ActivationFormService(db).sweep_expired())
+    if result["forms_expired"] or result["codes_deleted"]:
+        logger.info(
+            f"Activation form sweep expired {result['forms_expired']} forms "
+            f"and deleted {result['codes_deleted']} offline codes"
+        )
+    return result
@@ -1,9 +1,19 @@
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import logging
+from collections import Counter
+from sqlalchemy import delete, func, literal, literal_column, update
 from sqlmodel import Session, select
-from app.models.database import Activation, LicenseKey, ActivationStatus, User, UserRole, Application
+from app.config import settings
+from app.models.database import Activation, ActivationEventType, LicenseKey, ActivationStatus, User, UserRole, Application
 from app.models.schemas import ActivationResponse
 from app.core.exceptions import LicenseNotFoundException
+from app.services.activation_event_service import record_activation_event
+from app.services.stats_service import record_stats_delta
+from app.database.postgres import async_session
+from app.database.replicas import read_replica, tag_session_user
+
+logger = logging.getLogger(__name__)
 
 class ActivationService:
     def __init__(self, db: Session):
@@ -13,30 +23,15 @@ class ActivationService:
         self, 
         license_key: LicenseKey, 
         machine_id: str, 
-        client_ip: Optional[str] = None
+        client_ip: Optional[str] = None,
+        event_type: ActivationEventType = ActivationEventType.VALIDATE
     ) -> Dict[str, Any]:
         """Handle machine activation for a license"""
         
         # Check if machine is already activated
-        existing_activation = self.db.exec(
-            select(Activation).where(
-                Activation.license_key_id == license_key.id,
-                Activation.machine_id == machine_id,
-                Activation.status == ActivationStatus.ACTIVE
-            )
-        ).first()
-        
+        existing_activation = self.get_active_activation(license_key.id, machine_id)
         if existing_activation:
-            # Update heartbeat for existing activation
-            existing_activation.last_heartbeat = datetime.now(timezone.utc)
-            self.db.add(existing_activation)
-            self.db.commit()
-            
-            return {
-                "success": True,
-                "activation_id": existing_activation.id,
-                "message": "Machine already activated, heartbeat updated"
-            }
+            return self.record_heartbeat(license_key, existing_activation, client_ip, event_type=event_type)
         
         # Check activation limits
         if license_key.current_activations >= license_key.max_activations:
@@ -46,22 +41,41 @@ class ActivationService:
                 "message": "Maximum activations reached"
             }
         
-        # Create new activation
-        activation = Activation(
-            license_key_id=license_key.id,
-            machine_id=machine_id,
-            ip_address=client_ip,
-            status=ActivationStatus.ACTIVE
-        )
+        # Reuse the machine's reaped activation if it has one, otherwise create a new one
+        activation = self.db.exec(
+            select(Activation).where(
+                Activation.license_key_id == license_key.id,
+                Activation.machine_id == machine_id,
+                Activation.status == ActivationStatus.INACTIVE
+            )
+        ).first()
+        if activation:
+            activation.status = ActivationStatus.ACTIVE
+            activation.ip_address = client_ip
+            activation.last_heartbeat = datetime.now(timezone.utc)
+        else:
+            activation = Activation(
+                license_key_id=license_key.id,
+                machine_id=machine_id,
+                ip_address=client_ip,
+                status=ActivationStatus.ACTIVE,
+                owner_user_id=license_key.owner_user_id
+            )
         self.db.add(activation)
         
         # Update license activation count
         license_key.current_activations += 1
         self.db.add(license_key)
+        record_stats_delta(self.db, license_key.owner_user_id, active_activations=1)
         
         self.db.commit()
         self.db.refresh(activation)
         
+        record_activation_event(
+            ActivationEventType.ACTIVATE, license_key.id, license_key.owner_user_id, machine_id,
+            activation_id=activation.id, ip_address=client_ip
+        )
+        
         return {
             "success": True,
             "activation_id": activation.id,
@@ -69,76 +83,221 @@ class ActivationService:
             "message": "Machine activated successfully"
         }
     
+    def get_active_activation(self, license_key_id: int, machine_id: str) -> Optional[Activation]:
+        """Find the machine's active activation on a license"""
+        return self.db.exec(
+            select(Activation).where(
+                Activation.license_key_id == license_key_id,
+                Activation.machine_id == machine_id,
+                Activation.status == ActivationStatus.ACTIVE
+            )
+        ).first()
+    
+    def record_heartbeat(
+        self,
+        license_key: LicenseKey,
+        activation: Activation,
+        client_ip: Optional[str] = None,
+        event_type: ActivationEventType = ActivationEventType.VALIDATE
+    ) -> Dict[str, Any]:
+        """Record a check-in from an already activated machine"""
+        # Update heartbeat for existing activation, at most once per write interval:
+        # every call is kept in the event history, the hot row only moves forward
+        # Captured up front: the commit below expires the loaded rows
+        activation_id, machine_id = activation.id, activation.machine_id
+        license_key_id, owner_user_id = license_key.id, license_key.owner_user_id
+        now = datetime.now(timezone.utc)
+        last_heartbeat = activation.last_heartbeat
+        if last_heartbeat.tzinfo is None:
+            last_heartbeat = last_heartbeat.replace(tzinfo=timezone.utc)
+        if now - last_heartbeat >= timedelta(seconds=settings.heartbeat_write_interval_seconds):
+            activation.last_heartbeat = now
+            self.db.add(activation)
+            self.db.commit()
+        
+        record_activation_event(
+            event_type, license_key_id, owner_user_id, machine_id,
+            activation_id=activation_id, ip_address=client_ip
+        )
+        
+        return {
+            "success": True,
+            "activation_id": activation_id,
+            "message": "Machine already activated, heartbeat updated"
+        }
+    
     def deactivate_machine(self, activation_id: int, current_user: User) -> bool:
         """Deactivate a specific machine (user can only deactivate their own activations)"""
-        activation = self.db.get(Activation, activation_id)
-        if not activation:
+        tag_session_user(self.db, current_user.id)
+        # Fetch the activation and its license in one query that also proves ownership
+        row = self.db.exec(
+            select(Activation, LicenseKey)
+            .join(LicenseKey, Activation.license_key_id == LicenseKey.id)
+            .where(
+                Activation.id == activation_id,
+                Activation.owner_user_id == current_user.id
+            )
+        ).first()
+        if not row:
             return False
         
-        # Check if user can access this activation
-        if not self._can_access_activation(activation, current_user):
-            return False
+        activation, license_key = row
         
-        # Update license activation count
-        license_key = self.db.get(LicenseKey, activation.license_key_id)
-        if license_key and license_key.current_activations > 0:
+        # Update license activation count (inactive activations no longer hold a seat)
+        if activation.status == ActivationStatus.ACTIVE and license_key.current_activations > 0:
             license_key.current_activations -= 1
             self.db.add(license_key)
+        record_stats_delta(
+            self.db, current_user.id, active_activations=-1 if activation.status == ActivationStatus.ACTIVE else 0
+        )
         
         # Remove activation
+        event = (activation.license_key_id, activation.owner_user_id, activation.machine_id, activation.id)
         self.db.delete(activation)
         self.db.commit()
         
+        license_key_id, owner_user_id, machine_id, activation_id = event
+        record_activation_event(
+            ActivationEventType.DEACTIVATE, license_key_id, owner_user_id, machine_id,
+            activation_id=activation_id
+        )
+        
         return True
     
+    def deactivate_machines(self, activation_ids: List[int], current_user: User) -> int:
+        """Deactivate many machines in one statement (only the user's own activations are touched)"""
+        tag_session_user(self.db, current_user.id)
+        # Delete the owned activations, release the seats they held and report
+        # how many rows went, all as a single statement of data-modifying CTEs
+        removed = (
+            delete(Activation)
+            .where(
+                Activation.id.in_(activation_ids),
+                Activation.owner_user_id == current_user.id
+            )
+            .returning(Activation.id, Activation.license_key_id, Activation.machine_id, Activation.status)
+            .cte("removed")
+        )
+        released = (
+            select(removed.c.license_key_id, func.count().label("seats"))
+            .where(removed.c.status == ActivationStatus.ACTIVE)
+            .group_by(removed.c.license_key_id)
+            .cte("released")
+        )
+        adjusted = (
+            update(LicenseKey)
+            .where(LicenseKey.id == released.c.license_key_id)
+            .values(current_activations=func.greatest(LicenseKey.current_activations - released.c.seats, 0))
+            .returning(LicenseKey.id)
+            .cte("adjusted")
+        )
+        removed_rows = self.db.exec(
+            select(removed.c.id, removed.c.license_key_id, removed.c.machine_id, removed.c.status)
+            .add_cte(adjusted)
+        ).all()
+        released_seats = sum(1 for row in removed_rows if row.status == ActivationStatus.ACTIVE)
+        record_stats_delta(self.db, current_user.id, active_activations=-released_seats)
+        self.db.commit()
+        
+        for row in removed_rows:
+            record_activation_event(
+                ActivationEventType.DEACTIVATE, row.license_key_id, current_user.id,
+                row.machine_id, activation_id=row.id
+            )
+        
+        return len(removed_rows)
+    
+    def reap_stale_activations(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """Mark activations past their application's heartbeat TTL inactive and free their seats"""
+        batch_size = batch_size or settings.activation_reaper_batch_size
+        ttl_seconds = func.coalesce(Application.heartbeat_ttl_seconds, settings.activation_heartbeat_ttl_seconds)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # last_heartbeat is stored as naive UTC
+        
+        reaped_total = 0
+        licenses = set()
+        while True:
+            # Claim a batch of stale rows; rows another worker holds are skipped, not waited on
+            stale = (
+                select(Activation.id)
+                .join(LicenseKey, Activation.license_key_id == LicenseKey.id)
+                .join(Application, LicenseKey.application_id == Application.id)
+                .where(
+                    Activation.status == ActivationStatus.ACTIVE,
+                    ttl_seconds > 0,
+                    Activation.last_heartbeat < literal(now) - ttl_seconds * literal_column("interval '1 second'")
+                )
+                .order_by(Activation.last_heartbeat)
+                .limit(batch_size)
+                .with_for_update(of=Activation, skip_locked=True)
+                .cte("stale")
+            )
+            reaped = (
+                update(Activation)
+                .where(Activation.id == stale.c.id)
+                .values(status=ActivationStatus.INACTIVE)
+                .returning(Activation.id, Activation.license_key_id, Activation.owner_user_id, Activation.machine_id)
+                .cte("reaped")
+            )
+            released = (
+                select(reaped.c.license_key_id, func.count().label("seats"))
+                .group_by(reaped.c.license_key_id)
+                .cte("released")
+            )
+            adjusted = (
+                update(LicenseKey)
+                .where(LicenseKey.id == released.c.license_key_id)
+                .values(current_activations=func.greatest(LicenseKey.current_activations - released.c.seats, 0))
+                .returning(LicenseKey.id)
+                .cte("adjusted")
+            )
+            rows = self.db.exec(
+                select(reaped.c.id, reaped.c.license_key_id, reaped.c.owner_user_id, reaped.c.machine_id)
+                .add_cte(adjusted)
+            ).all()
+            
+            for owner_user_id, seats in Counter(row.owner_user_id for row in rows).items():
+                record_stats_delta(self.db, owner_user_id, active_activations=-seats)
+            self.db.commit()
+            
+            for row in rows:
+                record_activation_event(
+                    ActivationEventType.DEACTIVATE, row.license_key_id, row.owner_user_id,
+                    row.machine_id, activation_id=row.id
+                )
+            reaped_total += len(rows)
+            licenses.update(row.license_key_id for row in rows)
+            
+            if len(rows) < batch_size:
+                break
+        
+        return {"seats_reclaimed": reaped_total, "licenses": len(licenses)}
+    
+    @read_replica
     def list_activations_for_user(self, current_user: User, skip: int = 0, limit: int = 100) -> List[ActivationResponse]:
         """List activations for a specific user (filtered by ownership)"""
         # Users can only see activations for their own licenses
         activations = self.db.exec(
             select(Activation)
-            .join(LicenseKey)
-            .join(Application)
-            .where(Application.user_id == current_user.id)
+            .where(Activation.owner_user_id == current_user.id)
             .offset(skip)
             .limit(limit)
         ).all()
         
         return [self._to_response(activation) for activation in activations]
     
+    @read_replica
     def get_activations_for_license(self, license_id: int, current_user: User) -> List[ActivationResponse]:
         """Get all activations for a specific license (filtered by ownership)"""
-        license_key = self.db.get(LicenseKey, license_id)
-        if not license_key:
-            return []
-        
-        # Check if user can access this license
-        if not self._can_access_license(license_key, current_user):
-            return []
-        
+        # Activations carry their owner, so one query both filters and proves ownership
         activations = self.db.exec(
-            select(Activation).where(Activation.license_key_id == license_id)
+            select(Activation).where(
+                Activation.license_key_id == license_id,
+                Activation.owner_user_id == current_user.id
+            )
         ).all()
         
         return [self._to_response(activation) for activation in activations]
     
-    def _can_access_activation(self, activation: Activation, user: User) -> bool:
-        """Check if user can access a specific activation"""
-        # Get the license key and check ownership
-        license_key = self.db.get(LicenseKey, activation.license_key_id)
-        if not license_key:
-            return False
-        
-        return self._can_access_license(license_key, user)
-    
-    def _can_access_license(self, license_key: LicenseKey, user: User) -> bool:
-        """Check if user can access a specific license"""
-        # Check if the license belongs to an application owned by the user
-        application = self.db.get(Application, license_key.application_id)
-        if not application:
-            return False
-        
-        return application.owner_id == user.id
-    
     def _to_response(self, activation: Activation) -> ActivationResponse:
         """Convert database model to response schema"""
         return ActivationResponse(
@@ -150,4 +309,16 @@ class ActivationService:
             status=activation.status,
             activated_at=activation.activated_at,
             last_heartbeat=activation.last_heartbeat
-        )
\ No newline at end of file
+        )
+
+
+async def reap_stale_activations() -> Dict[str, int]:
+    """Free seats held by machines that stopped heartbeating (run periodically)"""
+    async with async_session() as db:
+        result = await db.run_sync(lambda db: ActivationService(db).reap_stale_activations())
+    if result["seats_reclaimed"]:
+        logger.info(
+            f"Activation reaper reclaimed {result['seats_reclaimed']} seats "
+            f"across {result['licenses']} licenses"
+        )
+    return result
@@ -4,9 +4,12 @@ Application service for managing applications
 import json
 from typing import List, Optional, Dict, Any
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.database import Application, User
 from app.models.schemas import ApplicationCreate, ApplicationResponse, ApplicationUpdate
 from app.core.exceptions import ApplicationNotFoundException
+from app.services.stats_service import record_stats_delta, record_stats_delta_async
+from app.database.replicas import read_replica
 
 
 class ApplicationService:
@@ -33,10 +36,12 @@ class ApplicationService:
             version=application_data.version,
             description=application_data.description,
             features=json.dumps(application_data.features) if application_data.features else None,
+            heartbeat_ttl_seconds=application_data.heartbeat_ttl_seconds,
             user_id=user.id
         )
         
         self.db.add(db_application)
+        record_stats_delta(self.db, user.id, applications=1)
         self.db.commit()
         self.db.refresh(db_application)
         
@@ -102,6 +107,7 @@ class ApplicationService:
                 setattr(application, field, value)
         
         self.db.add(application)
+        record_stats_delta(self.db, user.id)
         self.db.commit()
         self.db.refresh(application)
         
@@ -120,6 +126,7 @@ class ApplicationService:
             return False
         
         self.db.delete(application)
+        record_stats_delta(self.db, user.id, applications=-1)
         self.db.commit()
         return True
     
@@ -154,5 +161,126 @@ class ApplicationService:
             version=application.version,
             description=application.description,
             features=features,
+            heartbeat_ttl_seconds=application.heartbeat_ttl_seconds,
             created_at=application.created_at
-        )
\ No newline at end of file
+        )
+
+
+class AsyncApplicationService(ApplicationService):
+    """ApplicationService on an AsyncSession, for async endpoints"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create_application(self, application_data: ApplicationCreate, user: User) -> ApplicationResponse:
+        """Create a new application"""
+        # Check if application with same name already exists for this user
+        existing_application = await self._get_by_name(application_data.name, user)
+        if existing_application:
+            from app.core.exceptions import ApplicationAlreadyExistsException
+            raise ApplicationAlreadyExistsException(application_data.name)
+        
+        # Create application with user ownership
+        db_application = Application(
+            name=application_data.name,
+            version=application_data.version,
+            description=application_data.description,
+            features=json.dumps(application_data.features) if application_data.features else None,
+            heartbeat_ttl_seconds=application_data.heartbeat_ttl_seconds,
+            user_id=user.id
+        )
+        
+        self.db.add(db_application)
+        await record_stats_delta_async(self.db, user.id, applications=1)
+        await self.db.commit()
+        await self.db.refresh(db_application)
+        
+        return self._to_response(db_application)
+    
+    @read_replica
+    async def get_application(self, application_id: int, user: User) -> ApplicationResponse:
+        """Get an application by ID (with ownership check)"""
+        application = await self._get_owned(application_id, user)
+        if not application:
+            raise ApplicationNotFoundException(application_id)
+        
+        return self._to_response(application)
+    
+    async def get_application_by_name(self, name: str, user: User) -> Optional[ApplicationResponse]:
+        """Get an application by name (with ownership check)"""
+        application = await self._get_by_name(name, user)
+        if not application:
+            return None
+        
+        return self._to_response(application)
+    
+    @read_replica
+    async def list_applications(self, user: User, skip: int = 0, limit: int = 100) -> List[ApplicationResponse]:
+        """List all applications for a user"""
+        applications = (await self.db.exec(
+            select(Application)
+            .where(Application.user_id == user.id)
+            .offset(skip)
+            .limit(limit)
+        )).all()
+        
+        return [self._to_response(application) for application in applications]
+    
+    async def update_application(self, application_id: int, application_update: ApplicationUpdate, user: User) -> ApplicationResponse:
+        """Update an application (with ownership check)"""
+        application = await self._get_owned(application_id, user)
+        if not application:
+            raise ApplicationNotFoundException(application_id)
+        
+        # Update fields
+        update_data = application_update.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            if field == 'features' and value is not None:
+                setattr(application, field, json.dumps(value))
+            else:
+                setattr(application, field, value)
+        
+        self.db.add(application)
+        await record_stats_delta_async(self.db, user.id)
+        await self.db.commit()
+        await self.db.refresh(application)
+        
+        return self._to_response(application)
+    
+    async def delete_application(self, application_id: int, user: User) -> bool:
+        """Delete an application (with ownership check)"""
+        application = await self._get_owned(application_id, user)
+        if not application:
+            return False
+        
+        await self.db.delete(application)
+        await record_stats_delta_async(self.db, user.id, applications=-1)
+        await self.db.commit()
+        return True
+    
+    async def get_or_create_application(self, application_data: ApplicationCreate, user: User) -> ApplicationResponse:
+        """Get existing application or create new one"""
+        existing_application = await self._get_by_name(application_data.name, user)
+        if existing_application:
+            return self._to_response(existing_application)
+        
+        # Create new application
+        return await self.create_application(application_data, user)
+    
+    async def _get_owned(self, application_id: int, user: User) -> Optional[Application]:
+        """Load an application owned by the user"""
+        return (await self.db.exec(
+            select(Application).where(
+                Application.id == application_id,
+                Application.user_id == user.id
+            )
+        )).first()
+    
+    async def _get_by_name(self, name: str, user: User) -> Optional[Application]:
+        """Load an application by name owned by the user"""
+        return (await self.db.exec(
+            select(Application).where(
+                Application.name == name,
+                Application.user_id == user.id
+            )
+        )).first()
@@ -1,10 +1,15 @@
 # auth service layer
+import asyncio
 import secrets
 import hashlib
 import json
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Union
+from typing import List, NamedTuple, Optional, Tuple, Union
+from sqlalchemy import lambda_stmt, update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
@@ -22,9 +27,40 @@ from app.core.exceptions import (
     UserNotFoundException, InvalidCredentialsException, 
     TokenNotFoundException, PermissionDeniedException
 )
+from app.config import settings
+from app.core.cache import API_TOKEN_CACHE, get_cache
+from app.database.invalidation import invalidate_on_commit
+from app.database.replicas import read_replica
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+class CachedAPIToken(NamedTuple):
+    """A verified API token as kept in worker memory"""
+    user_id: int
+    scopes: Tuple[TokenScope, ...]
+    expires_at: Optional[datetime]
+    last_used_written: float  # time.monotonic() of the last last_used_at write
+
+# Verified API tokens by token hash, so authenticating a request does not need the
+# token row or a last_used_at write each time. Token updates and deletes evict
+# entries in every worker through app.database.invalidation; the user is still
+# loaded per request, so deactivating a user takes effect at once
+api_token_cache = get_cache(API_TOKEN_CACHE, ttl_seconds=settings.api_token_cache_seconds)
+
+# Token lookups run on every authenticated request: as lambda statements the
+# select() is built once per call site and later calls only bind the hash
+def session_by_token_statement(token_hash: str) -> StatementLambdaElement:
+    """Unrevoked login session by token hash"""
+    return lambda_stmt(
+        lambda: select(DBSession).where(DBSession.session_token == token_hash, DBSession.is_revoked == False)
+    )
+
+def api_token_by_hash_statement(token_hash: str) -> StatementLambdaElement:
+    """Active API token by token hash"""
+    return lambda_stmt(
+        lambda: select(APIToken).where(APIToken.token_hash == token_hash, APIToken.is_active == True)
+    )
+
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
@@ -261,12 +297,7 @@ class AuthService:
         """Verify session token and return user (timing-attack resistant)"""
         token_hash = hashlib.sha256(token.encode()).hexdigest()
         
-        db_session = self.db.exec(
-            select(DBSession).where(
-                DBSession.session_token == token_hash,
-                DBSession.is_revoked == False
-            )
-        ).first()
+        db_session = self.db.execute(session_by_token_statement(token_hash)).scalars().first()
         
         # Always perform some work to maintain consistent timing
         if not db_session:
@@ -343,12 +374,21 @@ class AuthService:
         """Verify API token and return user + scopes (timing-attack resistant)"""
         token_hash = hashlib.sha256(token.encode()).hexdigest()
         
-        db_token = self.db.exec(
-            select(APIToken).where(
-                APIToken.token_hash == token_hash,
-                APIToken.is_active == True
-            )
-        ).first()
+        cached = self._cached_api_token(token_hash)
+        if cached is not None:
+            user = self.db.get(User, cached.user_id)
+            if not user or not user.is_active:
+                return None
+            if self._last_use_due(cached):
+                self.db.execute(
+                    update(APIToken).where(APIToken.token_hash == token_hash)
+                    .values(last_used_at=datetime.now(timezone.utc))
+                )
+                self.db.commit()
+                self._remember_api_token(token_hash, cached.user_id, cached.scopes, cached.expires_at)
+            return user, list(cached.scopes)
+        
+        db_token = self.db.execute(api_token_by_hash_statement(token_hash)).scalars().first()
         
         # Always perform some work to maintain consistent timing
         if not db_token:
@@ -380,6 +420,7 @@ class AuthService:
         
         # Parse scopes
         scopes = [TokenScope(scope) for scope in json.loads(db_token.scopes)]
+        self._remember_api_token(token_hash, db_token.user_id, scopes, db_token.expires_at)
         
         return user, scopes
     
@@ -404,6 +445,7 @@ class AuthService:
             raise TokenNotFoundException(f"Token {token_id} not found")
         
         self.db.delete(token)
+        invalidate_on_commit(self.db, API_TOKEN_CACHE, [token.token_hash])
         self.db.commit()
         
         return {"message": "API token deleted successfully"}
@@ -447,6 +489,7 @@ class AuthService:
             setattr(token, field, value)
         
         self.db.add(token)
+        invalidate_on_commit(self.db, API_TOKEN_CACHE, [token.token_hash])
         self.db.commit()
         self.db.refresh(token)
         
@@ -461,6 +504,31 @@ class AuthService:
         # Use secrets.token_urlsafe for cryptographically secure random tokens
         return f"st_{secrets.token_urlsafe(32)}"
     
+    @staticmethod
+    def _token_expired(expires_at: Optional[datetime]) -> bool:
+        """Whether an API token is past its expiry (naive values are UTC)"""
+        if expires_at is None:
+            return False
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at <= datetime.now(timezone.utc)
+    
+    def _cached_api_token(self, token_hash: str) -> Optional[CachedAPIToken]:
+        """A cached, unexpired API token, or None"""
+        cached = api_token_cache.get(token_hash)
+        if cached is None or self._token_expired(cached.expires_at):
+            return None
+        return cached
+    
+    def _remember_api_token(self, token_hash: str, user_id: int, scopes, expires_at: Optional[datetime]) -> None:
+        """Cache a verified API token, noting that its last_used_at was just written"""
+        if settings.api_token_cache_seconds > 0:
+            api_token_cache.set(token_hash, CachedAPIToken(user_id, tuple(scopes), expires_at, time.monotonic()))
+    
+    def _last_use_due(self, cached: CachedAPIToken) -> bool:
+        """Whether a cached token's last_used_at should be written again"""
+        return time.monotonic() - cached.last_used_written >= settings.api_token_last_used_interval_seconds
+    
     def _generate_api_token(self) -> str:
         """Generate a random API token using cryptographically secure random"""
         # Use secrets.token_urlsafe for cryptographically secure random tokens
@@ -492,4 +560,420 @@ class AuthService:
             expires_at=token.expires_at,
             last_used_at=token.last_used_at,
             created_at=token.created_at
-        )
\ No newline at end of file
+        )
+
+
+class AsyncAuthService(AuthService):
+    """AuthService on an AsyncSession, for async endpoints and auth dependencies"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    # User Management
+    async def create_user(self, user_data: UserCreate) -> UserResponse:
+        """Create a new user with default role"""
+        # Check if username or email already exists
+        existing_user = (await self.db.exec(
+            select(User).where(
+                (User.username == user_data.username) | 
+                (User.email == user_data.email)
+            )
+        )).first()
+        
+        if existing_user:
+            if existing_user.username == user_data.username:
+                raise HTTPException(
+                    status_code=400, 
+                    detail="Username already registered"
+                )
+            else:
+                raise HTTPException(
+                    status_code=400, 
+                    detail="Email already registered"
+                )
+        
+        # Hash password off the event loop (bcrypt is deliberately slow)
+        hashed_password = await asyncio.to_thread(pwd_context.hash, user_data.password)
+        
+        # Create user with default roles
+        db_user = User(
+            username=user_data.username,
+            email=user_data.email,
+            full_name=user_data.full_name,
+            password_hash=hashed_password,
+            business_role=UserRole.USER,  # Default business role
+            system_role=SystemRole.USER   # Default system role
+        )
+        
+        self.db.add(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
+        
+        return self._to_user_response(db_user)
+    
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
+        """Authenticate user with username/password (timing-attack resistant)"""
+        # Get user by username
+        user = (await self.db.exec(
+            select(User).where(User.username == username, User.is_active == True)
+        )).first()
+        
+        # Always perform password verification to maintain consistent timing
+        if user:
+            # Real user - verify password
+            if await asyncio.to_thread(pwd_context.verify, password, user.password_hash):
+                return user
+        else:
+            # User doesn't exist - perform dummy verification
+            self._dummy_verify()
+        
+        return None
+    
+    @read_replica
+    async def get_user(self, user_id: int) -> UserResponse:
+        """Get user by ID"""
+        user = await self.db.get(User, user_id)
+        if not user:
+            raise UserNotFoundException(f"User {user_id} not found")
+        
+        return self._to_user_response(user)
+    
+    @read_replica
+    async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
+        """Get all users with pagination"""
+        users = (await self.db.exec(
+            select(User)
+            .offset(skip)
+            .limit(limit)
+            .order_by(User.created_at.desc())
+        )).all()
+        
+        return [self._to_user_response(user) for user in users]
+    
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        """Get user by username"""
+        return (await self.db.exec(
+            select(User).where(User.username == username)
+        )).first()
+    
+    async def update_user(self, user_id: int, update_data: UserUpdate) -> UserResponse:
+        """Update user"""
+        user = await self.db.get(User, user_id)
+        if not user:
+            raise UserNotFoundException(f"User {user_id} not found")
+        
+        update_dict = update_data.dict(exclude_unset=True)
+        update_dict['updated_at'] = datetime.now(timezone.utc)
+        
+        for field, value in update_dict.items():
+            setattr(user, field, value)
+        
+        return await self._save_user(user)
+    
+    async def change_password(self, user_id: int, password_data: UserChangePassword) -> dict:
+        """Change user password"""
+        user = await self.db.get(User, user_id)
+        if not user:
+            raise UserNotFoundException(f"User {user_id} not found")
+        
+        # Verify current password
+        if not await asyncio.to_thread(pwd_context.verify, password_data.current_password, user.password_hash):
+            raise InvalidCredentialsException("Current password is incorrect")
+        
+        # Update password
+        user.password_hash = await asyncio.to_thread(pwd_context.hash, password_data.new_password)
+        user.updated_at = datetime.now(timezone.utc)
+        
+        self.db.add(user)
+        await self.db.commit()
+        
+        return {"message": "Password changed successfully"}
+    
+    async def update_user_business_role(self, user_id: int, new_role: UserRole, admin_user: User) -> UserResponse:
+        """Update user business role (system admin only)"""
+        # Check if admin user has system admin permission
+        if admin_user.system_role != SystemRole.SYSTEM_ADMIN:
+            raise HTTPException(
+                status_code=403,
+                detail="Only system administrators can change user business roles"
+            )
+        
+        # Validate that only USER business role is available
+        if new_role != UserRole.USER:
+            raise HTTPException(
+                status_code=400,
+                detail="Only USER business role is available"
+            )
+        
+        # Get user to update
+        user = await self.db.get(User, user_id)
+        if not user:
+            raise HTTPException(
+                status_code=404,
+                detail="User not found"
+            )
+        
+        # Update business role
+        user.business_role = new_role
+        user.updated_at = datetime.now(timezone.utc)
+        
+        return await self._save_user(user)
+    
+    async def update_user_system_role(self, user_id: int, new_role: SystemRole, admin_user: User) -> UserResponse:
+        """Update user system role (system admin only)"""
+        # Check if admin user has system admin permission
+        if admin_user.system_role != SystemRole.SYSTEM_ADMIN:
+            raise HTTPException(
+                status_code=403,
+                detail="Only system administrators can change user system roles"
+            )
+        
+        # Get user to update
+        user = await self.db.get(User, user_id)
+        if not user:
+            raise HTTPException(
+                status_code=404,
+                detail="User not found"
+            )
+        
+        # Update system role
+        user.system_role = new_role
+        user.updated_at = datetime.now(timezone.utc)
+        
+        return await self._save_user(user)
+    
+    # Session Token Management (for login sessions)
+    async def create_login_session(self, user: User) -> TokenResponse:
+        """Create a session token for user login"""
+        # Generate token
+        raw_token = self._generate_session_token()
+        token_hash = hashlib.sha256(raw_token.encode()).hexdigest()
+        
+        # Set expiration
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        
+        # Create database record
+        db_session = DBSession(
+            user_id=user.id,
+            session_token=token_hash,
+            expires_at=expires_at
+        )
+        
+        self.db.add(db_session)
+        await self.db.commit()
+        
+        return TokenResponse(
+            session_token=raw_token,
+            token_type="bearer",
+            expires_in=int(ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+            user=self._to_user_response(user)
+        )
+    
+    async def verify_session_token(self, token: str) -> Optional[User]:
+        """Verify session token and return user (timing-attack resistant)"""
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        
+        db_session = (await self.db.execute(session_by_token_statement(token_hash))).scalars().first()
+        
+        # Always perform some work to maintain consistent timing
+        if not db_session:
+            # Token doesn't exist - perform dummy operations
+            self._dummy_verify()
+            return None
+        
+        # Check expiration (handle both timezone-aware and timezone-naive)
+        current_time = datetime.now(timezone.utc)
+        expires_at = db_session.expires_at
+        
+        # If expires_at is timezone-naive, assume it's UTC
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        
+        if expires_at <= current_time:
+            return None
+        
+        # Get user
+        user = await self.db.get(User, db_session.user_id)
+        if not user or not user.is_active:
+            return None
+        
+        # Update last activity
+        db_session.last_activity = datetime.now(timezone.utc)
+        self.db.add(db_session)
+        await self.db.commit()
+        
+        return user
+    
+    # API Token Management (for custom access tokens)
+    async def create_api_token(self, user: User, token_data: APITokenCreate) -> APITokenCreateResponse:
+        """Create an API token with specific scopes"""
+        # Validate scopes against user roles
+        allowed_scopes = get_user_permissions(user.business_role, user.system_role)
+        invalid_scopes = [scope for scope in token_data.scopes if scope not in allowed_scopes]
+        
+        if invalid_scopes:
+            raise PermissionDeniedException(
+                f"User roles (business: {user.business_role}, system: {user.system_role}) do not allow scopes: {', '.join(invalid_scopes)}"
+            )
+        
+        # Generate token
+        raw_token = self._generate_api_token()
+        token_hash = hashlib.sha256(raw_token.encode()).hexdigest()
+        
+        # Set expiration
+        expires_at = token_data.expires_at or (datetime.now(timezone.utc) + timedelta(days=365))  # Default 1 year
+        
+        # Create database record
+        db_token = APIToken(
+            user_id=user.id,
+            name=token_data.name,
+            token_hash=token_hash,
+            scopes=json.dumps([scope.value for scope in token_data.scopes]),
+            expires_at=expires_at
+        )
+        
+        self.db.add(db_token)
+        await self.db.commit()
+        await self.db.refresh(db_token)
+        
+        return APITokenCreateResponse(
+            id=db_token.id,
+            name=db_token.name,
+            scopes=token_data.scopes,
+            is_active=db_token.is_active,
+            expires_at=db_token.expires_at,
+            created_at=db_token.created_at,
+            token=raw_token  # Only returned on creation!
+        )
+    
+    async def verify_api_token(self, token: str) -> Optional[tuple[User, List[TokenScope]]]:
+        """Verify API token and return user + scopes (timing-attack resistant)"""
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        
+        cached = self._cached_api_token(token_hash)
+        if cached is not None:
+            user = await self.db.get(User, cached.user_id)
+            if not user or not user.is_active:
+                return None
+            if self._last_use_due(cached):
+                await self.db.execute(
+                    update(APIToken).where(APIToken.token_hash == token_hash)
+                    .values(last_used_at=datetime.now(timezone.utc))
+                )
+                await self.db.commit()
+                self._remember_api_token(token_hash, cached.user_id, cached.scopes, cached.expires_at)
+            return user, list(cached.scopes)
+        
+        db_token = (await self.db.execute(api_token_by_hash_statement(token_hash))).scalars().first()
+        
+        # Always perform some work to maintain consistent timing
+        if not db_token:
+            # Token doesn't exist - perform dummy operations
+            self._dummy_verify()
+            return None
+        
+        # Check expiration (handle both timezone-aware and timezone-naive)
+        if db_token.expires_at:
+            current_time = datetime.now(timezone.utc)
+            expires_at = db_token.expires_at
+            
+            # If expires_at is timezone-naive, assume it's UTC
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            
+            if expires_at <= current_time:
+                return None
+        
+        # Get user
+        user = await self.db.get(User, db_token.user_id)
+        if not user or not user.is_active:
+            return None
+        
+        # Update last used
+        db_token.last_used_at = datetime.now(timezone.utc)
+        self.db.add(db_token)
+        await self.db.commit()
+        
+        # Parse scopes
+        scopes = [TokenScope(scope) for scope in json.loads(db_token.scopes)]
+        self._remember_api_token(token_hash, db_token.user_id, scopes, db_token.expires_at)
+        
+        return user, scopes
+    
+    @read_replica
+    async def list_api_tokens(self, user_id: int) -> List[APITokenResponse]:
+        """List user's API tokens"""
+        tokens = (await self.db.exec(
+            select(APIToken).where(APIToken.user_id == user_id)
+        )).all()
+        
+        return [self._to_token_response(token) for token in tokens]
+    
+    async def delete_api_token(self, user_id: int, token_id: int) -> dict:
+        """Delete API token"""
+        token = await self._get_owned_token(user_id, token_id)
+        
+        await self.db.delete(token)
+        invalidate_on_commit(self.db, API_TOKEN_CACHE, [token.token_hash])
+        await self.db.commit()
+        
+        return {"message": "API token deleted successfully"}
+    
+    async def update_api_token(self, user_id: int, token_id: int, token_update: APITokenUpdate) -> APITokenResponse:
+        """Update API token"""
+        # Get the token
+        token = await self._get_owned_token(user_id, token_id)
+        
+        # Get user for scope validation
+        user = await self.db.get(User, user_id)
+        if not user:
+            raise UserNotFoundException(f"User {user_id} not found")
+        
+        # Update fields
+        update_data = token_update.dict(exclude_unset=True)
+        
+        # Validate scopes if being updated
+        if 'scopes' in update_data and update_data['scopes'] is not None:
+            allowed_scopes = get_user_permissions(user.business_role, user.system_role)
+            invalid_scopes = [scope for scope in update_data['scopes'] if scope not in allowed_scopes]
+            
+            if invalid_scopes:
+                raise PermissionDeniedException(
+                    f"User roles (business: {user.business_role}, system: {user.system_role}) do not allow scopes: {', '.join(invalid_scopes)}"
+                )
+            
+            # Convert scopes to JSON string for storage
+            update_data['scopes'] = json.dumps([scope.value for scope in update_data['scopes']])
+        
+        # Apply updates
+        for field, value in update_data.items():
+            setattr(token, field, value)
+        
+        self.db.add(token)
+        invalidate_on_commit(self.db, API_TOKEN_CACHE, [token.token_hash])
+        await self.db.commit()
+        await self.db.refresh(token)
+        
+        return self._to_token_response(token)
+    
+    async def _get_owned_token(self, user_id: int, token_id: int) -> APIToken:
+        """Load an API token owned by the user"""
+        token = (await self.db.exec(
+            select(APIToken).where(
+                APIToken.id == token_id,
+                APIToken.user_id == user_id
+            )
+        )).first()
+        
+        if not token:
+            raise TokenNotFoundException(f"Token {token_id} not found")
+        
+        return token
+    
+    async def _save_user(self, user: User) -> UserResponse:
+        """Commit a changed user and return the fresh response"""
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        
+        return self._to_user_response(user)
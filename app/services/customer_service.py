@@ -4,9 +4,12 @@ Customer service for managing customers
 import json
 from typing import List, Optional, Dict, Any
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.database import Customer, User
 from app.models.schemas import CustomerCreate, CustomerResponse, CustomerUpdate
 from app.core.exceptions import CustomerNotFoundException
+from app.services.stats_service import record_stats_delta, record_stats_delta_async
+from app.database.replicas import read_replica
 
 
 class CustomerService:
@@ -36,6 +39,7 @@ class CustomerService:
         )
         
         self.db.add(db_customer)
+        record_stats_delta(self.db, user.id, customers=1)
         self.db.commit()
         self.db.refresh(db_customer)
         
@@ -98,6 +102,7 @@ class CustomerService:
             setattr(customer, field, value)
         
         self.db.add(customer)
+        record_stats_delta(self.db, user.id)
         self.db.commit()
         self.db.refresh(customer)
         
@@ -116,6 +121,7 @@ class CustomerService:
             return False
         
         self.db.delete(customer)
+        record_stats_delta(self.db, user.id, customers=-1)
         self.db.commit()
         return True
     
@@ -143,4 +149,122 @@ class CustomerService:
             email=customer.email,
             company=customer.company,
             created_at=customer.created_at
-        )
\ No newline at end of file
+        )
+
+
+class AsyncCustomerService(CustomerService):
+    """CustomerService on an AsyncSession, for async endpoints"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create_customer(self, customer_data: CustomerCreate, user: User) -> CustomerResponse:
+        """Create a new customer"""
+        # Check if customer with same email already exists for this user
+        existing_customer = (await self.db.exec(
+            select(Customer).where(
+                Customer.email == customer_data.email,
+                Customer.user_id == user.id
+            )
+        )).first()
+        
+        if existing_customer:
+            from app.core.exceptions import CustomerAlreadyExistsException
+            raise CustomerAlreadyExistsException(customer_data.email)
+        
+        # Create customer with user ownership
+        db_customer = Customer(
+            name=customer_data.name,
+            email=customer_data.email,
+            company=customer_data.company,
+            user_id=user.id
+        )
+        
+        self.db.add(db_customer)
+        await record_stats_delta_async(self.db, user.id, customers=1)
+        await self.db.commit()
+        await self.db.refresh(db_customer)
+        
+        return self._to_response(db_customer)
+    
+    @read_replica
+    async def get_customer(self, customer_id: int, user: User) -> CustomerResponse:
+        """Get a customer by ID (with ownership check)"""
+        customer = await self._get_owned(customer_id, user)
+        if not customer:
+            raise CustomerNotFoundException(customer_id)
+        
+        return self._to_response(customer)
+    
+    async def get_customer_by_email(self, email: str, user: User) -> Optional[CustomerResponse]:
+        """Get a customer by email (with ownership check)"""
+        customer = (await self.db.exec(
+            select(Customer).where(
+                Customer.email == email,
+                Customer.user_id == user.id
+            )
+        )).first()
+        
+        if not customer:
+            return None
+        
+        return self._to_response(customer)
+    
+    @read_replica
+    async def list_customers(self, user: User, skip: int = 0, limit: int = 100) -> List[CustomerResponse]:
+        """List all customers for a user"""
+        customers = (await self.db.exec(
+            select(Customer)
+            .where(Customer.user_id == user.id)
+            .offset(skip)
+            .limit(limit)
+        )).all()
+        
+        return [self._to_response(customer) for customer in customers]
+    
+    async def update_customer(self, customer_id: int, customer_update: CustomerUpdate, user: User) -> CustomerResponse:
+        """Update a customer (with ownership check)"""
+        customer = await self._get_owned(customer_id, user)
+        if not customer:
+            raise CustomerNotFoundException(customer_id)
+        
+        # Update fields
+        update_data = customer_update.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(customer, field, value)
+        
+        self.db.add(customer)
+        await record_stats_delta_async(self.db, user.id)
+        await self.db.commit()
+        await self.db.refresh(customer)
+        
+        return self._to_response(customer)
+    
+    async def delete_customer(self, customer_id: int, user: User) -> bool:
+        """Delete a customer (with ownership check)"""
+        customer = await self._get_owned(customer_id, user)
+        if not customer:
+            return False
+        
+        await self.db.delete(customer)
+        await record_stats_delta_async(self.db, user.id, customers=-1)
+        await self.db.commit()
+        return True
+    
+    async def get_or_create_customer(self, customer_data: CustomerCreate, user: User) -> CustomerResponse:
+        """Get existing customer or create new one"""
+        existing_customer = await self.get_customer_by_email(customer_data.email, user)
+        if existing_customer:
+            return existing_customer
+        
+        # Create new customer
+        return await self.create_customer(customer_data, user)
+    
+    async def _get_owned(self, customer_id: int, user: User) -> Optional[Customer]:
+        """Load a customer owned by the user"""
+        return (await self.db.exec(
+            select(Customer).where(
+                Customer.id == customer_id,
+                Customer.user_id == user.id
+            )
+        )).first()
@@ -4,10 +4,50 @@ License service for managing license keys
 import json
 from datetime import datetime, timezone
 from typing import List, Optional, Union, Dict, Any
+from sqlalchemy import func, lambda_stmt, update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlmodel import Session, select
-from app.models.database import LicenseKey, Customer, Application, User
-from app.models.schemas import LicenseKeyCreate, LicenseKeyResponse, LicenseKeyUpdate, LicenseKeyGenerator, LicenseKeyWithRelationsResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config import settings
+from app.models.database import LicenseKey, LicenseStatus, Customer, Application, User
+from app.models.schemas import (
+    LicenseKeyCreate, LicenseKeyResponse, LicenseKeyUpdate, LicenseKeyGenerator, LicenseKeyWithRelationsResponse,
+    LicenseBulkStatusAction, LicenseBulkStatusUpdate, LicenseBulkStatusResponse
+)
 from app.core.exceptions import CustomerNotFoundException, ApplicationNotFoundException, LicenseNotFoundException
+from app.services.stats_service import (
+    license_counter_delta, license_counters, record_stats_delta, record_stats_delta_async
+)
+from app.database.replicas import read_replica
+
+# Target status for each bulk action
+BULK_ACTION_STATUS = {
+    LicenseBulkStatusAction.BLOCK: LicenseStatus.BLOCKED,
+    LicenseBulkStatusAction.UNBLOCK: LicenseStatus.ACTIVE,
+    LicenseBulkStatusAction.REVOKE: LicenseStatus.REVOKED,
+    LicenseBulkStatusAction.SUSPEND: LicenseStatus.SUSPENDED,
+}
+
+
+# Hot lookups as lambda statements: the select() is built and its cache key
+# computed once per call site, later calls only bind the new values
+def license_by_hash_statement(key_hash: str) -> StatementLambdaElement:
+    """License by key hash (validation)"""
+    return lambda_stmt(lambda: select(LicenseKey).where(LicenseKey.key_hash == key_hash))
+
+
+def owned_license_statement(license_id: int, user_id: int) -> StatementLambdaElement:
+    """License by id, owned by the user"""
+    return lambda_stmt(
+        lambda: select(LicenseKey).where(LicenseKey.id == license_id, LicenseKey.owner_user_id == user_id)
+    )
+
+
+def owned_license_by_hash_statement(key_hash: str, user_id: int) -> StatementLambdaElement:
+    """License by key hash, owned by the user"""
+    return lambda_stmt(
+        lambda: select(LicenseKey).where(LicenseKey.key_hash == key_hash, LicenseKey.owner_user_id == user_id)
+    )
 
 
 class LicenseService:
@@ -44,12 +84,14 @@ class LicenseService:
         # Prepare database record
         db_data = license_data.dict()
         db_data['key_hash'] = key_hash
+        db_data['owner_user_id'] = user.id
         if db_data.get('features') is not None:
             db_data['features'] = json.dumps(db_data['features'])
         
         # Create and save license
         db_license = LicenseKey(**db_data)
         self.db.add(db_license)
+        record_stats_delta(self.db, user.id, **license_counters(db_license.status))
         self.db.commit()
         self.db.refresh(db_license)
         
@@ -58,14 +100,7 @@ class LicenseService:
     
     def get_license(self, license_id: int, user: User) -> LicenseKeyResponse:
         """Get a license by ID (with ownership check)"""
-        license_key = self.db.exec(
-            select(LicenseKey)
-            .join(Customer)
-            .where(
-                LicenseKey.id == license_id,
-                Customer.user_id == user.id
-            )
-        ).first()
+        license_key = self._get_owned(license_id, user)
         
         if not license_key:
             raise LicenseNotFoundException(license_id)
@@ -76,96 +111,42 @@ class LicenseService:
         """Get a license by key (with ownership check)"""
         key_hash = self.generator.hash_key(license_key)
         
-        db_license = self.db.exec(
-            select(LicenseKey)
-            .join(Customer)
-            .where(
-                LicenseKey.key_hash == key_hash,
-                Customer.user_id == user.id
-            )
-        ).first()
+        db_license = self.db.execute(owned_license_by_hash_statement(key_hash, user.id)).scalars().first()
         
         if not db_license:
             return None
         
         return self._to_response(db_license)
     
+    def get_license_by_hash(self, key_hash: str) -> Optional[LicenseKey]:
+        """Get a license by key hash (no ownership check, used by validation)"""
+        return self.db.execute(license_by_hash_statement(key_hash)).scalars().first()
+    
     def list_licenses(self, user: User, skip: int = 0, limit: int = 100, include_relations: bool = False) -> List[Union[LicenseKeyResponse, LicenseKeyWithRelationsResponse]]:
         """List all licenses for a user"""
         if include_relations:
-            from app.models.schemas import CustomerResponse, ApplicationResponse
-            
             # Eager load the related data
-            licenses = self.db.exec(
-                select(LicenseKey, Customer, Application)
-                .join(Customer, LicenseKey.customer_id == Customer.id)
-                .join(Application, LicenseKey.application_id == Application.id)
-                .where(Customer.user_id == user.id)
-                .offset(skip)
-                .limit(limit)
-            ).all()
-            
-            result = []
-            for license_key, customer, application in licenses:
-                # Convert to response format
-                license_data = self._to_response(license_key).dict()
-                
-                # Add related data
-                license_data['customer'] = CustomerResponse(
-                    id=customer.id,
-                    name=customer.name,
-                    email=customer.email,
-                    company=customer.company,
-                    created_at=customer.created_at
-                )
-                
-                # Parse features JSON string to dict if it exists
-                features = None
-                if application.features:
-                    try:
-                        import json
-                        features = json.loads(application.features)
-                    except (json.JSONDecodeError, TypeError):
-                        features = None
-                
-                license_data['application'] = ApplicationResponse(
-                    id=application.id,
-                    name=application.name,
-                    version=application.version,
-                    description=application.description,
-                    features=features,
-                    created_at=application.created_at
-                )
-                
-                result.append(LicenseKeyWithRelationsResponse(**license_data))
+            licenses = self.db.exec(self._list_statement(user, skip, limit, include_relations)).all()
             
-            return result
+            return [
+                self._to_relations_response(license_key, customer, application)
+                for license_key, customer, application in licenses
+            ]
         else:
-            licenses = self.db.exec(
-                select(LicenseKey)
-                .join(Customer)
-                .where(Customer.user_id == user.id)
-                .offset(skip)
-                .limit(limit)
-            ).all()
+            licenses = self.db.exec(self._list_statement(user, skip, limit, include_relations)).all()
             
             return [self._to_response(license) for license in licenses]
     
     
     def update_license(self, license_id: int, license_update: LicenseKeyUpdate, user: User) -> LicenseKeyResponse:
         """Update a license (with ownership check)"""
-        license_key = self.db.exec(
-            select(LicenseKey)
-            .join(Customer)
-            .where(
-                LicenseKey.id == license_id,
-                Customer.user_id == user.id
-            )
-        ).first()
+        license_key = self._get_owned(license_id, user)
         
         if not license_key:
             raise LicenseNotFoundException(license_id)
         
+        counters_before = license_counters(license_key.status)
+        
         # Update fields
         update_data = license_update.dict(exclude_unset=True)
         for field, value in update_data.items():
@@ -177,6 +158,9 @@ class LicenseService:
         license_key.updated_at = datetime.now(timezone.utc)
         
         self.db.add(license_key)
+        record_stats_delta(self.db, user.id, **license_counter_delta(
+            counters_before, license_counters(license_key.status)
+        ))
         self.db.commit()
         self.db.refresh(license_key)
         
@@ -184,40 +168,33 @@ class LicenseService:
     
     def delete_license(self, license_id: int, user: User) -> bool:
         """Delete a license (with ownership check)"""
-        license_key = self.db.exec(
-            select(LicenseKey)
-            .join(Customer)
-            .where(
-                LicenseKey.id == license_id,
-                Customer.user_id == user.id
-            )
-        ).first()
+        license_key = self._get_owned(license_id, user)
         
         if not license_key:
             return False
         
         self.db.delete(license_key)
+        record_stats_delta(self.db, user.id, **license_counter_delta(
+            license_counters(license_key.status), {}
+        ))
         self.db.commit()
         return True
     
     def block_license(self, license_id: int, user: User) -> LicenseKeyResponse:
         """Block a license (with ownership check)"""
-        license_key = self.db.exec(
-            select(LicenseKey)
-            .join(Customer)
-            .where(
-                LicenseKey.id == license_id,
-                Customer.user_id == user.id
-            )
-        ).first()
+        license_key = self._get_owned(license_id, user)
         
         if not license_key:
             raise LicenseNotFoundException(license_id)
         
-        license_key.status = "blocked"
+        counters_before = license_counters(license_key.status)
+        license_key.status = LicenseStatus.BLOCKED
         license_key.updated_at = datetime.now(timezone.utc)
         
         self.db.add(license_key)
+        record_stats_delta(self.db, user.id, **license_counter_delta(
+            counters_before, license_counters(license_key.status)
+        ))
         self.db.commit()
         self.db.refresh(license_key)
         
@@ -225,27 +202,177 @@ class LicenseService:
     
     def unblock_license(self, license_id: int, user: User) -> LicenseKeyResponse:
         """Unblock a license (with ownership check)"""
-        license_key = self.db.exec(
-            select(LicenseKey)
-            .join(Customer)
-            .where(
-                LicenseKey.id == license_id,
-                Customer.user_id == user.id
-            )
-        ).first()
+        license_key = self._get_owned(license_id, user)
         
         if not license_key:
             raise LicenseNotFoundException(license_id)
         
-        license_key.status = "active"
+        counters_before = license_counters(license_key.status)
+        license_key.status = LicenseStatus.ACTIVE
         license_key.updated_at = datetime.now(timezone.utc)
         
         self.db.add(license_key)
+        record_stats_delta(self.db, user.id, **license_counter_delta(
+            counters_before, license_counters(license_key.status)
+        ))
         self.db.commit()
         self.db.refresh(license_key)
         
         return self._to_response(license_key)
     
+    def bulk_update_status(self, bulk_update: LicenseBulkStatusUpdate, user: User) -> LicenseBulkStatusResponse:
+        """Apply a status transition to every license matching a filter (with ownership check)"""
+        target_status = BULK_ACTION_STATUS[bulk_update.action]
+        conditions = self._bulk_filter_conditions(bulk_update, user, target_status)
+        
+        if bulk_update.dry_run:
+            matched = self.db.exec(
+                select(func.count(LicenseKey.id)).where(*conditions)
+            ).one()
+            return LicenseBulkStatusResponse(
+                action=bulk_update.action,
+                target_status=target_status,
+                matched=matched,
+                updated=0,
+                dry_run=True
+            )
+        
+        # Walk the matching ids in keyset order, one set-based UPDATE per chunk,
+        # committing between chunks so row locks are held briefly
+        chunk_size = settings.bulk_status_chunk_size
+        last_id = 0
+        updated = 0
+        while True:
+            rows = self.db.execute(
+                self._bulk_chunk_statement(conditions, last_id, chunk_size, target_status)
+            ).all()
+            
+            if not rows:
+                self.db.commit()
+                break
+            
+            record_stats_delta(self.db, user.id, **self._bulk_stats_deltas(rows, target_status))
+            self.db.commit()
+            
+            updated += len(rows)
+            last_id = max(row.id for row in rows)
+            
+            if len(rows) < chunk_size:
+                break
+        
+        return LicenseBulkStatusResponse(
+            action=bulk_update.action,
+            target_status=target_status,
+            matched=updated,
+            updated=updated,
+            dry_run=False
+        )
+    
+    def _get_owned(self, license_id: int, user: User) -> Optional[LicenseKey]:
+        """Load a license owned by the user"""
+        return self.db.execute(owned_license_statement(license_id, user.id)).scalars().first()
+    
+    def _list_statement(self, user: User, skip: int, limit: int, include_relations: bool):
+        """Page of a user's licenses, joined to customer and application when requested"""
+        if include_relations:
+            statement = (
+                select(LicenseKey, Customer, Application)
+                .join(Customer, LicenseKey.customer_id == Customer.id)
+                .join(Application, LicenseKey.application_id == Application.id)
+            )
+        else:
+            statement = select(LicenseKey)
+        return statement.where(LicenseKey.owner_user_id == user.id).offset(skip).limit(limit)
+    
+    def _bulk_chunk_statement(self, conditions: list, last_id: int, chunk_size: int, target_status: LicenseStatus):
+        """UPDATE for the next keyset chunk of a bulk status change"""
+        # Lock the chunk first so the previous status returned is the one replaced
+        chunk = (
+            select(LicenseKey.id, LicenseKey.status)
+            .where(*conditions, LicenseKey.id > last_id)
+            .order_by(LicenseKey.id)
+            .limit(chunk_size)
+            .with_for_update()
+            .cte("chunk")
+        )
+        return (
+            update(LicenseKey)
+            .where(LicenseKey.id == chunk.c.id)
+            .values(status=target_status, updated_at=datetime.now(timezone.utc))
+            .returning(LicenseKey.id, chunk.c.status.label("previous_status"))
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _bulk_stats_deltas(self, rows: list, target_status: LicenseStatus) -> Dict[str, int]:
+        """Summed counter deltas for a chunk of bulk-updated licenses"""
+        deltas: Dict[str, int] = {}
+        for row in rows:
+            row_delta = license_counter_delta(
+                license_counters(row.previous_status),
+                license_counters(target_status)
+            )
+            for column, value in row_delta.items():
+                deltas[column] = deltas.get(column, 0) + value
+        return deltas
+    
+    def _bulk_filter_conditions(self, bulk_update: LicenseBulkStatusUpdate, user: User, target_status: LicenseStatus) -> list:
+        """Build WHERE conditions for a bulk status change"""
+        conditions = [
+            LicenseKey.owner_user_id == user.id,
+            LicenseKey.status != target_status,
+        ]
+        # Unblocking only re-activates blocked licenses, never revoked or expired ones
+        if bulk_update.action == LicenseBulkStatusAction.UNBLOCK:
+            conditions.append(LicenseKey.status == LicenseStatus.BLOCKED)
+        if bulk_update.status is not None:
+            conditions.append(LicenseKey.status == bulk_update.status)
+        if bulk_update.customer_id is not None:
+            conditions.append(LicenseKey.customer_id == bulk_update.customer_id)
+        if bulk_update.application_id is not None:
+            conditions.append(LicenseKey.application_id == bulk_update.application_id)
+        if bulk_update.expires_after is not None:
+            conditions.append(LicenseKey.expires_at >= bulk_update.expires_after)
+        if bulk_update.expires_before is not None:
+            conditions.append(LicenseKey.expires_at < bulk_update.expires_before)
+        if bulk_update.license_ids is not None:
+            conditions.append(LicenseKey.id.in_(bulk_update.license_ids))
+        return conditions
+    
+    def _to_relations_response(self, license_key: LicenseKey, customer: Customer, application: Application) -> LicenseKeyWithRelationsResponse:
+        """Convert a license with its customer and application to LicenseKeyWithRelationsResponse"""
+        from app.models.schemas import CustomerResponse, ApplicationResponse
+        
+        # Convert to response format
+        license_data = self._to_response(license_key).dict()
+        
+        # Add related data
+        license_data['customer'] = CustomerResponse(
+            id=customer.id,
+            name=customer.name,
+            email=customer.email,
+            company=customer.company,
+            created_at=customer.created_at
+        )
+        
+        # Parse features JSON string to dict if it exists
+        features = None
+        if application.features:
+            try:
+                features = json.loads(application.features)
+            except (json.JSONDecodeError, TypeError):
+                features = None
+        
+        license_data['application'] = ApplicationResponse(
+            id=application.id,
+            name=application.name,
+            version=application.version,
+            description=application.description,
+            features=features,
+            created_at=application.created_at
+        )
+        
+        return LicenseKeyWithRelationsResponse(**license_data)
+    
     def _to_response(self, license_key: LicenseKey, include_key: Optional[str] = None) -> LicenseKeyResponse:
         """Convert LicenseKey model to LicenseKeyResponse"""
         features = None
@@ -270,3 +397,203 @@ class LicenseService:
             updated_at=license_key.updated_at
         )
     
+
+
+class AsyncLicenseService(LicenseService):
+    """LicenseService on an AsyncSession, for async endpoints"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.generator = LicenseKeyGenerator()
+    
+    async def create_license(self, license_data: LicenseKeyCreate, user: User) -> LicenseKeyResponse:
+        """Create a new license key"""
+        # Verify customer exists and belongs to user
+        customer = (await self.db.exec(
+            select(Customer).where(
+                Customer.id == license_data.customer_id,
+                Customer.user_id == user.id
+            )
+        )).first()
+        if not customer:
+            raise CustomerNotFoundException(license_data.customer_id)
+        
+        # Verify application exists and belongs to user
+        application = (await self.db.exec(
+            select(Application).where(
+                Application.id == license_data.application_id,
+                Application.user_id == user.id
+            )
+        )).first()
+        if not application:
+            raise ApplicationNotFoundException(license_data.application_id)
+        
+        # Generate license key
+        license_key = self.generator.generate_key()
+        key_hash = self.generator.hash_key(license_key)
+        
+        # Prepare database record
+        db_data = license_data.dict()
+        db_data['key_hash'] = key_hash
+        db_data['owner_user_id'] = user.id
+        if db_data.get('features') is not None:
+            db_data['features'] = json.dumps(db_data['features'])
+        
+        # Create and save license
+        db_license = LicenseKey(**db_data)
+        self.db.add(db_license)
+        await record_stats_delta_async(self.db, user.id, **license_counters(db_license.status))
+        await self.db.commit()
+        await self.db.refresh(db_license)
+        
+        # Prepare response
+        return self._to_response(db_license, include_key=license_key)
+    
+    @read_replica
+    async def get_license(self, license_id: int, user: User) -> LicenseKeyResponse:
+        """Get a license by ID (with ownership check)"""
+        license_key = await self._get_owned(license_id, user)
+        if not license_key:
+            raise LicenseNotFoundException(license_id)
+        
+        return self._to_response(license_key)
+    
+    async def get_license_by_key(self, license_key: str, user: User) -> Optional[LicenseKeyResponse]:
+        """Get a license by key (with ownership check)"""
+        key_hash = self.generator.hash_key(license_key)
+        
+        db_license = (await self.db.execute(owned_license_by_hash_statement(key_hash, user.id))).scalars().first()
+        
+        if not db_license:
+            return None
+        
+        return self._to_response(db_license)
+    
+    async def get_license_by_hash(self, key_hash: str) -> Optional[LicenseKey]:
+        """Get a license by key hash (no ownership check, used by validation)"""
+        return (await self.db.execute(license_by_hash_statement(key_hash))).scalars().first()
+    
+    @read_replica
+    async def list_licenses(self, user: User, skip: int = 0, limit: int = 100, include_relations: bool = False) -> List[Union[LicenseKeyResponse, LicenseKeyWithRelationsResponse]]:
+        """List all licenses for a user"""
+        licenses = (await self.db.exec(self._list_statement(user, skip, limit, include_relations))).all()
+        
+        if include_relations:
+            return [
+                self._to_relations_response(license_key, customer, application)
+                for license_key, customer, application in licenses
+            ]
+        return [self._to_response(license) for license in licenses]
+    
+    async def update_license(self, license_id: int, license_update: LicenseKeyUpdate, user: User) -> LicenseKeyResponse:
+        """Update a license (with ownership check)"""
+        license_key = await self._get_owned(license_id, user)
+        if not license_key:
+            raise LicenseNotFoundException(license_id)
+        
+        counters_before = license_counters(license_key.status)
+        
+        # Update fields
+        update_data = license_update.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            if field == 'features' and value is not None:
+                setattr(license_key, field, json.dumps(value))
+            else:
+                setattr(license_key, field, value)
+        
+        return await self._save_transition(license_key, counters_before, user)
+    
+    async def delete_license(self, license_id: int, user: User) -> bool:
+        """Delete a license (with ownership check)"""
+        license_key = await self._get_owned(license_id, user)
+        if not license_key:
+            return False
+        
+        counters_before = license_counters(license_key.status)
+        await self.db.delete(license_key)
+        await record_stats_delta_async(self.db, user.id, **license_counter_delta(counters_before, {}))
+        await self.db.commit()
+        return True
+    
+    async def block_license(self, license_id: int, user: User) -> LicenseKeyResponse:
+        """Block a license (with ownership check)"""
+        return await self._set_status(license_id, LicenseStatus.BLOCKED, user)
+    
+    async def unblock_license(self, license_id: int, user: User) -> LicenseKeyResponse:
+        """Unblock a license (with ownership check)"""
+        return await self._set_status(license_id, LicenseStatus.ACTIVE, user)
+    
+    async def bulk_update_status(self, bulk_update: LicenseBulkStatusUpdate, user: User) -> LicenseBulkStatusResponse:
+        """Apply a status transition to every license matching a filter (with ownership check)"""
+        target_status = BULK_ACTION_STATUS[bulk_update.action]
+        conditions = self._bulk_filter_conditions(bulk_update, user, target_status)
+        
+        if bulk_update.dry_run:
+            matched = (await self.db.exec(
+                select(func.count(LicenseKey.id)).where(*conditions)
+            )).one()
+            return LicenseBulkStatusResponse(
+                action=bulk_update.action,
+                target_status=target_status,
+                matched=matched,
+                updated=0,
+                dry_run=True
+            )
+        
+        # Same keyset chunking as the sync service, committing between chunks
+        chunk_size = settings.bulk_status_chunk_size
+        last_id = 0
+        updated = 0
+        while True:
+            rows = (await self.db.execute(
+                self._bulk_chunk_statement(conditions, last_id, chunk_size, target_status)
+            )).all()
+            
+            if not rows:
+                await self.db.commit()
+                break
+            
+            await record_stats_delta_async(self.db, user.id, **self._bulk_stats_deltas(rows, target_status))
+            await self.db.commit()
+            
+            updated += len(rows)
+            last_id = max(row.id for row in rows)
+            
+            if len(rows) < chunk_size:
+                break
+        
+        return LicenseBulkStatusResponse(
+            action=bulk_update.action,
+            target_status=target_status,
+            matched=updated,
+            updated=updated,
+            dry_run=False
+        )
+    
+    async def _get_owned(self, license_id: int, user: User) -> Optional[LicenseKey]:
+        """Load a license owned by the user"""
+        return (await self.db.execute(owned_license_statement(license_id, user.id))).scalars().first()
+    
+    async def _set_status(self, license_id: int, status: LicenseStatus, user: User) -> LicenseKeyResponse:
+        """Move a license to a new status (with ownership check)"""
+        license_key = await self._get_owned(license_id, user)
+        if not license_key:
+            raise LicenseNotFoundException(license_id)
+        
+        counters_before = license_counters(license_key.status)
+        license_key.status = status
+        
+        return await self._save_transition(license_key, counters_before, user)
+    
+    async def _save_transition(self, license_key: LicenseKey, counters_before: Dict[str, int], user: User) -> LicenseKeyResponse:
+        """Commit a changed license with its stats delta"""
+        license_key.updated_at = datetime.now(timezone.utc)
+        
+        self.db.add(license_key)
+        await record_stats_delta_async(self.db, user.id, **license_counter_delta(
+            counters_before, license_counters(license_key.status)
+        ))
+        await self.db.commit()
+        await self.db.refresh(license_key)
+        
+        return self._to_response(license_key)
@@ -0,0 +1,230 @@
+"""
+Stats service for the per-user dashboard counters
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database.postgres import async_session
+from app.models.database import LicenseKey, LicenseStatus, User, UserStats
+from app.models.schemas import DashboardStatsResponse, LicenseStatusCounts
+
+# Counter column for each license status
+LICENSE_STATUS_COUNTERS = {
+    LicenseStatus.ACTIVE: "licenses_active",
+    LicenseStatus.EXPIRED: "licenses_expired",
+    LicenseStatus.SUSPENDED: "licenses_suspended",
+    LicenseStatus.REVOKED: "licenses_revoked",
+    LicenseStatus.BLOCKED: "licenses_blocked",
+}
+
+# Expiry windows, response field -> days ahead. These depend on the clock, so they are
+# counted when the stats are read instead of being kept as counters
+EXPIRING_WINDOWS = {
+    "expiring_7_days": 7,
+    "expiring_30_days": 30,
+}
+
+# Only one worker recounts at a time
+RECONCILE_LOCK_SQL = "SELECT pg_try_advisory_xact_lock(hashtext('userstats_reconcile'))"
+
+# Make sure every target user has a counters row, then lock those rows. Deltas
+# committed before the lock is granted are visible to the recount that follows
+# (a new statement snapshot); deltas from later writes wait for the recount and
+# apply on top of it, so the recount never overwrites one
+RECONCILE_ROWS_SQL = """
+    INSERT INTO userstats (
+        user_id, customers, applications,
+        licenses_active, licenses_expired, licenses_suspended, licenses_revoked, licenses_blocked,
+        active_activations, updated_at
+    )
+    SELECT u.id, 0, 0, 0, 0, 0, 0, 0, 0, now()
+    FROM "user" u
+    {where}
+    ON CONFLICT (user_id) DO NOTHING
+"""
+RECONCILE_LOCK_ROWS_SQL = """
+    SELECT s.user_id FROM userstats s JOIN "user" u ON u.id = s.user_id
+    {where}
+    ORDER BY s.user_id
+    FOR UPDATE OF s
+"""
+
+# Recount every counter from the source tables in one set-based upsert
+RECONCILE_SQL = """
+    INSERT INTO userstats (
+        user_id, customers, applications,
+        licenses_active, licenses_expired, licenses_suspended, licenses_revoked, licenses_blocked,
+        active_activations, updated_at, reconciled_at
+    )
+    SELECT u.id,
+           COALESCE(c.n, 0), COALESCE(a.n, 0),
+           COALESCE(l.active, 0), COALESCE(l.expired, 0), COALESCE(l.suspended, 0),
+           COALESCE(l.revoked, 0), COALESCE(l.blocked, 0),
+           COALESCE(act.n, 0), now(), now()
+    FROM "user" u
+    LEFT JOIN (
+        SELECT user_id, count(*) AS n FROM customer GROUP BY user_id
+    ) c ON c.user_id = u.id
+    LEFT JOIN (
+        SELECT user_id, count(*) AS n FROM application GROUP BY user_id
+    ) a ON a.user_id = u.id
+    LEFT JOIN (
+        SELECT owner_user_id,
+               count(*) FILTER (WHERE status = 'ACTIVE') AS active,
+               count(*) FILTER (WHERE status = 'EXPIRED') AS expired,
+               count(*) FILTER (WHERE status = 'SUSPENDED') AS suspended,
+               count(*) FILTER (WHERE status = 'REVOKED') AS revoked,
+               count(*) FILTER (WHERE status = 'BLOCKED') AS blocked
+        FROM licensekey GROUP BY owner_user_id
+    ) l ON l.owner_user_id = u.id
+    LEFT JOIN (
+        SELECT owner_user_id, count(*) AS n FROM activation
+        WHERE status = 'ACTIVE' GROUP BY owner_user_id
+    ) act ON act.owner_user_id = u.id
+    {where}
+    ON CONFLICT (user_id) DO UPDATE SET
+        customers = excluded.customers,
+        applications = excluded.applications,
+        licenses_active = excluded.licenses_active,
+        licenses_expired = excluded.licenses_expired,
+        licenses_suspended = excluded.licenses_suspended,
+        licenses_revoked = excluded.licenses_revoked,
+        licenses_blocked = excluded.licenses_blocked,
+        active_activations = excluded.active_activations,
+        updated_at = excluded.updated_at,
+        reconciled_at = excluded.reconciled_at
+"""
+
+
+def license_counters(status: Optional[LicenseStatus]) -> Dict[str, int]:
+    """Counters a license with this status contributes to (empty for no license)"""
+    if status is None:
+        return {}
+    return {LICENSE_STATUS_COUNTERS[LicenseStatus(status)]: 1}
+
+
+def license_counter_delta(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    """Counter deltas for a license moving from one contribution to another"""
+    return {
+        column: after.get(column, 0) - before.get(column, 0)
+        for column in set(before) | set(after)
+    }
+
+
+def stats_delta_statement(user_id: int, **deltas: int):
+    """Upsert adding counter deltas to a user's stats row and bumping its change version"""
+    deltas = {column: value for column, value in deltas.items() if value}
+
+    now = datetime.now(timezone.utc)
+    statement = insert(UserStats).values(
+        user_id=user_id, change_version=1, changed_at=now, updated_at=now, **deltas
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[UserStats.user_id],
+        set_={
+            **{column: getattr(UserStats, column) + statement.excluded[column] for column in deltas},
+            "change_version": UserStats.change_version + 1,
+            "changed_at": now,
+            "updated_at": now,
+        }
+    )
+
+
+def record_stats_delta(db: Session, user_id: int, **deltas: int) -> None:
+    """Record a write by the user's services (with any counter deltas) as part of the
+    caller's transaction; call it without deltas for writes that move no counter"""
+    db.execute(stats_delta_statement(user_id, **deltas))
+
+
+async def record_stats_delta_async(db: AsyncSession, user_id: int, **deltas: int) -> None:
+    """Async variant of record_stats_delta for AsyncSession callers"""
+    await db.execute(stats_delta_statement(user_id, **deltas))
+
+
+async def get_change_version_async(db: AsyncSession, user_id: int) -> Tuple[int, Optional[datetime]]:
+    """The user's change version and when it last moved (a single primary key lookup)"""
+    row = (await db.execute(
+        select(UserStats.change_version, UserStats.changed_at).where(UserStats.user_id == user_id)
+    )).first()
+    return (row.change_version, row.changed_at) if row else (0, None)
+
+
+async def reconcile_all_stats() -> int:
+    """Recount every user's counters to correct any drift (run periodically)"""
+    async with async_session() as db:
+        return await db.run_sync(lambda db: StatsService(db).reconcile())
+
+
+class StatsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_stats(self, user: User) -> DashboardStatsResponse:
+        """Get the dashboard counters for a user (a primary key lookup, plus an
+        index range scan for the licenses about to expire)"""
+        stats = self.db.get(UserStats, user.id)
+        if stats is None or stats.reconciled_at is None:
+            # Never recounted (deltas alone may start from a partial row): build it now
+            self.reconcile(user_id=user.id)
+            stats = self.db.get(UserStats, user.id)
+
+        return self._to_response(stats, self.count_expiring(user.id))
+
+    def count_expiring(self, user_id: int) -> Dict[str, int]:
+        """Count the user's active licenses expiring within each window, as of now"""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # expires_at is stored as naive UTC
+        widest = max(EXPIRING_WINDOWS.values())
+        row = self.db.execute(
+            select(*(
+                func.count().filter(LicenseKey.expires_at <= now + timedelta(days=days)).label(field)
+                for field, days in EXPIRING_WINDOWS.items()
+            )).where(
+                LicenseKey.owner_user_id == user_id,
+                LicenseKey.status == LicenseStatus.ACTIVE,
+                LicenseKey.expires_at > now,
+                LicenseKey.expires_at <= now + timedelta(days=widest)
+            )
+        ).one()
+        return dict(row._mapping)
+
+    def reconcile(self, user_id: Optional[int] = None) -> int:
+        """Recount the counters from the source tables, for one user or everyone"""
+        if user_id is None:
+            # Skip if another worker is already recounting
+            if not self.db.execute(text(RECONCILE_LOCK_SQL)).scalar():
+                self.db.rollback()
+                return 0
+            where, params = "WHERE true", {}
+        else:
+            where, params = "WHERE u.id = :user_id", {"user_id": user_id}
+        self.db.execute(text(RECONCILE_ROWS_SQL.format(where=where)), params)
+        self.db.execute(text(RECONCILE_LOCK_ROWS_SQL.format(where=where)), params)
+        result = self.db.execute(text(RECONCILE_SQL.format(where=where)), params)
+        self.db.commit()
+        self.db.expire_all()
+
+        return result.rowcount
+
+    def _to_response(self, stats: UserStats, expiring: Dict[str, int]) -> DashboardStatsResponse:
+        """Convert UserStats model to DashboardStatsResponse"""
+        licenses = LicenseStatusCounts(
+            active=stats.licenses_active,
+            expired=stats.licenses_expired,
+            suspended=stats.licenses_suspended,
+            revoked=stats.licenses_revoked,
+            blocked=stats.licenses_blocked
+        )
+        return DashboardStatsResponse(
+            licenses=licenses,
+            total_licenses=sum(licenses.dict().values()),
+            active_activations=stats.active_activations,
+            customers=stats.customers,
+            applications=stats.applications,
+            expiring_7_days=expiring["expiring_7_days"],
+            expiring_30_days=expiring["expiring_30_days"],
+            updated_at=stats.updated_at,
+            reconciled_at=stats.reconciled_at
+        )
@@ -7,8 +7,10 @@ from app.utils.license_generator import LicenseKeyGenerator
 from app.core.exceptions import InvalidLicenseFormatException
 from app.services.license_service import LicenseService
 from app.services.activation_service import ActivationService
+from app.services.stats_service import license_counter_delta, license_counters, record_stats_delta
+from app.database.replicas import use_replica
 import json
-from app.models.database import LicenseStatus, ActivationStatus
+from app.models.database import LicenseStatus, ActivationStatus, ActivationEventType
 
 class ValidationService:
     def __init__(self, db: Session):
@@ -20,7 +22,8 @@ class ValidationService:
     def validate_license(
         self, 
         request: LicenseValidationRequest, 
-        client_ip: Optional[str] = None
+        client_ip: Optional[str] = None,
+        event_type: ActivationEventType = ActivationEventType.VALIDATE
     ) -> LicenseValidationResponse:
         """Validate a license key and machine combination"""
         
@@ -33,7 +36,28 @@ class ValidationService:
         
         # Step 2: Find license in database
         key_hash = self.generator.hash_key(request.license_key)
-        license_key = self.license_service.get_license_by_hash(key_hash)
+        
+        # The common case - an active, unexpired license checked from a machine that is
+        # already activated - only reads before its heartbeat, so look it up on a replica
+        with use_replica(self.db) as on_replica:
+            license_key = self.license_service.get_license_by_hash(key_hash)
+            existing_activation = None
+            if license_key and license_key.status == LicenseStatus.ACTIVE and not self._is_expired(license_key):
+                existing_activation = self.activation_service.get_active_activation(
+                    license_key.id, request.machine_id
+                )
+        
+        if existing_activation:
+            response = self._valid_response(license_key)
+            self.activation_service.record_heartbeat(
+                license_key, existing_activation, client_ip, event_type=event_type
+            )
+            return response
+        
+        if on_replica:
+            # Anything else may write, so decide it against the primary
+            self.db.expunge_all()
+            license_key = self.license_service.get_license_by_hash(key_hash)
         
         if not license_key:
             return LicenseValidationResponse(
@@ -51,11 +75,14 @@ class ValidationService:
             )
         
         # Step 4: Check expiration
-        if license_key.expires_at and license_key.expires_at <= datetime.now(timezone.utc):
+        if self._is_expired(license_key):
             # Update license status to expired
-            from app.models.database import LicenseStatus
             license_key.status = LicenseStatus.EXPIRED
             self.db.add(license_key)
+            record_stats_delta(self.db, license_key.owner_user_id, **license_counter_delta(
+                license_counters(LicenseStatus.ACTIVE),
+                license_counters(LicenseStatus.EXPIRED)
+            ))
             self.db.commit()
             
             return LicenseValidationResponse(
@@ -68,7 +95,7 @@ class ValidationService:
         
         # Step 5: Handle activation
         activation_result = self.activation_service.handle_activation(
-            license_key, request.machine_id, client_ip
+            license_key, request.machine_id, client_ip, event_type=event_type
         )
         
         if not activation_result["success"]:
@@ -79,7 +106,21 @@ class ValidationService:
                 message=activation_result["message"]
             )
         
-        # Step 6: Parse features
+        # Step 6: Return successful validation
+        return self._valid_response(license_key)
+    
+    def _is_expired(self, license_key: LicenseKey) -> bool:
+        """Whether the license is past its expiry (expires_at is stored as naive UTC)"""
+        if not license_key.expires_at:
+            return False
+        expires_at = license_key.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at <= datetime.now(timezone.utc)
+    
+    def _valid_response(self, license_key: LicenseKey) -> LicenseValidationResponse:
+        """Successful validation response for a license"""
+        # Parse features
         features = None
         if license_key.features:
             try:
@@ -87,7 +128,6 @@ class ValidationService:
             except json.JSONDecodeError:
                 features = {}
         
-        # Step 7: Return successful validation
         return LicenseValidationResponse(
             valid=True,
             license_id=license_key.id,
@@ -98,4 +138,4 @@ class ValidationService:
             features=features,
             remaining_activations=license_key.max_activations - license_key.current_activations,
             message="License is valid"
-        )
\ No newline at end of file
+        )
@@ -3,21 +3,37 @@
 License Management Client SDK
 """
 import requests
+import asyncio
+import inspect
 import json
 import hashlib
+import logging
 import platform
+import random
+import threading
 import uuid
 import time
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import httpx
+except ImportError:  # httpx is only needed by AsyncLicenseClient
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
 class LicenseStatus(Enum):
     """License status enumeration"""
     ACTIVE = "active"
     EXPIRED = "expired"
     SUSPENDED = "suspended"
     REVOKED = "revoked"
+    BLOCKED = "blocked"
 
 class ActivationStatus(Enum):
     """Activation status enumeration"""
@@ -30,11 +46,12 @@ class LicenseInfo:
     license_id: int
     customer_id: int
     application_id: int
-    status: LicenseStatus
+    status: Optional[LicenseStatus]
     expires_at: Optional[str]
     features: Dict[str, Any]
     remaining_activations: int
     message: str
+    valid: bool = False
 
 @dataclass
 class ActivationFormInfo:
@@ -47,11 +64,190 @@ class ActivationFormInfo:
     status: str
 
 from .utils.machine_fingerprint import MachineFingerprint
+from .utils.validation_cache import ValidationCache
+from .utils.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+# Responses worth retrying: the server was overloaded or a proxy could not reach it
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# Status changes are reported as on_status_change(previous, current); previous is None
+# for the first heartbeat
+StatusCallback = Callable[[Optional[LicenseInfo], LicenseInfo], Any]
+
+class LicenseHeartbeat:
+    """Background thread that sends heartbeats for a license through a client's pooled
+    session. Heartbeats are spread out with random jitter, so a fleet started at the
+    same moment does not call the server at the same moment, and back off
+    exponentially while the server cannot be reached"""
+    
+    def __init__(self, client: "LicenseClient", license_key: str, interval: float = 300,
+                 jitter: float = 0.1, retry_delay: float = 30, max_backoff: float = 3600,
+                 on_status_change: Optional[StatusCallback] = None):
+        """
+        Initialize the heartbeat (call start() to run it)
+        
+        Args:
+            client: The license client whose session is used
+            license_key: The license key to keep alive
+            interval: Seconds between heartbeats
+            jitter: Each interval is varied at random by up to this fraction
+            retry_delay: Delay after the first failed heartbeat, doubled on every further failure
+            max_backoff: Upper bound on the delay after failures
+            on_status_change: Called with (previous, current) LicenseInfo when the license's
+                validity or status changes
+        """
+        self.client = client
+        self.license_key = license_key
+        self.interval = interval
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.on_status_change = on_status_change
+        self.license_info: Optional[LicenseInfo] = None
+        self.failures = 0
+        self.last_error: Optional[Exception] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _first_delay(self) -> float:
+        # Anywhere in the first interval, so clients started together drift apart
+        return random.uniform(0, self.interval)
+    
+    def _next_delay(self) -> float:
+        if self.failures:
+            delay = min(self.max_backoff, self.retry_delay * 2 ** (self.failures - 1))
+            return random.uniform(delay / 2, delay)
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+    
+    def _record(self, license_info: LicenseInfo) -> Optional[Tuple[Optional[LicenseInfo], LicenseInfo]]:
+        """Store a heartbeat result and return (previous, current) if the status changed"""
+        previous, self.license_info = self.license_info, license_info
+        self.failures = 0
+        self.last_error = None
+        if previous is None or (previous.valid, previous.status) != (license_info.valid, license_info.status):
+            return previous, license_info
+        return None
+    
+    def _record_failure(self, error: Exception):
+        self.failures += 1
+        self.last_error = error
+        logger.warning(f"License heartbeat failed ({self.failures} in a row): {error}")
+    
+    def beat(self):
+        """Send one heartbeat now and report a status change"""
+        try:
+            license_info = self.client.send_heartbeat(self.license_key)
+        except Exception as e:
+            self._record_failure(e)
+            return
+        change = self._record(license_info)
+        if change and self.on_status_change:
+            try:
+                self.on_status_change(*change)
+            except Exception:
+                logger.exception("License status callback failed")
+    
+    def _run(self):
+        delay = self._first_delay()
+        while not self._stop_event.wait(delay):
+            self.beat()
+            delay = self._next_delay()
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the heartbeat thread"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="license-heartbeat", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the heartbeat and wait for the thread to finish
+        
+        Args:
+            timeout: Seconds to wait for a heartbeat in progress (None waits for it)
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+class AsyncLicenseHeartbeat(LicenseHeartbeat):
+    """asyncio task version of LicenseHeartbeat for AsyncLicenseClient. The status
+    callback may be a plain function or a coroutine function"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._task: Optional[asyncio.Task] = None
+    
+    async def beat(self):
+        """Send one heartbeat now and report a status change"""
+        try:
+            license_info = await self.client.send_heartbeat(self.license_key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record_failure(e)
+            return
+        change = self._record(license_info)
+        if change and self.on_status_change:
+            try:
+                result = self.on_status_change(*change)
+                if inspect.isawaitable(result):
+                    await result
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("License status callback failed")
+    
+    async def _run(self):
+        delay = self._first_delay()
+        while True:
+            await asyncio.sleep(delay)
+            await self.beat()
+            delay = self._next_delay()
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self):
+        """Start the heartbeat task on the running event loop"""
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="license-heartbeat")
+    
+    async def stop(self):
+        """Cancel the heartbeat task and wait for it to finish"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
 
 class LicenseClient:
     """Main license client for interacting with the license server"""
     
-    def __init__(self, server_url: str, app_name: str, app_version: str):
+    heartbeat_class = LicenseHeartbeat
+    
+    def __init__(self, server_url: str, app_name: str, app_version: str,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, pool_size: int = 10,
+                 max_retries: int = 3, backoff_factor: float = 0.5, max_backoff: float = 10.0,
+                 session: Optional[requests.Session] = None, cache_size: int = 1000,
+                 cache_path: Optional[str] = None, fingerprint_cache_path: Optional[str] = None,
+                 stale_grace: float = 3600, refresh_ahead: float = 0.8,
+                 breaker_threshold: int = 5, breaker_reset_timeout: float = 30):
         """
         Initialize the license client
         
@@ -59,39 +255,257 @@ class LicenseClient:
             server_url: URL of the license server
             app_name: Name of the application
             app_version: Version of the application
+            timeout: (connect, read) timeout in seconds for each request
+            pool_size: Keep-alive connections kept open to the server
+            max_retries: Retries after a failed attempt (0 disables retrying)
+            backoff_factor: Base delay in seconds, doubled on every retry
+            max_backoff: Upper bound on the delay between retries
+            session: Use this requests.Session instead of creating one
+            cache_size: Validation results kept in memory
+            cache_path: SQLite file that keeps validation results across restarts
+            fingerprint_cache_path: File that keeps the machine fingerprint across restarts
+                (e.g. MachineFingerprint.default_cache_path())
+            stale_grace: Seconds after expiry that a cached result is still returned while it
+                is revalidated in the background (0 always waits for the server)
+            refresh_ahead: Fraction of the cache duration after which a cache hit starts a
+                background refresh (1 disables refreshing ahead)
+            breaker_threshold: Consecutive server failures that pause requests (0 disables)
+            breaker_reset_timeout: Seconds requests stay paused before one is tried again
         """
         self.server_url = server_url.rstrip('/')
         self.app_name = app_name
         self.app_version = app_version
-        self.machine_id = MachineFingerprint.generate_fingerprint()
-        self._license_cache = {}
+        self.machine_id = MachineFingerprint.generate_fingerprint(cache_path=fingerprint_cache_path)
+        # 5 minutes cache; entries read from disk must have been written on this machine
+        self._license_cache = ValidationCache(
+            ttl=300, max_entries=cache_size, path=cache_path, secret=self.machine_id.encode(),
+            grace=stale_grace
+        )
         self._last_validation = 0
-        self._cache_duration = 300  # 5 minutes cache
+        self._heartbeats: List[LicenseHeartbeat] = []
+        self.refresh_ahead = refresh_ahead
+        self.circuit_breaker = CircuitBreaker(breaker_threshold, breaker_reset_timeout)
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
         
-    def register_application(self, description: str = None, features: Dict[str, Any] = None) -> Dict[str, Any]:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self._owns_session = session is None
+        self.session = session if session is not None else self._create_session(pool_size)
+        
+    def _create_session(self, pool_size: int) -> requests.Session:
+        # One pool of keep-alive connections to the license server; retries are
+        # done in _request so they can tell idempotent calls apart
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Stop heartbeats, then close the pooled connections (only if the client created
+        the session) and the cache file"""
+        for heartbeat in self._heartbeats:
+            heartbeat.stop()
+        self._heartbeats.clear()
+        with self._refresh_lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if self._owns_session:
+            self.session.close()
+        self._license_cache.close()
+    
+    def _backoff(self, attempt: int, response=None) -> float:
+        """Exponential backoff with full jitter, or the server's Retry-After when it sends one"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return min(delay, self.max_backoff)
+    
+    @staticmethod
+    def _never_sent(error: requests.ConnectionError) -> bool:
+        """True when the connection could not be opened, so the server never saw the request"""
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+    
+    def _check_circuit(self):
+        if not self.circuit_breaker.allow():
+            raise CircuitOpenError(
+                f"License server requests paused after repeated failures; "
+                f"retrying in {self.circuit_breaker.retry_in():.1f}s"
+            )
+    
+    def _record_outcome(self, response):
+        """A 5xx or rate-limit response counts against the server like a connection failure"""
+        if response.status_code in RETRY_STATUS_CODES or response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+    
+    def _request(self, method: str, path: str, idempotent: bool, **kwargs) -> requests.Response:
         """
-        Register the application with the license server
+        Send a request through the circuit breaker (raises CircuitOpenError while it is open)
         
         Args:
-            description: Application description
-            features: Dictionary of available features
+            method: HTTP method
+            path: Path below the server URL
+            idempotent: Whether repeating the request is safe
             
         Returns:
-            Application registration response
+            The last response received
+        """
+        self._check_circuit()
+        try:
+            response = self._send(method, path, idempotent, **kwargs)
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+        self._record_outcome(response)
+        return response
+    
+    def _send(self, method: str, path: str, idempotent: bool, **kwargs) -> requests.Response:
         """
-        app_data = {
+        Send a request over the pooled session, retrying failures
+        
+        Idempotent calls are retried on connection errors, timeouts and
+        RETRY_STATUS_CODES. Other calls are only retried when the connection
+        could not be opened, since the server may already have acted on them.
+        
+        Args:
+            method: HTTP method
+            path: Path below the server URL
+            idempotent: Whether repeating the request is safe
+            
+        Returns:
+            The last response received
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.server_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.ConnectionError as e:
+                if last_attempt or not (idempotent or self._never_sent(e)):
+                    raise
+            except requests.Timeout:
+                if last_attempt or not idempotent:
+                    raise
+            else:
+                if last_attempt or not idempotent or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+            time.sleep(self._backoff(attempt, response))
+    
+    def _application_data(self, description: str = None, features: Dict[str, Any] = None) -> Dict[str, Any]:
+        return {
             "name": self.app_name,
             "version": self.app_version,
             "description": description or f"{self.app_name} {self.app_version}",
             "features": features or {}
         }
-        
-        response = requests.post(
-            f"{self.server_url}/api/v1/applications/",
-            json=app_data,
-            headers={"Content-Type": "application/json"}
+    
+    def _cache_key(self, license_key: str) -> str:
+        return ValidationCache.entry_key(license_key, self.machine_id)
+    
+    @staticmethod
+    def _license_info(data: Dict[str, Any]) -> LicenseInfo:
+        return LicenseInfo(
+            license_id=data.get('license_id'),
+            customer_id=data.get('customer_id'),
+            application_id=data.get('application_id'),
+            status=LicenseStatus(data['status']) if data.get('status') else None,
+            expires_at=data.get('expires_at'),
+            features=data.get('features') or {},
+            remaining_activations=data.get('remaining_activations') or 0,
+            message=data.get('message', ''),
+            valid=data.get('valid', False)
+        )
+    
+    def _needs_refresh(self, age: float) -> bool:
+        """Whether a cached result of this age should be revalidated in the background"""
+        return age >= self._license_cache.ttl * self.refresh_ahead
+    
+    def _cached_license(self, cache_key: str, license_key: Optional[str] = None) -> Optional[LicenseInfo]:
+        """
+        Return a cached result, fresh or within the stale grace period. With
+        license_key, a result that is expired or close to expiry is revalidated
+        in the background
+        """
+        entry = self._license_cache.lookup(cache_key)
+        if entry is None:
+            return None
+        data, age = entry
+        if license_key is not None and self._needs_refresh(age):
+            self._refresh_in_background(license_key, cache_key)
+        return self._license_info(data)
+    
+    def _refresh_in_background(self, license_key: str, cache_key: str):
+        with self._refresh_lock:
+            if cache_key in self._refreshing or self._refresh_paused():
+                return
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="license-refresh")
+            self._refreshing.add(cache_key)
+            self._refresh_executor.submit(self._refresh, license_key, cache_key)
+    
+    def _refresh_paused(self) -> bool:
+        # No background refreshes while the server is known to be failing
+        return self.circuit_breaker.state == CircuitState.OPEN and self.circuit_breaker.retry_in() > 0
+    
+    def _refresh(self, license_key: str, cache_key: str):
+        try:
+            self._fetch_license(license_key, cache_key)
+        except Exception as e:
+            logger.info(f"Background license refresh failed, still serving the cached result: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(cache_key)
+    
+    def _store_license(self, cache_key: str, data: Dict[str, Any]) -> LicenseInfo:
+        """Build a LicenseInfo from a validation response and cache it"""
+        license_info = self._license_info(data)
+        self._license_cache.set(cache_key, data)
+        return license_info
+    
+    @staticmethod
+    def _activation_form_info(data: Dict[str, Any]) -> ActivationFormInfo:
+        return ActivationFormInfo(
+            id=data['id'],
+            request_code=data['request_code'],
+            machine_id=data['machine_id'],
+            machine_name=data['machine_name'],
+            expires_at=data['expires_at'],
+            status=data['status']
         )
         
+    def register_application(self, description: str = None, features: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Register the application with the license server
+        
+        Args:
+            description: Application description
+            features: Dictionary of available features
+            
+        Returns:
+            Application registration response
+        """
+        app_data = self._application_data(description, features)
+        response = self._request("POST", "/api/v1/applications/", idempotent=False, json=app_data)
+        
         if response.status_code == 201:
             return response.json()
         else:
@@ -108,50 +522,76 @@ class LicenseClient:
         Returns:
             LicenseInfo object with validation results
         """
-        # Check cache first
-        cache_key = f"{license_key}_{self.machine_id}"
-        current_time = time.time()
-        
-        if not force_refresh and cache_key in self._license_cache:
-            cached_data = self._license_cache[cache_key]
-            if current_time - cached_data['timestamp'] < self._cache_duration:
-                return cached_data['license_info']
+        # Check cache first; expired results within the grace period are returned
+        # while they are revalidated in the background
+        cache_key = self._cache_key(license_key)
+        if not force_refresh:
+            cached = self._cached_license(cache_key, license_key)
+            if cached is not None:
+                return cached
         
-        # Perform validation
+        return self._fetch_license(license_key, cache_key)
+    
+    def _fetch_license(self, license_key: str, cache_key: str) -> LicenseInfo:
         validation_data = {
             "license_key": license_key,
             "machine_id": self.machine_id
         }
         
-        response = requests.post(
-            f"{self.server_url}/api/v1/validate/",
-            json=validation_data,
-            headers={"Content-Type": "application/json"}
-        )
+        # Validating the same key and machine twice has the same effect as once
+        response = self._request("POST", "/api/v1/validation/", idempotent=True, json=validation_data)
         
         if response.status_code == 200:
-            data = response.json()
-            license_info = LicenseInfo(
-                license_id=data.get('license_id'),
-                customer_id=data.get('customer_id'),
-                application_id=data.get('application_id'),
-                status=LicenseStatus(data.get('status', 'unknown')),
-                expires_at=data.get('expires_at'),
-                features=data.get('features', {}),
-                remaining_activations=data.get('remaining_activations', 0),
-                message=data.get('message', '')
-            )
-            
-            # Cache the result
-            self._license_cache[cache_key] = {
-                'license_info': license_info,
-                'timestamp': current_time
-            }
-            
-            return license_info
+            return self._store_license(cache_key, response.json())
         else:
             raise Exception(f"License validation failed: {response.text}")
     
+    def send_heartbeat(self, license_key: str) -> LicenseInfo:
+        """
+        Send a heartbeat to keep this machine's activation alive
+        
+        Args:
+            license_key: The license key to keep alive
+            
+        Returns:
+            LicenseInfo object with validation results (also cached)
+        """
+        heartbeat_data = {
+            "license_key": license_key,
+            "machine_id": self.machine_id
+        }
+        response = self._request("POST", "/api/v1/validation/heartbeat", idempotent=True, json=heartbeat_data)
+        
+        if response.status_code == 200:
+            return self._store_license(self._cache_key(license_key), response.json())
+        else:
+            raise Exception(f"License heartbeat failed: {response.text}")
+    
+    def start_heartbeat(self, license_key: str, interval: float = 300, jitter: float = 0.1,
+                        retry_delay: float = 30, max_backoff: float = 3600,
+                        on_status_change: Optional[StatusCallback] = None) -> LicenseHeartbeat:
+        """
+        Send heartbeats for a license in the background until close() or stop()
+        
+        Args:
+            license_key: The license key to keep alive
+            interval: Seconds between heartbeats
+            jitter: Each interval is varied at random by up to this fraction
+            retry_delay: Delay after the first failed heartbeat, doubled on every further failure
+            max_backoff: Upper bound on the delay after failures
+            on_status_change: Called with (previous, current) LicenseInfo when the status changes
+            
+        Returns:
+            The running heartbeat
+        """
+        heartbeat = self.heartbeat_class(
+            self, license_key, interval=interval, jitter=jitter, retry_delay=retry_delay,
+            max_backoff=max_backoff, on_status_change=on_status_change
+        )
+        heartbeat.start()
+        self._heartbeats.append(heartbeat)
+        return heartbeat
+    
     def create_activation_request(self, license_key: str, machine_name: str = None) -> ActivationFormInfo:
         """
         Create an activation form request for offline activation
@@ -169,22 +609,10 @@ class LicenseClient:
             "machine_name": machine_name or f"{self.app_name} Machine"
         }
         
-        response = requests.post(
-            f"{self.server_url}/api/v1/activation-forms/",
-            json=form_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = self._request("POST", "/api/v1/activation-forms/", idempotent=False, json=form_data)
         
         if response.status_code == 201:
-            data = response.json()
-            return ActivationFormInfo(
-                id=data['id'],
-                request_code=data['request_code'],
-                machine_id=data['machine_id'],
-                machine_name=data['machine_name'],
-                expires_at=data['expires_at'],
-                status=data['status']
-            )
+            return self._activation_form_info(response.json())
         else:
             raise Exception(f"Failed to create activation request: {response.text}")
     
@@ -204,22 +632,10 @@ class LicenseClient:
             "activation_code": activation_code
         }
         
-        response = requests.post(
-            f"{self.server_url}/api/v1/activation-forms/complete",
-            json=complete_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = self._request("POST", "/api/v1/activation-forms/complete", idempotent=False, json=complete_data)
         
         if response.status_code == 200:
-            data = response.json()
-            return ActivationFormInfo(
-                id=data['id'],
-                request_code=data['request_code'],
-                machine_id=data['machine_id'],
-                machine_name=data['machine_name'],
-                expires_at=data['expires_at'],
-                status=data['status']
-            )
+            return self._activation_form_info(response.json())
         else:
             raise Exception(f"Failed to complete activation: {response.text}")
     
@@ -273,7 +689,7 @@ class LicenseClient:
             return False
     
     def clear_cache(self):
-        """Clear the license validation cache"""
+        """Clear the license validation cache (in memory and on disk)"""
         self._license_cache.clear()
     
     def set_cache_duration(self, seconds: int):
@@ -283,7 +699,345 @@ class LicenseClient:
         Args:
             seconds: Cache duration in seconds
         """
-        self._cache_duration = seconds
+        self._license_cache.ttl = seconds
+
+class AsyncLicenseClient(LicenseClient):
+    """asyncio license client with the same surface as LicenseClient, built on a
+    pooled httpx.AsyncClient. Concurrent validations of the same key share one
+    request to the server"""
+    
+    heartbeat_class = AsyncLicenseHeartbeat
+    
+    def __init__(self, server_url: str, app_name: str, app_version: str,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, pool_size: int = 10,
+                 max_retries: int = 3, backoff_factor: float = 0.5, max_backoff: float = 10.0,
+                 session: Optional["httpx.AsyncClient"] = None, cache_size: int = 1000,
+                 cache_path: Optional[str] = None, fingerprint_cache_path: Optional[str] = None,
+                 stale_grace: float = 3600, refresh_ahead: float = 0.8,
+                 breaker_threshold: int = 5, breaker_reset_timeout: float = 30):
+        """
+        Initialize the async license client
+        
+        Args:
+            server_url: URL of the license server
+            app_name: Name of the application
+            app_version: Version of the application
+            timeout: (connect, read) timeout in seconds for each request
+            pool_size: Most connections open to the server at once
+            max_retries: Retries after a failed attempt (0 disables retrying)
+            backoff_factor: Base delay in seconds, doubled on every retry
+            max_backoff: Upper bound on the delay between retries
+            session: Use this httpx.AsyncClient instead of creating one
+            cache_size: Validation results kept in memory
+            cache_path: SQLite file that keeps validation results across restarts
+            fingerprint_cache_path: File that keeps the machine fingerprint across restarts
+                (e.g. MachineFingerprint.default_cache_path())
+            stale_grace: Seconds after expiry that a cached result is still returned while it
+                is revalidated in the background (0 always waits for the server)
+            refresh_ahead: Fraction of the cache duration after which a cache hit starts a
+                background refresh (1 disables refreshing ahead)
+            breaker_threshold: Consecutive server failures that pause requests (0 disables)
+            breaker_reset_timeout: Seconds requests stay paused before one is tried again
+        """
+        if httpx is None:
+            raise ImportError("AsyncLicenseClient requires httpx (pip install httpx)")
+        super().__init__(server_url, app_name, app_version, timeout, pool_size,
+                         max_retries, backoff_factor, max_backoff, session, cache_size, cache_path,
+                         fingerprint_cache_path, stale_grace, refresh_ahead, breaker_threshold,
+                         breaker_reset_timeout)
+        self._in_flight: Dict[str, asyncio.Task] = {}
+    
+    def _create_session(self, pool_size: int) -> "httpx.AsyncClient":
+        connect, read = self.timeout
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+    
+    def __enter__(self):
+        raise TypeError("Use 'async with' with AsyncLicenseClient")
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def close(self):
+        """Stop heartbeats, then close the pooled connections (only if the client created
+        the session) and the cache file"""
+        for heartbeat in self._heartbeats:
+            await heartbeat.stop()
+        self._heartbeats.clear()
+        in_flight = list(self._in_flight.values())
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        if self._owns_session:
+            await self.session.aclose()
+        self._license_cache.close()
+    
+    async def _cached_license_async(self, cache_key: str, license_key: Optional[str] = None) -> Optional[LicenseInfo]:
+        """Async _cached_license: the background refresh is a task sharing the in-flight map"""
+        # The disk tier is read in a thread so it never stalls the event loop
+        entry = self._license_cache.lookup(cache_key, disk=False)
+        if entry is None and self._license_cache.persistent:
+            entry = await asyncio.to_thread(self._license_cache.lookup, cache_key)
+        if entry is None:
+            return None
+        data, age = entry
+        if license_key is not None and self._needs_refresh(age) and not self._refresh_paused():
+            if cache_key not in self._in_flight:
+                self._start_fetch(license_key, cache_key).add_done_callback(self._log_refresh_failure)
+        return self._license_info(data)
+    
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.info(f"Background license refresh failed, still serving the cached result: {task.exception()}")
+    
+    def _start_fetch(self, license_key: str, cache_key: str) -> asyncio.Task:
+        """The validation request for a key, shared by every caller until it completes"""
+        task = self._in_flight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_license(license_key, cache_key))
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        return task
+    
+    async def _store_license_async(self, cache_key: str, data: Dict[str, Any]) -> LicenseInfo:
+        license_info = self._license_info(data)
+        if self._license_cache.persistent:
+            await asyncio.to_thread(self._license_cache.set, cache_key, data)
+        else:
+            self._license_cache.set(cache_key, data)
+        return license_info
+    
+    async def _request(self, method: str, path: str, idempotent: bool, **kwargs) -> "httpx.Response":
+        """
+        Send a request through the circuit breaker (raises CircuitOpenError while it is open)
+        
+        Args:
+            method: HTTP method
+            path: Path below the server URL
+            idempotent: Whether repeating the request is safe
+            
+        Returns:
+            The last response received
+        """
+        self._check_circuit()
+        try:
+            response = await self._send(method, path, idempotent, **kwargs)
+        except asyncio.CancelledError:
+            # Cancelled by the caller (close, a stopped heartbeat, a timeout): says nothing about the server
+            self.circuit_breaker.release_trial()
+            raise
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+        self._record_outcome(response)
+        return response
+    
+    async def _send(self, method: str, path: str, idempotent: bool, **kwargs) -> "httpx.Response":
+        """
+        Send a request over the pooled client, retrying failures like LicenseClient._send
+        
+        Args:
+            method: HTTP method
+            path: Path below the server URL
+            idempotent: Whether repeating the request is safe
+            
+        Returns:
+            The last response received
+        """
+        url = f"{self.server_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            response = None
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # The connection could not be opened, so the server never saw the request
+                if last_attempt:
+                    raise
+            except httpx.TransportError:
+                if last_attempt or not idempotent:
+                    raise
+            else:
+                if last_attempt or not idempotent or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+            await asyncio.sleep(self._backoff(attempt, response))
+    
+    async def register_application(self, description: str = None, features: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Register the application with the license server
+        
+        Args:
+            description: Application description
+            features: Dictionary of available features
+            
+        Returns:
+            Application registration response
+        """
+        app_data = self._application_data(description, features)
+        response = await self._request("POST", "/api/v1/applications/", idempotent=False, json=app_data)
+        
+        if response.status_code == 201:
+            return response.json()
+        else:
+            raise Exception(f"Failed to register application: {response.text}")
+    
+    async def validate_license(self, license_key: str, force_refresh: bool = False) -> LicenseInfo:
+        """
+        Validate a license key. Callers validating a key that is already being
+        validated wait for that request instead of sending another
+        
+        Args:
+            license_key: The license key to validate
+            force_refresh: Force refresh the cache
+            
+        Returns:
+            LicenseInfo object with validation results
+        """
+        cache_key = self._cache_key(license_key)
+        if not force_refresh:
+            cached = await self._cached_license_async(cache_key, license_key)
+            if cached is not None:
+                return cached
+        
+        # A cancelled caller must not cancel the request for everyone else waiting on it
+        return await asyncio.shield(self._start_fetch(license_key, cache_key))
+    
+    async def _fetch_license(self, license_key: str, cache_key: str) -> LicenseInfo:
+        validation_data = {
+            "license_key": license_key,
+            "machine_id": self.machine_id
+        }
+        
+        # Validating the same key and machine twice has the same effect as once
+        response = await self._request("POST", "/api/v1/validation/", idempotent=True, json=validation_data)
+        
+        if response.status_code == 200:
+            return await self._store_license_async(cache_key, response.json())
+        else:
+            raise Exception(f"License validation failed: {response.text}")
+    
+    async def send_heartbeat(self, license_key: str) -> LicenseInfo:
+        """
+        Send a heartbeat to keep this machine's activation alive
+        
+        Args:
+            license_key: The license key to keep alive
+            
+        Returns:
+            LicenseInfo object with validation results (also cached)
+        """
+        heartbeat_data = {
+            "license_key": license_key,
+            "machine_id": self.machine_id
+        }
+        response = await self._request("POST", "/api/v1/validation/heartbeat", idempotent=True, json=heartbeat_data)
+        
+        if response.status_code == 200:
+            return await self._store_license_async(self._cache_key(license_key), response.json())
+        else:
+            raise Exception(f"License heartbeat failed: {response.text}")
+    
+    async def create_activation_request(self, license_key: str, machine_name: str = None) -> ActivationFormInfo:
+        """
+        Create an activation form request for offline activation
+        
+        Args:
+            license_key: The license key to activate
+            machine_name: Optional machine name
+            
+        Returns:
+            ActivationFormInfo object
+        """
+        form_data = {
+            "license_key": license_key,
+            "machine_id": self.machine_id,
+            "machine_name": machine_name or f"{self.app_name} Machine"
+        }
+        
+        response = await self._request("POST", "/api/v1/activation-forms/", idempotent=False, json=form_data)
+        
+        if response.status_code == 201:
+            return self._activation_form_info(response.json())
+        else:
+            raise Exception(f"Failed to create activation request: {response.text}")
+    
+    async def complete_activation(self, request_code: str, activation_code: str) -> ActivationFormInfo:
+        """
+        Complete an activation form with an activation code
+        
+        Args:
+            request_code: The request code from create_activation_request
+            activation_code: The activation code from the admin
+            
+        Returns:
+            ActivationFormInfo object
+        """
+        complete_data = {
+            "request_code": request_code,
+            "activation_code": activation_code
+        }
+        
+        response = await self._request("POST", "/api/v1/activation-forms/complete", idempotent=False, json=complete_data)
+        
+        if response.status_code == 200:
+            return self._activation_form_info(response.json())
+        else:
+            raise Exception(f"Failed to complete activation: {response.text}")
+    
+    async def is_feature_enabled(self, license_key: str, feature_name: str) -> bool:
+        """
+        Check if a specific feature is enabled for the license
+        
+        Args:
+            license_key: The license key to check
+            feature_name: The name of the feature to check
+            
+        Returns:
+            True if the feature is enabled, False otherwise
+        """
+        try:
+            license_info = await self.validate_license(license_key)
+            return license_info.features.get(feature_name, False)
+        except Exception:
+            return False
+    
+    async def get_available_features(self, license_key: str) -> Dict[str, Any]:
+        """
+        Get all available features for a license
+        
+        Args:
+            license_key: The license key to check
+            
+        Returns:
+            Dictionary of available features
+        """
+        try:
+            license_info = await self.validate_license(license_key)
+            return license_info.features
+        except Exception:
+            return {}
+    
+    async def is_license_valid(self, license_key: str) -> bool:
+        """
+        Check if a license is valid
+        
+        Args:
+            license_key: The license key to check
+            
+        Returns:
+            True if the license is valid, False otherwise
+        """
+        try:
+            license_info = await self.validate_license(license_key)
+            return license_info.status == LicenseStatus.ACTIVE
+        except Exception:
+            return False
 
 class FeatureManager:
     """Feature management utility for restricting application features"""
@@ -0,0 +1,89 @@
+"""
+Circuit breaker for calls to the license server: after repeated failures the
+client stops sending requests for a while instead of adding load to a server
+that is already struggling, then lets a single trial request through.
+"""
+
+import logging
+import threading
+import time
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(Enum):
+    """Circuit breaker state"""
+    CLOSED = "closed"        # requests flow normally
+    OPEN = "open"            # requests fail fast
+    HALF_OPEN = "half_open"  # one trial request is in flight
+
+class CircuitOpenError(Exception):
+    """Exception raised when a request is refused because the circuit is open"""
+    pass
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 disables the breaker)
+            reset_timeout: Seconds the circuit stays open before a trial request is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (moves an open circuit to half-open once it has waited)"""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit allows a trial request"""
+        with self._lock:
+            if self.state != CircuitState.OPEN:
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CircuitState.CLOSED:
+                logger.info("License server is reachable again; circuit closed")
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or (
+                    self.failure_threshold and self.failures >= self.failure_threshold
+                    and self.state == CircuitState.CLOSED):
+                if self.state == CircuitState.CLOSED:
+                    logger.warning(f"License server failed {self.failures} times in a row; "
+                                   f"pausing requests for {self.reset_timeout:g}s")
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        """Give back a half-open trial that ended without an answer (e.g. it was cancelled),
+        so the next request becomes the trial instead of the circuit staying half-open"""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self.state = CircuitState.OPEN
+
+    def reset(self):
+        """Close the circuit and forget past failures"""
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
@@ -1,16 +1,66 @@
 import hashlib
+import logging
+import os
 import platform
+import socket
+import sys
+import tempfile
+import threading
+import time
 import uuid
 import json
 from typing import Dict, Any, Optional
 
+logger = logging.getLogger(__name__)
+
+# Fingerprints already computed in this process, by include_mac
+_fingerprints: Dict[bool, str] = {}
+_fingerprints_lock = threading.Lock()
+
+# A persisted fingerprint is recomputed after this long even if the machine looks unchanged
+FINGERPRINT_CACHE_MAX_AGE = 7 * 24 * 3600
+
 class MachineFingerprint:
     """Utility class for generating machine fingerprints"""
     
     @staticmethod
-    def generate_fingerprint(include_mac: bool = True) -> str:
+    def generate_fingerprint(include_mac: bool = True, cache_path: Optional[str] = None,
+                             refresh: bool = False) -> str:
+        """
+        Get the machine fingerprint, computing it at most once per process
+        
+        Collecting system information can be slow (platform.processor() runs a
+        subprocess on some Linux systems), so the result is kept for the life of
+        the process and, with cache_path, in a file that later processes reuse
+        while cheap checks show the machine is unchanged.
+        
+        Args:
+            include_mac: Whether to include MAC address in fingerprint
+            cache_path: File to persist the fingerprint in (see default_cache_path())
+            refresh: Collect the system information again, ignoring both caches
+            
+        Returns:
+            32-character hexadecimal machine fingerprint
+        """
+        with _fingerprints_lock:
+            if not refresh and include_mac in _fingerprints:
+                return _fingerprints[include_mac]
+            
+            fingerprint = None
+            if cache_path and not refresh:
+                fingerprint = MachineFingerprint._load_cached(cache_path, include_mac)
+            if fingerprint is None:
+                fingerprint = MachineFingerprint.compute_fingerprint(include_mac)
+                if cache_path:
+                    MachineFingerprint._store_cached(cache_path, include_mac, fingerprint)
+            
+            _fingerprints[include_mac] = fingerprint
+            return fingerprint
+    
+    @staticmethod
+    def compute_fingerprint(include_mac: bool = True) -> str:
         """
-        Generate a unique machine fingerprint
+        Compute the machine fingerprint from system information (no caching)
         
         Args:
             include_mac: Whether to include MAC address in fingerprint
@@ -29,6 +79,66 @@ class MachineFingerprint:
         # Return first 32 characters for brevity
         return fingerprint[:32]
     
+    @staticmethod
+    def default_cache_path() -> str:
+        """Per-user fingerprint cache file (XDG cache directory, or %LOCALAPPDATA% on Windows)"""
+        if sys.platform == "win32":
+            base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        return os.path.join(base, "license-client", "fingerprint.json")
+    
+    @staticmethod
+    def _machine_check() -> str:
+        """
+        Digest of system facts that are cheap to read (no subprocesses) and change
+        with the hardware, OS or Python install, used to decide whether a persisted
+        fingerprint still applies
+        """
+        uname = os.uname() if hasattr(os, "uname") else sys.getwindowsversion()
+        facts = [sys.platform, socket.gethostname(), sys.version, sys.executable, *map(str, uname)]
+        return hashlib.sha256("\0".join(facts).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _load_cached(cache_path: str, include_mac: bool) -> Optional[str]:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            fingerprint = cached["fingerprint"]
+            if (cached["include_mac"] == include_mac
+                    and cached["check"] == MachineFingerprint._machine_check()
+                    and 0 <= time.time() - cached["created_at"] < FINGERPRINT_CACHE_MAX_AGE
+                    and MachineFingerprint.validate_fingerprint(fingerprint)):
+                return fingerprint
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable fingerprint cache {cache_path}: {e}")
+        return None
+    
+    @staticmethod
+    def _store_cached(cache_path: str, include_mac: bool, fingerprint: str):
+        cached = {
+            "fingerprint": fingerprint,
+            "include_mac": include_mac,
+            "check": MachineFingerprint._machine_check(),
+            "created_at": time.time()
+        }
+        directory = os.path.dirname(os.path.abspath(cache_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Write a temporary file and rename it, so readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".fingerprint-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(cached, f)
+                os.replace(temp_path, cache_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write fingerprint cache {cache_path}: {e}")
+    
     @staticmethod
     def _collect_system_info(include_mac: bool = True) -> Dict[str, Any]:
         """
@@ -0,0 +1,233 @@
+"""
+Two-tier cache for license validation results: a bounded in-memory LRU in
+front of an optional SQLite file, so a restarted application can validate
+locally within the cache window instead of calling the server. Entries are
+kept for a grace period after they expire, so a stale result can be served
+while the server is unreachable.
+
+The HMAC on disk entries is a checksum against corruption and against a file
+copied from another machine, not a tamper seal: its key is derived from the
+machine fingerprint, which anyone with the SDK can recompute. Whoever can
+write the cache file can forge entries, so it must not be relied on to
+enforce licensing.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Entries stamped this far in the future mean the clock was moved back
+MAX_CLOCK_SKEW_SECONDS = 60
+
+class ValidationCache:
+    """Thread-safe validation cache with a TTL, a grace period, an LRU bound and checksummed disk entries"""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1000, path: Optional[str] = None,
+                 secret: bytes = b"", grace: float = 0):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_entries: Entries kept in memory before the least recently used is dropped
+            path: SQLite file for the on-disk tier (None keeps the cache in memory only)
+            secret: Key for the HMAC that detects corrupt disk entries and entries
+                written on another machine (not a secret from the local user)
+            grace: Seconds an expired entry is still kept for lookup()
+        """
+        self.ttl = ttl
+        self.grace = grace
+        self.max_entries = max_entries
+        self.path = path
+        self._secret = hashlib.sha256(b"license-validation-cache:" + secret).digest()
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # _lock guards the memory tier only; _disk_lock serializes use of the SQLite connection
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._open()
+
+    def _open(self):
+        try:
+            self._db = self._connect()
+        except sqlite3.DatabaseError as e:
+            # Not a usable database (truncated or overwritten): start a new one
+            logger.warning(f"Discarding unreadable validation cache {self.path}: {e}")
+            os.remove(self.path)
+            self._db = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS validations ("
+                "entry_key TEXT PRIMARY KEY, stored_at REAL NOT NULL, payload TEXT NOT NULL, mac TEXT NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS validations_stored_at ON validations (stored_at)")
+            db.execute("DELETE FROM validations WHERE stored_at < ?", (time.time() - self.retention,))
+        except sqlite3.DatabaseError:
+            db.close()
+            raise
+        return db
+
+    def _disable_disk(self, error: Exception):
+        logger.warning(f"Validation cache {self.path} failed, continuing in memory only: {error}")
+        try:
+            self._db.close()
+        except sqlite3.Error:
+            pass
+        self._db = None
+
+    @staticmethod
+    def entry_key(license_key: str, machine_id: str) -> str:
+        """Cache key for a license on a machine (the license key is not stored in clear)"""
+        return hashlib.sha256(f"{license_key}\0{machine_id}".encode("utf-8")).hexdigest()
+
+    def _mac(self, entry_key: str, stored_at: float, payload: str) -> str:
+        message = f"{entry_key}\0{stored_at!r}\0{payload}".encode("utf-8")
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    @property
+    def retention(self) -> float:
+        """Seconds an entry is kept: the TTL plus the grace period"""
+        return self.ttl + self.grace
+
+    def _retained(self, stored_at: float, now: float) -> bool:
+        return now - self.retention <= stored_at <= now + MAX_CLOCK_SKEW_SECONDS
+
+    def _remember(self, entry_key: str, stored_at: float, data: Dict[str, Any]):
+        self._memory[entry_key] = (stored_at, data)
+        self._memory.move_to_end(entry_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @property
+    def persistent(self) -> bool:
+        """Whether the on-disk tier is in use"""
+        return self._db is not None
+
+    def get(self, entry_key: str, disk: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry that has not expired, in memory first and then on disk
+
+        Args:
+            entry_key: Key from entry_key()
+            disk: Also look in the on-disk tier on a memory miss
+
+        Returns:
+            The cached validation response, or None
+        """
+        entry = self.lookup(entry_key, disk)
+        if entry is not None and entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def lookup(self, entry_key: str, disk: bool = True) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Look up an entry, including one that has expired but is within the grace period
+
+        Args:
+            entry_key: Key from entry_key()
+            disk: Also look in the on-disk tier on a memory miss
+
+        Returns:
+            (cached validation response, age in seconds), or None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(entry_key)
+            if entry is not None:
+                if self._retained(entry[0], now):
+                    self._memory.move_to_end(entry_key)
+                    return entry[1], max(now - entry[0], 0)
+                del self._memory[entry_key]
+        if not disk:
+            return None
+
+        # SQLite can wait on another process's write lock; memory-only lookups
+        # (from the event loop in AsyncLicenseClient) must not queue behind that
+        with self._disk_lock:
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(
+                    "SELECT stored_at, payload, mac FROM validations WHERE entry_key = ?", (entry_key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                stored_at, payload, mac = row
+                if not hmac.compare_digest(mac, self._mac(entry_key, stored_at, payload)):
+                    logger.warning("Dropping validation cache entry that failed its integrity check")
+                    self._db.execute("DELETE FROM validations WHERE entry_key = ?", (entry_key,))
+                    return None
+                if not self._retained(stored_at, now):
+                    self._db.execute("DELETE FROM validations WHERE entry_key = ?", (entry_key,))
+                    return None
+                data = json.loads(payload)
+            except sqlite3.Error as e:
+                self._disable_disk(e)
+                return None
+        with self._lock:
+            # A set() may have stored a newer result while the disk was read
+            current = self._memory.get(entry_key)
+            if current is None or current[0] < stored_at:
+                self._remember(entry_key, stored_at, data)
+        return data, max(now - stored_at, 0)
+
+    def set(self, entry_key: str, data: Dict[str, Any]):
+        """
+        Store a validation response in memory and on disk
+
+        Args:
+            entry_key: Key from entry_key()
+            data: JSON-serializable validation response
+        """
+        stored_at = time.time()
+        payload = json.dumps(data, sort_keys=True, separators=(',', ':'))
+        with self._lock:
+            self._remember(entry_key, stored_at, data)
+        with self._disk_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO validations (entry_key, stored_at, payload, mac) VALUES (?, ?, ?, ?)",
+                    (entry_key, stored_at, payload, self._mac(entry_key, stored_at, payload))
+                )
+                self._db.execute("DELETE FROM validations WHERE stored_at < ?", (stored_at - self.retention,))
+            except sqlite3.Error as e:
+                self._disable_disk(e)
+
+    def clear(self):
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM validations")
+                except sqlite3.Error as e:
+                    self._disable_disk(e)
+
+    def close(self):
+        """Close the on-disk tier"""
+        with self._disk_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
@@ -6,6 +6,7 @@ import {
   CustomersApi,
   DefaultApi,
   LicensesApi,
+  StatisticsApi,
   ValidationApi,
   Configuration,
 } from "@/generated";
@@ -39,6 +40,7 @@ export let authenticationApi = new AuthenticationApi(sharedConfig);
 export let customersApi = new CustomersApi(sharedConfig);
 export let defaultApi = new DefaultApi(sharedConfig);
 export let licensesApi = new LicensesApi(sharedConfig);
+export let statisticsApi = new StatisticsApi(sharedConfig);
 export let validationApi = new ValidationApi(sharedConfig);
 
 // Function to update the API Base URL dynamically
@@ -76,5 +78,6 @@ export const updateApiClients = () => {
   customersApi = new CustomersApi(sharedConfig);
   defaultApi = new DefaultApi(sharedConfig);
   licensesApi = new LicensesApi(sharedConfig);
+  statisticsApi = new StatisticsApi(sharedConfig);
   validationApi = new ValidationApi(sharedConfig);
 };
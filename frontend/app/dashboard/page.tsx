@@ -3,12 +3,13 @@
 import Layout from '@/components/Layout'
 import { useAuth } from '@/contexts/AuthContext'
 import { useEffect, useState } from 'react'
-import { licensesApi, customersApi, applicationsApi } from '@/api'
+import { statisticsApi } from '@/api'
 import {
   KeyIcon,
   UsersIcon,
   CogIcon,
   ClipboardDocumentListIcon,
+  ClockIcon,
 } from '@heroicons/react/24/outline'
 
 interface DashboardStats {
@@ -16,7 +17,8 @@ interface DashboardStats {
   active_licenses: number
   total_customers: number
   total_applications: number
-  pending_activation_forms: number
+  active_activations: number
+  expiring_30_days: number
 }
 
 export default function DashboardPage() {
@@ -30,22 +32,16 @@ export default function DashboardPage() {
 
   const fetchStats = async () => {
     try {
-      // Fetch real data from APIs
-      const [licensesResponse, customersResponse, applicationsResponse] = await Promise.all([
-        licensesApi.listLicensesApiV1LicensesGet(),
-        customersApi.listCustomersApiV1CustomersGet(),
-        applicationsApi.listApplicationsApiV1ApplicationsGet()
-      ])
-
-      // Count active licenses
-      const activeLicenses = licensesResponse.filter(license => license.status === 'active').length
+      // Server-maintained counters: one request regardless of account size
+      const statsResponse = await statisticsApi.getStatsApiV1StatsGet()
 
       setStats({
-        total_licenses: licensesResponse.length,
-        active_licenses: activeLicenses,
-        total_customers: customersResponse.length,
-        total_applications: applicationsResponse.length,
-        pending_activation_forms: 0, // This would need a separate endpoint
+        total_licenses: statsResponse.totalLicenses,
+        active_licenses: statsResponse.licenses.active ?? 0,
+        total_customers: statsResponse.customers,
+        total_applications: statsResponse.applications,
+        active_activations: statsResponse.activeActivations,
+        expiring_30_days: statsResponse.expiring30Days,
       })
     } catch (error) {
       console.error('Failed to fetch dashboard stats:', error)
@@ -55,7 +51,8 @@ export default function DashboardPage() {
         active_licenses: 0,
         total_customers: 0,
         total_applications: 0,
-        pending_activation_forms: 0,
+        active_activations: 0,
+        expiring_30_days: 0,
       })
     } finally {
       setLoading(false)
@@ -88,11 +85,17 @@ export default function DashboardPage() {
       color: 'bg-orange-500',
     },
     {
-      name: 'Pending Activations',
-      value: stats?.pending_activation_forms || 0,
+      name: 'Active Activations',
+      value: stats?.active_activations || 0,
       icon: ClipboardDocumentListIcon,
       color: 'bg-yellow-500',
     },
+    {
+      name: 'Expiring in 30 Days',
+      value: stats?.expiring_30_days || 0,
+      icon: ClockIcon,
+      color: 'bg-red-500',
+    },
   ]
 
   if (loading) {
@@ -100,7 +103,7 @@ export default function DashboardPage() {
       <Layout>
         <div className="animate-pulse">
           <div className="grid grid-cols-1 gap-5 sm:grid-cols-2 lg:grid-cols-3">
-            {[...Array(5)].map((_, i) => (
+            {[...Array(6)].map((_, i) => (
               <div key={i} className="bg-white overflow-hidden shadow rounded-lg">
                 <div className="p-5">
                   <div className="flex items-center">
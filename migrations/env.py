@@ -97,6 +97,17 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Scripts may hand over their own connection (e.g. one pointed at a scratch schema)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     # Override the sqlalchemy.url in the config with our constructed URL
     config.set_main_option("sqlalchemy.url", get_database_url())
     
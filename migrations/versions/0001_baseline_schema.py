@@ -0,0 +1,166 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2025-08-04 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user',
+    sa.Column('username', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('full_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('business_role', sa.Enum('USER', name='userrole'), nullable=False),
+    sa.Column('system_role', sa.Enum('SYSTEM_ADMIN', 'USER', name='systemrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('password_hash', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_email'), 'user', ['email'], unique=True)
+    op.create_index(op.f('ix_user_username'), 'user', ['username'], unique=True)
+    op.create_table('apitoken',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('token_hash', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('scopes', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_apitoken_token_hash'), 'apitoken', ['token_hash'], unique=True)
+    op.create_table('application',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('version', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('features', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('customer',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('company', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'email', name='uq_user_email')
+    )
+    op.create_index(op.f('ix_customer_email'), 'customer', ['email'], unique=False)
+    op.create_table('session',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('session_token', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('is_revoked', sa.Boolean(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_activity', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_session_session_token'), 'session', ['session_token'], unique=True)
+    op.create_table('licensekey',
+    sa.Column('key_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=True),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'EXPIRED', 'SUSPENDED', 'REVOKED', 'BLOCKED', name='licensestatus'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('max_activations', sa.Integer(), nullable=False),
+    sa.Column('current_activations', sa.Integer(), nullable=False),
+    sa.Column('features', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('notes', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['application_id'], ['application.id'], ),
+    sa.ForeignKeyConstraint(['customer_id'], ['customer.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_licensekey_key_hash'), 'licensekey', ['key_hash'], unique=True)
+    op.create_table('activation',
+    sa.Column('license_key_id', sa.Integer(), nullable=False),
+    sa.Column('machine_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('machine_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('ip_address', sqlmodel.sql.sqltypes.AutoString(length=45), nullable=True),
+    sa.Column('status', sa.Enum('ACTIVE', 'INACTIVE', name='activationstatus'), nullable=False),
+    sa.Column('activated_at', sa.DateTime(), nullable=False),
+    sa.Column('last_heartbeat', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['license_key_id'], ['licensekey.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('activationform',
+    sa.Column('license_key_id', sa.Integer(), nullable=False),
+    sa.Column('machine_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('machine_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('request_code', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('activation_code', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['license_key_id'], ['licensekey.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('offlineactivationcode',
+    sa.Column('license_key_id', sa.Integer(), nullable=False),
+    sa.Column('activation_code', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('machine_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('is_used', sa.Boolean(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('used_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['license_key_id'], ['licensekey.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_offlineactivationcode_activation_code'), 'offlineactivationcode', ['activation_code'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_offlineactivationcode_activation_code'), table_name='offlineactivationcode')
+    op.drop_table('offlineactivationcode')
+    op.drop_table('activationform')
+    op.drop_table('activation')
+    op.drop_index(op.f('ix_licensekey_key_hash'), table_name='licensekey')
+    op.drop_table('licensekey')
+    op.drop_index(op.f('ix_session_session_token'), table_name='session')
+    op.drop_table('session')
+    op.drop_index(op.f('ix_customer_email'), table_name='customer')
+    op.drop_table('customer')
+    op.drop_table('application')
+    op.drop_index(op.f('ix_apitoken_token_hash'), table_name='apitoken')
+    op.drop_table('apitoken')
+    op.drop_index(op.f('ix_user_username'), table_name='user')
+    op.drop_index(op.f('ix_user_email'), table_name='user')
+    op.drop_table('user')
+
+    # Enum types outlive their tables on PostgreSQL
+    for enum_name in ('activationstatus', 'licensestatus', 'systemrole', 'userrole'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,50 @@
+"""performance indexes for hot queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-08-04 09:31:07.552310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns). customer.user_id is already the leading
+# column of uq_user_email, so it needs no index of its own.
+INDEXES = [
+    ('ix_activation_license_key_machine_status', 'activation', ['license_key_id', 'machine_id', 'status']),
+    ('ix_activationform_request_code', 'activationform', ['request_code']),
+    ('ix_application_user_id', 'application', ['user_id']),
+    ('ix_licensekey_customer_id', 'licensekey', ['customer_id']),
+    ('ix_licensekey_application_id', 'licensekey', ['application_id']),
+    ('ix_licensekey_expires_at', 'licensekey', ['expires_at']),
+    ('ix_session_user_id', 'session', ['user_id']),
+    ('ix_apitoken_user_id', 'apitoken', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in INDEXES:
+            op.create_index(
+                index_name, table_name, columns,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(INDEXES):
+            op.drop_index(
+                index_name, table_name=table_name,
+                postgresql_concurrently=True, if_exists=True
+            )
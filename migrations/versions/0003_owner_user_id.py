@@ -0,0 +1,84 @@
+"""denormalize owner user_id onto licensekey and activation
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-08-06 14:02:18.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def _backfill(statement: str) -> None:
+    """Run a backfill UPDATE in committed batches until no rows are left"""
+    if op.get_context().as_sql:
+        # Offline (--sql) mode cannot loop on row counts; emit a single pass
+        op.execute(sa.text(statement).bindparams(batch_size=2147483647))
+        return
+    bind = op.get_bind()
+    while True:
+        result = bind.execute(sa.text(statement), {"batch_size": BACKFILL_BATCH_SIZE})
+        if result.rowcount < BACKFILL_BATCH_SIZE:
+            break
+
+
+def upgrade() -> None:
+    op.add_column('licensekey', sa.Column('owner_user_id', sa.Integer(), nullable=True))
+    op.add_column('activation', sa.Column('owner_user_id', sa.Integer(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        # Licenses are owned by their customer's user, or the application's
+        # user for licenses issued without a customer
+        _backfill("""
+            UPDATE licensekey lk
+            SET owner_user_id = COALESCE(
+                (SELECT c.user_id FROM customer c WHERE c.id = lk.customer_id),
+                (SELECT a.user_id FROM application a WHERE a.id = lk.application_id)
+            )
+            WHERE lk.id IN (
+                SELECT id FROM licensekey WHERE owner_user_id IS NULL LIMIT :batch_size
+            )
+        """)
+        _backfill("""
+            UPDATE activation act
+            SET owner_user_id = lk.owner_user_id
+            FROM licensekey lk
+            WHERE act.id IN (
+                SELECT id FROM activation WHERE owner_user_id IS NULL LIMIT :batch_size
+            )
+            AND lk.id = act.license_key_id
+        """)
+
+        op.create_index(
+            'ix_licensekey_owner_user_id_id', 'licensekey', ['owner_user_id', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_activation_owner_user_id_id', 'activation', ['owner_user_id', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+    op.alter_column('licensekey', 'owner_user_id', nullable=False)
+    op.alter_column('activation', 'owner_user_id', nullable=False)
+    op.create_foreign_key('licensekey_owner_user_id_fkey', 'licensekey', 'user', ['owner_user_id'], ['id'])
+    op.create_foreign_key('activation_owner_user_id_fkey', 'activation', 'user', ['owner_user_id'], ['id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('activation_owner_user_id_fkey', 'activation', type_='foreignkey')
+    op.drop_constraint('licensekey_owner_user_id_fkey', 'licensekey', type_='foreignkey')
+    op.drop_index('ix_activation_owner_user_id_id', table_name='activation')
+    op.drop_index('ix_licensekey_owner_user_id_id', table_name='licensekey')
+    op.drop_column('activation', 'owner_user_id')
+    op.drop_column('licensekey', 'owner_user_id')
@@ -0,0 +1,46 @@
+"""add userstats dashboard counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-08-11 09:41:53.220817
+
+Rows are filled in lazily: the first /stats request for a user recounts
+that user, and the periodic reconciliation job recounts everyone.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'userstats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('customers', sa.Integer(), nullable=False),
+        sa.Column('applications', sa.Integer(), nullable=False),
+        sa.Column('licenses_active', sa.Integer(), nullable=False),
+        sa.Column('licenses_expired', sa.Integer(), nullable=False),
+        sa.Column('licenses_suspended', sa.Integer(), nullable=False),
+        sa.Column('licenses_revoked', sa.Integer(), nullable=False),
+        sa.Column('licenses_blocked', sa.Integer(), nullable=False),
+        sa.Column('active_activations', sa.Integer(), nullable=False),
+        sa.Column('expiring_7_days', sa.Integer(), nullable=False),
+        sa.Column('expiring_30_days', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('reconciled_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('userstats')
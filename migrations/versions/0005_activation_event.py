@@ -0,0 +1,68 @@
+"""add monthly partitioned activation_event history
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-08-14 16:27:05.613942
+
+Partitions for the current and next two months are created here; after
+that the API's partition maintenance job keeps them ahead of time and
+drops those past ACTIVATION_EVENT_RETENTION_MONTHS.
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INITIAL_PARTITIONS = 3
+
+
+def _month_start(year: int, month: int) -> datetime:
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activation_event',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.Column('event_type', sa.Enum('VALIDATE', 'ACTIVATE', 'HEARTBEAT', 'DEACTIVATE', name='activationeventtype'), nullable=False),
+        sa.Column('license_key_id', sa.Integer(), nullable=False),
+        sa.Column('activation_id', sa.Integer(), nullable=True),
+        sa.Column('owner_user_id', sa.Integer(), nullable=False),
+        sa.Column('machine_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('ip_address', sqlmodel.sql.sqltypes.AutoString(length=45), nullable=True),
+        sa.PrimaryKeyConstraint('id', 'occurred_at'),
+        postgresql_partition_by='RANGE (occurred_at)'
+    )
+    op.create_index('ix_activation_event_license_key_id_occurred_at', 'activation_event', ['license_key_id', 'occurred_at'], unique=False)
+    op.create_index('ix_activation_event_owner_user_id_occurred_at', 'activation_event', ['owner_user_id', 'occurred_at'], unique=False)
+
+    now = datetime.now(timezone.utc)
+    for offset in range(INITIAL_PARTITIONS):
+        start = _month_start(now.year, now.month + offset)
+        end = _month_start(start.year, start.month + 1)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS activation_event_p{start.year:04d}_{start.month:02d} "
+            f"PARTITION OF activation_event "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    # Dropping the parent drops every partition with it
+    op.drop_index('ix_activation_event_owner_user_id_occurred_at', table_name='activation_event')
+    op.drop_index('ix_activation_event_license_key_id_occurred_at', table_name='activation_event')
+    op.drop_table('activation_event')
+    sa.Enum(name='activationeventtype').drop(op.get_bind(), checkfirst=True)
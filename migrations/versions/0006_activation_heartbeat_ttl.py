@@ -0,0 +1,39 @@
+"""per-application heartbeat ttl and stale activation index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-08-18 11:05:42.390127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('application', sa.Column('heartbeat_ttl_seconds', sa.Integer(), nullable=True))
+
+    # Partial index over active activations only, in last_heartbeat order for the reaper
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_activation_active_last_heartbeat', 'activation', ['last_heartbeat'],
+            postgresql_where=sa.text("status = 'ACTIVE'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_activation_active_last_heartbeat', table_name='activation',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('application', 'heartbeat_ttl_seconds')
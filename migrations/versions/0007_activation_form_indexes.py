@@ -0,0 +1,68 @@
+"""unique request_code and partial indexes for the expiry sweeper
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-08-21 10:48:36.174260
+
+The unique index is built next to the plain one from 0002 and then takes
+over its name, so request_code lookups stay indexed throughout. The build
+fails if duplicate request codes already exist; resolve those first.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns, partial index predicate)
+PARTIAL_INDEXES = [
+    ('ix_activationform_pending_expires_at', 'activationform', ['expires_at'], "status = 'pending'"),
+    ('ix_offlineactivationcode_unused_expires_at', 'offlineactivationcode', ['expires_at'], "NOT is_used"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_activationform_request_code_unique', 'activationform', ['request_code'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_activationform_request_code', table_name='activationform',
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.execute('ALTER INDEX ix_activationform_request_code_unique RENAME TO ix_activationform_request_code')
+
+        for index_name, table_name, columns, predicate in PARTIAL_INDEXES:
+            op.create_index(
+                index_name, table_name, columns,
+                postgresql_where=sa.text(predicate),
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _, _ in reversed(PARTIAL_INDEXES):
+            op.drop_index(
+                index_name, table_name=table_name,
+                postgresql_concurrently=True, if_exists=True
+            )
+
+        op.create_index(
+            'ix_activationform_request_code_plain', 'activationform', ['request_code'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_activationform_request_code', table_name='activationform',
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.execute('ALTER INDEX ix_activationform_request_code_plain RENAME TO ix_activationform_request_code')
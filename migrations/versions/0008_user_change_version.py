@@ -0,0 +1,31 @@
+"""per-user change version for ETags
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-08-26 09:14:27.518934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'userstats',
+        sa.Column('change_version', sa.BigInteger(), nullable=False, server_default='0')
+    )
+    op.add_column('userstats', sa.Column('changed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('userstats', 'changed_at')
+    op.drop_column('userstats', 'change_version')
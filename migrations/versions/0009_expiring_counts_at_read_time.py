@@ -0,0 +1,50 @@
+"""count expiring licenses at read time
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-08-28 14:02:51.730418
+
+The expiring_7_days/expiring_30_days counters were fixed when a row was
+written and drifted as time passed, so /stats now counts them from
+licensekey through a partial index. The columns stay for now with a zero
+default, so code from the previous release can keep writing them during a
+rolling deploy; a later revision drops them.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EXPIRING_COLUMNS = ['expiring_7_days', 'expiring_30_days']
+
+
+def upgrade() -> None:
+    for column in EXPIRING_COLUMNS:
+        op.alter_column('userstats', column, server_default='0')
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_licensekey_active_owner_expires_at', 'licensekey', ['owner_user_id', 'expires_at'],
+            postgresql_where=sa.text("status = 'ACTIVE'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_licensekey_active_owner_expires_at', table_name='licensekey',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+    for column in EXPIRING_COLUMNS:
+        op.alter_column('userstats', column, server_default=None)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark Client Construction - cost of the machine fingerprint in LicenseClient()
+
+Constructs LicenseClient in fresh Python processes, the way a short-lived CLI
+tool does, and within one long-running process, and reports the median
+construction time for:
+
+  before         system information collected on every construction
+                 (the SDK's old behaviour, emulated with compute_fingerprint)
+  process cache  fingerprint computed once per process
+  file cache     fingerprint read from a warm per-user cache file
+
+Imports are not timed. No server is needed (construction makes no requests).
+
+    python scripts/benchmark_client_construction.py
+    python scripts/benchmark_client_construction.py --processes 50 --repeats 200
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+from client_sdk.license_client import LicenseClient
+from client_sdk.utils.machine_fingerprint import MachineFingerprint
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a child process: time the given number of constructions, print each in seconds
+CHILD = """
+import sys, time
+sys.path.insert(0, {root!r})
+from client_sdk.license_client import LicenseClient
+from client_sdk.utils.machine_fingerprint import MachineFingerprint
+if {before!r}:
+    MachineFingerprint.generate_fingerprint = staticmethod(
+        lambda include_mac=True, **kwargs: MachineFingerprint.compute_fingerprint(include_mac))
+for _ in range({repeats}):
+    start = time.perf_counter()
+    LicenseClient("http://localhost:8999", "BenchmarkApp", "1.0.0", fingerprint_cache_path={cache_path!r})
+    print(time.perf_counter() - start)
+"""
+
+
+def fresh_processes(processes: int, before: bool = False, cache_path: str = None) -> list:
+    """First construction in each of several new interpreters"""
+    durations = []
+    for _ in range(processes):
+        code = CHILD.format(root=PROJECT_ROOT, before=before, repeats=1, cache_path=cache_path)
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        durations.append(float(output.split()[0]))
+    return durations
+
+
+def one_process(repeats: int, before: bool = False) -> list:
+    """Repeated constructions in this process"""
+    generate = MachineFingerprint.generate_fingerprint
+    if before:
+        MachineFingerprint.generate_fingerprint = staticmethod(
+            lambda include_mac=True, **kwargs: MachineFingerprint.compute_fingerprint(include_mac))
+    try:
+        durations = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            LicenseClient("http://localhost:8999", "BenchmarkApp", "1.0.0")
+            durations.append(time.perf_counter() - start)
+        return durations
+    finally:
+        MachineFingerprint.generate_fingerprint = generate
+
+
+def row(label: str, durations: list, baseline: list = None) -> str:
+    median = statistics.median(durations)
+    text = f"{label:>32}: median {median * 1000:7.3f}ms   max {max(durations) * 1000:7.3f}ms"
+    if baseline:
+        text += f"   {statistics.median(baseline) / median:5.1f}x faster"
+    return text
+
+
+def benchmark_client_construction(processes: int, repeats: int) -> bool:
+    """Compare LicenseClient construction time with and without fingerprint caching"""
+    print("🏗️  Client Construction Benchmark - machine fingerprint caching")
+    print("=" * 60)
+    print(f"🔁 {processes} fresh processes, {repeats} constructions in one process")
+    print()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "fingerprint.json")
+        MachineFingerprint.generate_fingerprint(cache_path=cache_path, refresh=True)
+
+        print("New process per construction (CLI tools):")
+        before = fresh_processes(processes, before=True)
+        print(row("before", before))
+        print(row("process cache (cold)", fresh_processes(processes), before))
+        warm = fresh_processes(processes, cache_path=cache_path)
+        print(row("file cache (warm)", warm, before))
+        print()
+
+        print("Repeated construction in one process:")
+        before_repeated = one_process(repeats, before=True)
+        print(row("before", before_repeated))
+        after_repeated = one_process(repeats)
+        print(row("process cache", after_repeated, before_repeated))
+
+    ok = statistics.median(warm) < statistics.median(before)
+    ok &= statistics.median(after_repeated) < statistics.median(before_repeated)
+    print()
+    print("🎉 Benchmark complete" if ok else "❌ Caching did not make construction faster")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=20, help="Fresh processes per mode")
+    parser.add_argument("--repeats", type=int, default=100, help="Constructions in one process")
+    args = parser.parse_args()
+
+    if not benchmark_client_construction(args.processes, args.repeats):
+        sys.exit(1)
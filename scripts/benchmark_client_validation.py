@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark Client Validation - SDK validation latency with connection reuse
+
+Times LicenseClient.validate_license(force_refresh=True) through the pooled
+keep-alive session against a new connection per call (module-level
+requests.post, as the SDK used to do), and reports how many TCP connections
+the server saw for each.
+
+By default a stub validation endpoint is served locally on a free port, so
+no database is needed. Pass --server-url and --license-key to measure a
+running license server instead (the connection count is then not reported).
+
+    python scripts/benchmark_client_validation.py
+    python scripts/benchmark_client_validation.py --runs 500
+    python scripts/benchmark_client_validation.py --server-url http://localhost:8999 --license-key XXXX-XXXX-XXXX-XXXX
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import socket
+import statistics
+import threading
+import time
+from datetime import datetime, timezone
+import requests
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from client_sdk.license_client import LicenseClient
+from app.models.database import LicenseStatus
+from app.models.schemas import LicenseValidationRequest, LicenseValidationResponse
+
+FLAKY_KEY = "FLAKY-FLAKY-FLAKY-FLAKY"
+
+
+def build_app(connections: set, failures: dict) -> FastAPI:
+    """Stub of POST /api/v1/validation/ that records each client connection"""
+    app = FastAPI()
+
+    @app.post("/api/v1/validation/", response_model=LicenseValidationResponse)
+    async def validate(body: LicenseValidationRequest, request: Request, response: Response):
+        connections.add((request.client.host, request.client.port))
+        if body.license_key == FLAKY_KEY and failures["remaining"] > 0:
+            failures["remaining"] -= 1
+            response.status_code = 503
+            return LicenseValidationResponse(valid=False, message="Service unavailable")
+        return LicenseValidationResponse(
+            valid=True, license_id=1, customer_id=1, application_id=1, status=LicenseStatus.ACTIVE,
+            expires_at=datetime.now(timezone.utc), features={"export": True}, remaining_activations=2,
+            message="License is valid"
+        )
+
+    return app
+
+
+def start_stub_server(app: FastAPI) -> tuple:
+    """Serve the stub on a free loopback port in a background thread"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def timed(call, runs: int) -> list:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summary(durations: list) -> str:
+    ordered = sorted(durations)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"median {statistics.median(ordered) * 1000:6.2f}ms   p95 {p95 * 1000:6.2f}ms"
+
+
+def benchmark_client_validation(server_url: str, license_key: str, runs: int) -> bool:
+    """Compare validation latency with and without connection reuse"""
+    print("🔌 Client Validation Benchmark - pooled keep-alive session vs new connection per call")
+    print("=" * 60)
+
+    connections, failures = set(), {"remaining": 0}
+    server = None
+    if server_url is None:
+        server, thread, server_url = start_stub_server(build_app(connections, failures))
+        print(f"🧪 Stub validation endpoint at {server_url}")
+    print(f"🔁 {runs} validations per mode, cache bypassed with force_refresh=True")
+    print()
+
+    ok = True
+    try:
+        with LicenseClient(server_url, "BenchmarkApp", "1.0.0") as client:
+            payload = {"license_key": license_key, "machine_id": client.machine_id}
+
+            def new_connection():
+                response = requests.post(f"{server_url}/api/v1/validation/", json=payload, timeout=10)
+                response.raise_for_status()
+
+            def pooled():
+                client.validate_license(license_key, force_refresh=True)
+
+            # Warm up both paths (imports, first connection)
+            new_connection()
+            pooled()
+
+            for label, call in (("new connection per call", new_connection), ("pooled session", pooled)):
+                connections.clear()
+                durations = timed(call, runs)
+                row = f"{label:>24}: {summary(durations)}"
+                if server is not None:
+                    row += f"   {len(connections)} connection(s)"
+                    if label == "pooled session" and len(connections) != 1:
+                        ok = False
+                print(row)
+
+            if server is not None:
+                # Two 503s are retried with backoff and the third attempt succeeds
+                failures["remaining"] = 2
+                client.backoff_factor = 0.05
+                start = time.perf_counter()
+                info = client.validate_license(FLAKY_KEY, force_refresh=True)
+                retried = failures["remaining"] == 0 and info.status.value == "active"
+                ok &= retried
+                print()
+                print(f"{'✅' if retried else '❌'} Validation retried through 2 x 503 "
+                      f"({(time.perf_counter() - start) * 1000:.0f}ms including backoff)")
+    finally:
+        if server is not None:
+            server.should_exit = True
+            thread.join()
+
+    print()
+    print("🎉 Benchmark complete" if ok else "❌ Connections were not reused or retried as expected")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server-url", help="Running license server (default: local stub)")
+    parser.add_argument("--license-key", help="License key to validate on --server-url")
+    parser.add_argument("--runs", type=int, default=200, help="Validations per mode")
+    args = parser.parse_args()
+
+    if args.server_url and not args.license_key:
+        parser.error("--license-key is required with --server-url")
+
+    if not benchmark_client_validation(args.server_url, args.license_key or "BENCH-BENCH-BENCH-BENCH", args.runs):
+        sys.exit(1)
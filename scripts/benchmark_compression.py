@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark Compression - bandwidth and latency of compressed list responses
+
+Serves license lists (include_relations=True shaped) and a validation
+response through CompressionMiddleware in-process and reports, per list size
+and coding:
+
+  bytes    response size on the wire
+  server   time spent producing the response (JSON + compression)
+  link     total time including transfer over a slow and a typical link
+
+and the longest event-loop stall while the largest list is compressed
+inline compared with in worker threads.
+
+No database server is needed.
+
+    python scripts/benchmark_compression.py
+    python scripts/benchmark_compression.py --sizes 100 1000 --runs 50
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+import httpx
+from fastapi import FastAPI
+from app.core.compression import CompressionMiddleware, brotli, compress
+from app.models.database import LicenseStatus
+from app.models.schemas import (
+    ApplicationResponse, CustomerResponse, LicenseKeyGenerator, LicenseKeyWithRelationsResponse,
+    LicenseValidationResponse
+)
+
+# Link speeds in bits per second, with a round trip added once per response
+LINKS = {"2 Mbit/s, 150ms": (2_000_000, 0.150), "20 Mbit/s, 40ms": (20_000_000, 0.040)}
+FEATURES = ["export", "sso", "audit_log", "api_access", "priority_support", "custom_branding"]
+
+
+def sample_licenses(count: int) -> list:
+    """License list rows with their customer and application, like include_relations=True"""
+    rng = random.Random(count)
+    now = datetime.now(timezone.utc)
+    applications = [
+        ApplicationResponse(
+            id=i, name=f"Product {i}", version=f"{rng.randint(1, 9)}.{rng.randint(0, 20)}.0",
+            description=f"Desktop suite edition {i}", features={"tier": rng.choice(["basic", "pro", "enterprise"])},
+            created_at=now - timedelta(days=400)
+        )
+        for i in range(1, 11)
+    ]
+    customers = [
+        CustomerResponse(
+            id=i, name=f"Customer {i}", email=f"customer{i}@example.com", company=f"Company {i % 37} Ltd",
+            created_at=now - timedelta(days=rng.randint(1, 365))
+        )
+        for i in range(1, max(count // 5, 1) + 1)
+    ]
+    licenses = []
+    for i in range(1, count + 1):
+        customer, application = rng.choice(customers), rng.choice(applications)
+        licenses.append(LicenseKeyWithRelationsResponse(
+            id=i, license_key=LicenseKeyGenerator.generate_key(), customer_id=customer.id,
+            application_id=application.id, status=LicenseStatus.ACTIVE,
+            expires_at=now + timedelta(days=rng.randint(1, 730)), max_activations=rng.randint(1, 10),
+            current_activations=rng.randint(0, 3),
+            features={feature: True for feature in rng.sample(FEATURES, 3)},
+            notes=None, created_at=now - timedelta(days=rng.randint(1, 365)), updated_at=now,
+            customer=customer, application=application
+        ))
+    return licenses
+
+
+def build_app(lists: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/licenses/{size}", response_model=list[LicenseKeyWithRelationsResponse])
+    async def licenses(size: int):
+        return lists[size]
+
+    @app.post("/api/v1/validation/validate", response_model=LicenseValidationResponse)
+    async def validate():
+        return LicenseValidationResponse(
+            valid=True, license_id=1, customer_id=1, application_id=1, status=LicenseStatus.ACTIVE,
+            expires_at=datetime.now(timezone.utc), features={"export": True}, remaining_activations=2,
+            message="License is valid"
+        )
+
+    app.add_middleware(CompressionMiddleware, excluded_paths=["/api/v1/validation"])
+    return app
+
+
+async def measure(client: httpx.AsyncClient, method: str, path: str, encoding: str, runs: int) -> dict:
+    """Median server time and wire size for one request shape"""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        async with client.stream(method, path, headers={"Accept-Encoding": encoding}) as response:
+            # Raw bytes as sent, without the client decoding them
+            size = sum([len(chunk) async for chunk in response.aiter_raw()])
+        durations.append(time.perf_counter() - start)
+        applied = response.headers.get("content-encoding", "identity")
+    return {"server": statistics.median(durations), "bytes": size, "applied": applied}
+
+
+async def event_loop_stall(work) -> float:
+    """Longest gap between 1ms ticks while work() runs on the loop"""
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    await work()
+    done.set()
+    await task
+    return max(stalls)
+
+
+async def compression_stalls(body: bytes, encoding: str) -> tuple:
+    """Loop stall compressing a body inline vs in a worker thread (as the middleware does)"""
+    async def inline():
+        compress(body, encoding)
+
+    async def threaded():
+        await asyncio.to_thread(compress, body, encoding)
+
+    return await event_loop_stall(inline), await event_loop_stall(threaded)
+
+
+def link_seconds(result: dict, link: tuple) -> float:
+    bits_per_second, round_trip = link
+    return result["server"] + round_trip + result["bytes"] * 8 / bits_per_second
+
+
+async def run(sizes: list, runs: int) -> bool:
+    lists = {size: sample_licenses(size) for size in sizes}
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    transport = httpx.ASGITransport(app=build_app(lists))
+    ok = True
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        header = f"{'licenses':>8} {'coding':>8} {'bytes':>10} {'server':>9}"
+        header += "".join(f" {name:>18}" for name in LINKS)
+        print(header)
+        for size in sizes:
+            path = f"/api/v1/licenses/{size}"
+            for encoding in encodings:
+                result = await measure(client, "GET", path, encoding, runs)
+                if encoding != "identity" and result["applied"] != encoding:
+                    ok = False
+                row = f"{size:>8} {result['applied']:>8} {result['bytes']:>10,} {result['server'] * 1000:>7.2f}ms"
+                row += "".join(f" {link_seconds(result, link) * 1000:>16.1f}ms" for link in LINKS.values())
+                print(row)
+            print()
+
+        body = (await client.get(f"/api/v1/licenses/{sizes[-1]}", headers={"Accept-Encoding": "identity"})).content
+        for encoding in encodings[1:]:
+            inline, threaded = await compression_stalls(body, encoding)
+            print(f"⏸️  Longest event-loop stall compressing {len(body):,} bytes with {encoding}: "
+                  f"{inline * 1000:.1f}ms inline, {threaded * 1000:.1f}ms in a worker thread")
+
+        validation = await measure(client, "POST", "/api/v1/validation/validate", "gzip, br", runs)
+        if validation["applied"] != "identity":
+            ok = False
+        print(f"🔑 Validation response: {validation['bytes']} bytes, sent as {validation['applied']} "
+              f"({validation['server'] * 1000:.2f}ms)")
+    return ok
+
+
+def benchmark_compression(sizes: list, runs: int) -> bool:
+    """Report wire size and latency of list responses for each coding"""
+    print("🗜️  Compression Benchmark - license lists with relations")
+    print("=" * 60)
+    if brotli is None:
+        print("⚠️  brotli is not installed; only gzip is measured")
+    print(f"🔁 Median of {runs} requests per row; link time = server + round trip + bytes / bandwidth")
+    print()
+
+    ok = asyncio.run(run(sizes, runs))
+    print()
+    print("🎉 Benchmark complete" if ok else "❌ Compression was not applied as expected")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000], help="License list sizes")
+    parser.add_argument("--runs", type=int, default=20, help="Requests per measurement")
+    args = parser.parse_args()
+
+    if not benchmark_compression(args.sizes, args.runs):
+        sys.exit(1)
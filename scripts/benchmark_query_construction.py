@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark Query Construction - per-request statement overhead before and after caching
+
+Compares the inline select() the services used to build on every call with
+the lambda statements they use now, for the lookups that run on every
+validation or authenticated request. Two numbers per lookup:
+
+  build   constructing the statement and its cache key (what the engine does
+          before it can look the compiled SQL up in its cache)
+  execute a full session.execute() round trip against in-memory SQLite, so
+          the saving can be seen next to the rest of the per-query cost
+
+No database server is needed.
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from sqlmodel import Session, SQLModel, create_engine, select
+from app.models.database import (
+    APIToken, Application, Customer, LicenseKey, LicenseStatus, Session as DBSession, User
+)
+from app.services.auth_service import api_token_by_hash_statement, session_by_token_statement
+from app.services.license_service import (
+    license_by_hash_statement, owned_license_by_hash_statement, owned_license_statement
+)
+
+ITERATIONS = 20000
+ROWS = 200
+
+
+def lookups():
+    """(description, inline select() builder, lambda statement builder) for each hot lookup"""
+    return [
+        ("License by key hash",
+         lambda i: select(LicenseKey).where(LicenseKey.key_hash == key_hash(i)),
+         lambda i: license_by_hash_statement(key_hash(i))),
+        ("Owned license by id",
+         lambda i: select(LicenseKey).where(LicenseKey.id == i % ROWS + 1, LicenseKey.owner_user_id == 1),
+         lambda i: owned_license_statement(i % ROWS + 1, 1)),
+        ("Owned license by key hash",
+         lambda i: select(LicenseKey).where(LicenseKey.key_hash == key_hash(i), LicenseKey.owner_user_id == 1),
+         lambda i: owned_license_by_hash_statement(key_hash(i), 1)),
+        ("Session by token hash",
+         lambda i: select(DBSession).where(DBSession.session_token == token_hash(i), DBSession.is_revoked == False),
+         lambda i: session_by_token_statement(token_hash(i))),
+        ("API token by hash",
+         lambda i: select(APIToken).where(APIToken.token_hash == token_hash(i), APIToken.is_active == True),
+         lambda i: api_token_by_hash_statement(token_hash(i))),
+    ]
+
+
+def key_hash(i: int) -> str:
+    return hashlib.sha256(f"key{i % ROWS}".encode()).hexdigest()
+
+
+def token_hash(i: int) -> str:
+    return hashlib.sha256(f"token{i % ROWS}".encode()).hexdigest()
+
+
+def seed(engine) -> None:
+    """Create the tables the lookups touch and fill them with a few rows"""
+    tables = [model.__table__ for model in (User, Customer, Application, LicenseKey, DBSession, APIToken)]
+    SQLModel.metadata.create_all(engine, tables=tables)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with Session(engine) as db:
+        db.add(User(username="bench", email="bench@example.com", full_name="Bench", password_hash="x"))
+        db.add(Customer(name="Customer", email="customer@example.com", user_id=1))
+        db.add(Application(name="App", version="1.0.0", user_id=1))
+        for i in range(ROWS):
+            db.add(LicenseKey(
+                key_hash=key_hash(i), customer_id=1, application_id=1, owner_user_id=1,
+                status=LicenseStatus.ACTIVE, max_activations=1
+            ))
+            db.add(DBSession(user_id=1, session_token=token_hash(i), expires_at=now + timedelta(hours=1)))
+            db.add(APIToken(name=f"token {i}", token_hash=token_hash(i), scopes="[]", user_id=1))
+        db.commit()
+
+
+def per_call_us(work, iterations: int) -> float:
+    """Mean microseconds per call of work(i)"""
+    for i in range(min(iterations, 500)):
+        work(i)
+    start = time.perf_counter()
+    for i in range(iterations):
+        work(i)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def benchmark_query_construction() -> bool:
+    """Time statement construction and execution for inline selects against lambda statements"""
+    print("⏱️  Query Construction Benchmark - inline select() vs lambda statements")
+    print("=" * 60)
+
+    engine = create_engine("sqlite://")
+    seed(engine)
+    print(f"🌱 Seeded {ROWS} licenses, sessions and API tokens; {ITERATIONS} iterations per lookup")
+    print()
+
+    ok = True
+    with Session(engine) as db:
+        for description, inline, cached in lookups():
+            # Both builders must find the same row
+            if db.execute(inline(7)).scalars().first().id != db.execute(cached(7)).scalars().first().id:
+                ok = False
+                print(f"❌ {description}: lambda statement returned a different row")
+                continue
+
+            build_before = per_call_us(lambda i: inline(i)._generate_cache_key(), ITERATIONS)
+            build_after = per_call_us(lambda i: cached(i)._generate_cache_key(), ITERATIONS)
+            execute_before = per_call_us(lambda i: db.execute(inline(i)).scalars().first(), ITERATIONS // 4)
+            execute_after = per_call_us(lambda i: db.execute(cached(i)).scalars().first(), ITERATIONS // 4)
+            db.expunge_all()
+
+            print(f"🔍 {description}")
+            print(f"   build:   {build_before:7.1f}µs -> {build_after:7.1f}µs "
+                  f"({build_before / build_after:.1f}x)")
+            print(f"   execute: {execute_before:7.1f}µs -> {execute_after:7.1f}µs "
+                  f"(saves {execute_before - execute_after:.1f}µs per request)")
+
+    engine.dispose()
+    print()
+    print("🎉 Benchmark complete" if ok else "❌ Benchmark found mismatched results")
+    return ok
+
+
+if __name__ == "__main__":
+    if not benchmark_query_construction():
+        sys.exit(1)
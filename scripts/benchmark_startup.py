@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark Startup - cold import and lifespan durations of app.main
+
+Each run is a fresh interpreter, so imports are measured cold. Import time
+is reported separately from the lifespan startup (PostgreSQL readiness,
+schema revision check, background jobs) and shutdown, which need the
+database to be reachable.
+
+    python scripts/benchmark_startup.py            # 5 runs
+    python scripts/benchmark_startup.py --runs 10 --imports
+"""
+import sys
+import os
+
+# Add the project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import time
+
+# Modules that should only load on demand
+LAZY_MODULES = ["strawberry", "alembic", "app.scripts.db_management", "app.graphql"]
+
+
+def measure_once() -> dict:
+    """Import app.main and run its lifespan once (in this fresh interpreter)"""
+    start = time.perf_counter()
+    from app.main import app
+    import_seconds = time.perf_counter() - start
+    eager = [name for name in LAZY_MODULES if name in sys.modules]
+
+    async def run_lifespan() -> dict:
+        context = app.router.lifespan_context(app)
+        start = time.perf_counter()
+        await context.__aenter__()
+        startup = time.perf_counter() - start
+        start = time.perf_counter()
+        await context.__aexit__(None, None, None)
+        return {"startup_seconds": startup, "shutdown_seconds": time.perf_counter() - start}
+
+    result = {"import_seconds": import_seconds, "eager_modules": eager}
+    try:
+        result.update(asyncio.run(run_lifespan()))
+    except Exception as e:
+        result["lifespan_error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run_child(extra_args: list = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *(extra_args or []), os.path.abspath(__file__), "--child"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+
+
+def slowest_imports(count: int = 10) -> list:
+    """(cumulative seconds, module) of the slowest imports under app.main"""
+    stderr = run_child(["-X", "importtime"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative) / 1_000_000, module))
+    return sorted(rows, reverse=True)[:count]
+
+
+def benchmark_startup(runs: int, show_imports: bool) -> bool:
+    """Run cold starts and report median import, startup and shutdown durations"""
+    print("🚀 Startup Benchmark - cold import vs lifespan")
+    print("=" * 60)
+
+    results = []
+    for _ in range(runs):
+        child = run_child()
+        if child.returncode != 0 or not child.stdout.strip():
+            print(f"❌ Run failed:\n{child.stderr[-2000:]}")
+            return False
+        results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    def report(label: str, key: str) -> None:
+        values = [result[key] for result in results if key in result]
+        if values:
+            print(f"⏱️  {label:<18} median {statistics.median(values) * 1000:8.1f}ms  "
+                  f"min {min(values) * 1000:8.1f}ms  max {max(values) * 1000:8.1f}ms")
+
+    print(f"🔁 {runs} cold runs")
+    report("import app.main", "import_seconds")
+    report("lifespan startup", "startup_seconds")
+    report("lifespan shutdown", "shutdown_seconds")
+
+    ok = True
+    errors = {result["lifespan_error"] for result in results if "lifespan_error" in result}
+    for error in errors:
+        ok = False
+        print(f"❌ Lifespan failed: {error}")
+
+    eager = set().union(*(result["eager_modules"] for result in results))
+    if eager:
+        ok = False
+        print(f"❌ Optional modules imported at startup: {', '.join(sorted(eager))}")
+    else:
+        print(f"✅ Not imported at startup: {', '.join(LAZY_MODULES)}")
+
+    if show_imports:
+        print()
+        print("📦 Slowest imports (cumulative)")
+        for seconds, module in slowest_imports():
+            print(f"   {seconds * 1000:8.1f}ms  {module}")
+
+    print()
+    print("🎉 Startup benchmark complete" if ok else "❌ Startup benchmark found problems")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure")
+    parser.add_argument("--imports", action="store_true", help="List the slowest imports")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        sys.exit(0)
+    if not benchmark_startup(args.runs, args.imports):
+        sys.exit(1)
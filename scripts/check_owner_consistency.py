@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Check (and optionally repair) the denormalized owner_user_id columns.
+
+licensekey.owner_user_id must match the owning customer's user (or the
+application's user for licenses without a customer), and
+activation.owner_user_id must match its license's owner.
+
+Usage:
+    python scripts/check_owner_consistency.py          # report only
+    python scripts/check_owner_consistency.py --fix    # report and repair
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.database.connection import engine
+
+# Expected owner for each license
+LICENSE_OWNER_SQL = """
+    COALESCE(
+        (SELECT c.user_id FROM customer c WHERE c.id = lk.customer_id),
+        (SELECT a.user_id FROM application a WHERE a.id = lk.application_id)
+    )
+"""
+
+CHECKS = {
+    "licensekey": {
+        "count": f"""
+            SELECT count(*) FROM licensekey lk
+            WHERE lk.owner_user_id IS DISTINCT FROM {LICENSE_OWNER_SQL}
+        """,
+        "fix": f"""
+            UPDATE licensekey lk SET owner_user_id = {LICENSE_OWNER_SQL}
+            WHERE lk.owner_user_id IS DISTINCT FROM {LICENSE_OWNER_SQL}
+        """,
+    },
+    "activation": {
+        "count": """
+            SELECT count(*) FROM activation act
+            JOIN licensekey lk ON lk.id = act.license_key_id
+            WHERE act.owner_user_id IS DISTINCT FROM lk.owner_user_id
+        """,
+        "fix": """
+            UPDATE activation act SET owner_user_id = lk.owner_user_id
+            FROM licensekey lk
+            WHERE lk.id = act.license_key_id
+            AND act.owner_user_id IS DISTINCT FROM lk.owner_user_id
+        """,
+    },
+}
+
+
+def check_owner_consistency(fix: bool = False) -> int:
+    """Report mismatched owner_user_id rows, repairing them if requested"""
+    mismatched = 0
+    with engine.begin() as conn:
+        # Licenses first: activation owners are derived from license owners
+        for table_name, check in CHECKS.items():
+            count = conn.execute(text(check["count"])).scalar()
+            mismatched += count
+            if not count:
+                print(f"✅ {table_name}: owner_user_id consistent")
+                continue
+
+            print(f"⚠️  {table_name}: {count} rows with a stale owner_user_id")
+            if fix:
+                repaired = conn.execute(text(check["fix"])).rowcount
+                print(f"   🔧 Repaired {repaired} rows")
+    return mismatched
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check denormalized owner_user_id columns")
+    parser.add_argument("--fix", action="store_true", help="Repair mismatched rows")
+    args = parser.parse_args()
+
+    print("🔍 Checking owner_user_id consistency...")
+    mismatched = check_owner_consistency(fix=args.fix)
+    if mismatched and not args.fix:
+        print("\nRun with --fix to repair")
+        sys.exit(1)
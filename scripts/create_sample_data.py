@@ -279,7 +279,8 @@ def create_user_data(user_data: dict, user: User, session: Session):
                                 max_activations=license_data.get("max_activations", 1),
                                 features=json.dumps(license_data.get("features", {})),
                                 notes=license_data.get("notes", ""),
-                                status=LicenseStatus.ACTIVE
+                                status=LicenseStatus.ACTIVE,
+                                owner_user_id=user.id
                             )
                             
                             session.add(db_license)
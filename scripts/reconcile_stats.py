@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Recount the per-user dashboard counters and report any drift.
+
+The API recounts periodically (STATS_RECONCILE_INTERVAL_SECONDS); run this
+after bulk imports or manual SQL to bring the counters back in line at once.
+
+Usage:
+    python scripts/reconcile_stats.py              # every user
+    python scripts/reconcile_stats.py --user-id 7  # one user
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, select
+from app.database.connection import engine
+from app.models.database import UserStats
+from app.services.stats_service import StatsService
+
+COUNTERS = [
+    "customers", "applications",
+    "licenses_active", "licenses_expired", "licenses_suspended", "licenses_revoked", "licenses_blocked",
+    "active_activations",
+]
+
+
+def snapshot(db: Session, user_id=None) -> dict:
+    """Current counters keyed by user id"""
+    statement = select(UserStats)
+    if user_id is not None:
+        statement = statement.where(UserStats.user_id == user_id)
+    return {
+        stats.user_id: {column: getattr(stats, column) for column in COUNTERS}
+        for stats in db.exec(statement).all()
+    }
+
+
+def reconcile_stats(user_id=None) -> int:
+    """Recount counters and print every value that changed"""
+    with Session(engine) as db:
+        before = snapshot(db, user_id)
+        recounted = StatsService(db).reconcile(user_id=user_id)
+        if user_id is None and not recounted:
+            print("⚠️  Another worker is reconciling right now, try again shortly")
+            return 0
+        after = snapshot(db, user_id)
+
+    drifted = 0
+    for uid, counters in sorted(after.items()):
+        previous = before.get(uid)
+        if previous is None:
+            print(f"🆕 user {uid}: counters created")
+            continue
+        changes = {
+            column: (previous[column], value)
+            for column, value in counters.items()
+            if previous[column] != value
+        }
+        if changes:
+            drifted += 1
+            detail = ", ".join(f"{column} {old} → {new}" for column, (old, new) in changes.items())
+            print(f"🔧 user {uid}: {detail}")
+
+    print(f"✅ Recounted {recounted} users, {drifted} had drifted")
+    return drifted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recount per-user dashboard counters")
+    parser.add_argument("--user-id", type=int, help="Only recount this user")
+    args = parser.parse_args()
+
+    print("📊 Reconciling dashboard counters...")
+    reconcile_stats(user_id=args.user_id)
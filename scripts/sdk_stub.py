@@ -0,0 +1,100 @@
+"""
+Stub license server for the client SDK test scripts
+
+StubServer answers validation and heartbeat requests in process. stub_session()
+and stub_async_session() return a requests.Session and an httpx.AsyncClient
+that send every request to it, so LicenseClient and AsyncLicenseClient can be
+exercised without a running server.
+"""
+import asyncio
+import json
+import time
+from typing import Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed by stub_async_session
+    httpx = None
+
+VALIDATION_PATH = "/api/v1/validation/"
+HEARTBEAT_PATH = "/api/v1/validation/heartbeat"
+
+
+class StubServer:
+    """Validation and heartbeat endpoints reporting status; set down to answer 500,
+    unreachable to refuse connections and delay to slow every request down"""
+
+    def __init__(self, status: str = "active"):
+        self.status = status
+        self.down = False
+        self.unreachable = False
+        self.delay = 0.0
+        self.request_times = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.request_times)
+
+    def respond(self, path: str) -> Optional[Tuple[int, dict]]:
+        """Record a request and answer it with a status code and body (None while unreachable);
+        the transports wait delay seconds before passing the answer on"""
+        self.request_times.append(time.perf_counter())
+        if self.unreachable:
+            return None
+        if path not in (VALIDATION_PATH, HEARTBEAT_PATH):
+            return 404, {"detail": "Not Found"}
+        if self.down:
+            return 500, {"detail": "Internal Server Error"}
+        body = {"valid": self.status == "active", "license_id": 1, "status": self.status,
+                "message": f"License is {self.status}"}
+        if path == VALIDATION_PATH:
+            body.update({"customer_id": 1, "application_id": 1, "expires_at": None,
+                         "features": {"export": True}, "remaining_activations": 2,
+                         "message": f"License is {self.status} ({self.calls})"})
+        return 200, body
+
+
+class StubAdapter(HTTPAdapter):
+    """Transport adapter sending every requests call to a StubServer"""
+
+    def __init__(self, server: StubServer):
+        super().__init__()
+        self.server = server
+
+    def send(self, request, **kwargs):
+        answer = self.server.respond(request.path_url)
+        time.sleep(self.server.delay)
+        if answer is None:
+            raise requests.ConnectionError("Connection refused", request=request)
+        status_code, body = answer
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(body).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.request = request
+        response.url = request.url
+        return response
+
+
+def stub_session(server: Optional[StubServer] = None) -> Tuple[requests.Session, StubServer]:
+    """A requests session answered by server (a new one if not given)"""
+    server = server or StubServer()
+    session = requests.Session()
+    session.mount("http://", StubAdapter(server))
+    return session, server
+
+
+def stub_async_session(server: StubServer) -> "httpx.AsyncClient":
+    """An httpx client answered by server; delays are awaited, not slept"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        answer = server.respond(request.url.path)
+        await asyncio.sleep(server.delay)
+        if answer is None:
+            raise httpx.ConnectError("Connection refused", request=request)
+        status_code, body = answer
+        return httpx.Response(status_code, json=body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
@@ -76,7 +76,8 @@ def create_test_license():
             max_activations=1,
             features='{"basic_features": true, "advanced_features": true, "premium_support": true}',
             notes="Test license for development",
-            status="active"
+            status="active",
+            owner_user_id=customer.user_id
         )
         
         session.add(db_license)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test Activation Events - monthly partitions, batched inserts and retention
+
+Works in a throwaway schema: creates the partitioned table, writes a batch
+of events through the buffer, checks they were routed to the right monthly
+partitions, then drops expired partitions with the retention job. Partition
+changes are skipped while another worker holds the maintenance lock. A flush
+that finds no partition for the current month creates it and retries, and a
+row the database rejects is dropped on its own without losing its batch.
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timezone
+from sqlalchemy import event, text
+from sqlmodel import Session
+from app.database.connection import engine
+from app.models.database import ActivationEvent, ActivationEventType
+from app.services.activation_event_service import (
+    PARTITION_LOCK_SQL, ActivationEventBuffer, ActivationEventService, month_start, partition_name
+)
+
+SCHEMA = "activation_event_check"
+EVENTS = 1200
+BATCH_SIZE = 500
+
+
+def make_event(i: int, occurred_at: datetime) -> dict:
+    return {
+        "occurred_at": occurred_at,
+        "event_type": ActivationEventType.HEARTBEAT,
+        "license_key_id": i % 50 + 1,
+        "owner_user_id": 1,
+        "machine_id": f"machine-{i}",
+        "activation_id": None,
+        "ip_address": "127.0.0.1",
+    }
+
+
+def check_failed_batches(now: datetime) -> bool:
+    """A missing partition is created on retry, and a bad row only loses itself"""
+    ok = True
+    current = partition_name(month_start(now.year, now.month))
+    with Session(engine) as db:
+        db.execute(text(f"ALTER TABLE activation_event DETACH PARTITION {current}"))
+        db.execute(text(f"DROP TABLE {current}"))
+        db.commit()
+
+    buffer = ActivationEventBuffer(batch_size=BATCH_SIZE)
+    for i in range(100):
+        buffer.add(make_event(i, now))
+    with Session(engine) as db:
+        written = buffer.flush(db)
+    with Session(engine) as db:
+        recreated = current in ActivationEventService(db).list_partitions()
+    if written == 100 and recreated:
+        print(f"✅ A flush with no partition for this month created {current} and wrote all 100 events")
+    else:
+        ok = False
+        print(f"❌ Wrote {written} of 100 events without a partition (recreated={recreated})")
+
+    # Ten years out is past every partition the maintenance job creates
+    for i in range(100):
+        buffer.add(make_event(i, month_start(now.year + 10, now.month) if i == 37 else now))
+    with Session(engine) as db:
+        written = buffer.flush(db)
+    if written == 99 and len(buffer) == 0:
+        print("✅ A row outside every partition was dropped on its own, the other 99 were written")
+    else:
+        ok = False
+        print(f"❌ Wrote {written} of 99 valid events alongside a bad row")
+    return ok
+
+
+def test_activation_events() -> bool:
+    """Exercise partition creation, batched flushes and retention in a scratch schema"""
+    print("🗂️  Activation Event Test - partitions, batching and retention")
+    print("=" * 60)
+
+    # Every pooled connection used by the buffer must see the scratch schema
+    @event.listens_for(engine, "connect")
+    def use_scratch_schema(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.close()
+
+    engine.dispose()
+    ok = True
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            ActivationEvent.__table__.create(conn)
+
+        now = datetime.now(timezone.utc)
+        with Session(engine) as db:
+            service = ActivationEventService(db)
+            created = service.ensure_partitions(months_ahead=2)
+            print(f"✅ Created partitions: {', '.join(created)}")
+
+            # An old partition well past any sensible retention window
+            old_start = month_start(now.year, now.month - 24)
+            old_end = month_start(old_start.year, old_start.month + 1)
+            db.execute(text(
+                f"CREATE TABLE {partition_name(old_start)} PARTITION OF activation_event "
+                f"FOR VALUES FROM ('{old_start.isoformat()}') TO ('{old_end.isoformat()}')"
+            ))
+            db.commit()
+
+        # Count INSERT round trips while flushing
+        inserts = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("INSERT INTO ACTIVATION_EVENT"):
+                inserts.append(statement)
+
+        buffer = ActivationEventBuffer(batch_size=BATCH_SIZE)
+        for i in range(EVENTS):
+            buffer.add(make_event(i, now))
+        with Session(engine) as db:
+            written = buffer.flush(db)
+        event.remove(engine, "before_cursor_execute", count_inserts)
+
+        if written == EVENTS:
+            print(f"✅ Flushed {written} events in {len(inserts)} INSERT statements")
+        else:
+            ok = False
+            print(f"❌ Flushed {written} of {EVENTS} events")
+
+        with Session(engine) as db:
+            current = partition_name(month_start(now.year, now.month))
+            routed = db.execute(text(f"SELECT count(*) FROM {current}")).scalar()
+            if routed == EVENTS:
+                print(f"✅ All events routed to {current}")
+            else:
+                ok = False
+                print(f"❌ {routed} events in {current}, expected {EVENTS}")
+
+            service = ActivationEventService(db)
+            # Another worker holding the maintenance lock makes this one skip
+            with engine.connect() as other_worker:
+                other_worker.execute(text(PARTITION_LOCK_SQL))
+                skipped = service.drop_expired_partitions(retention_months=12)
+                other_worker.rollback()
+            if skipped == [] and partition_name(old_start) in service.list_partitions():
+                print("✅ Retention skips while another worker holds the partition lock")
+            else:
+                ok = False
+                print(f"❌ Retention dropped {skipped} while the partition lock was held")
+
+            dropped = service.drop_expired_partitions(retention_months=12)
+            remaining = service.list_partitions()
+            if dropped == [partition_name(old_start)] and current in remaining:
+                print(f"✅ Retention dropped {', '.join(dropped)}, kept {len(remaining)} partitions")
+            else:
+                ok = False
+                print(f"❌ Retention dropped {dropped}, remaining {remaining}")
+
+        ok &= check_failed_batches(now)
+    finally:
+        event.remove(engine, "connect", use_scratch_schema)
+        engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print()
+    print("🎉 Activation event history works" if ok else "❌ Activation event test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_activation_events():
+        sys.exit(1)
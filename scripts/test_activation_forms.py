@@ -12,6 +12,7 @@ import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from client_sdk.utils.machine_fingerprint import MachineFingerprint
+from app.utils.test_users import get_braden_api_token
 
 # Configuration
 BASE_URL = "http://localhost:8999/api/v1"
@@ -63,10 +64,11 @@ def test_activation_forms_workflow():
                 "quantity": 3
             }
             
+            # Generating codes needs a token with license write scope for the license's owner
             offline_response = requests.post(
                 f"{BASE_URL}/activation-forms/offline-codes",
                 json=offline_codes_data,
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json", "Authorization": f"Bearer {get_braden_api_token()}"}
             )
             
             if offline_response.status_code == 200:
@@ -198,6 +200,25 @@ def test_error_scenarios():
     print("(This would require manual database manipulation to test)")
     print()
 
+    # Test 4: Listing forms needs the activation read scope and only shows your licenses' forms
+    print("Test 4: Listing Activation Forms")
+    print("-" * 30)
+
+    try:
+        response = requests.get(f"{BASE_URL}/activation-forms/", params={"status": "pending"})
+        print(f"Without a token: {response.status_code} (expected 401)")
+
+        response = requests.get(
+            f"{BASE_URL}/activation-forms/",
+            params={"status": "pending"},
+            headers={"Authorization": f"Bearer {get_braden_api_token()}"}
+        )
+        print(f"With a token: {response.status_code}, {len(response.json())} of your pending forms")
+        print()
+
+    except Exception as e:
+        print(f"Error: {e}")
+
 def show_usage_examples():
     """Show how clients would use activation forms"""
     print("\n📖 Client Usage Examples")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test Async Client - AsyncLicenseClient concurrency and request coalescing
+
+Runs AsyncLicenseClient against a stub validation endpoint served in-process
+through httpx's ASGI transport and checks that:
+- asyncio.gather over many keys validates them concurrently
+- duplicate in-flight validations of a key share one request
+- cancelling one waiter does not cancel the shared request
+- cached results and 503 retries behave like LicenseClient
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timezone
+import httpx
+from fastapi import FastAPI, Response
+from client_sdk.license_client import AsyncLicenseClient, LicenseStatus
+from app.models.database import LicenseStatus as ServerLicenseStatus
+from app.models.schemas import LicenseValidationRequest, LicenseValidationResponse
+
+SERVER_DELAY = 0.05
+
+
+def build_app(requests_seen: Counter, failures: dict) -> FastAPI:
+    """Stub of POST /api/v1/validation/ that counts requests per key"""
+    app = FastAPI()
+
+    @app.post("/api/v1/validation/", response_model=LicenseValidationResponse)
+    async def validate(body: LicenseValidationRequest, response: Response):
+        requests_seen[body.license_key] += 1
+        await asyncio.sleep(SERVER_DELAY)
+        if failures.get(body.license_key, 0) > 0:
+            failures[body.license_key] -= 1
+            response.status_code = 503
+            return LicenseValidationResponse(valid=False, message="Service unavailable")
+        return LicenseValidationResponse(
+            valid=True, license_id=1, customer_id=1, application_id=1, status=ServerLicenseStatus.ACTIVE,
+            expires_at=datetime.now(timezone.utc), features={"key": body.license_key, "export": True},
+            remaining_activations=2, message="License is valid"
+        )
+
+    return app
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+async def check_async_client() -> bool:
+    requests_seen, failures = Counter(), {}
+    session = httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app(requests_seen, failures)))
+    ok = True
+    async with AsyncLicenseClient("http://stub", "AsyncTestApp", "1.0.0", backoff_factor=0.01,
+                                  session=session) as client:
+        # 20 keys, each asked for 10 times at once
+        keys = [f"KEY{i:02d}-AAAA-BBBB-CCCC" for i in range(20)]
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client.validate_license(key) for key in keys * 10))
+        elapsed = time.perf_counter() - start
+        ok &= report("Every validation returns its own key's result",
+                     all(info.features["key"] == key for info, key in zip(results, keys * 10)))
+        ok &= report("Duplicate in-flight validations are coalesced",
+                     sum(requests_seen.values()) == len(keys), f"{sum(requests_seen.values())} requests for 200 calls")
+        ok &= report("Keys are validated concurrently", elapsed < SERVER_DELAY * 5,
+                     f"{elapsed * 1000:.0f}ms for {len(keys)} x {SERVER_DELAY * 1000:.0f}ms requests")
+        ok &= report("Nothing is left in flight", not client._in_flight)
+
+        # Served from the cache without a request
+        requests_seen.clear()
+        await client.validate_license(keys[0])
+        ok &= report("Cached results are reused", not requests_seen)
+
+        # A cancelled waiter leaves the shared request running for the others
+        requests_seen.clear()
+        first = asyncio.ensure_future(client.validate_license(keys[1], force_refresh=True))
+        second = asyncio.ensure_future(client.validate_license(keys[1], force_refresh=True))
+        await asyncio.sleep(SERVER_DELAY / 5)
+        first.cancel()
+        info = await second
+        ok &= report("Cancelling one waiter does not cancel the shared request",
+                     first.cancelled() and info.status == LicenseStatus.ACTIVE and requests_seen[keys[1]] == 1)
+
+        # Transient 503s are retried
+        failures["FLAKY-AAAA-BBBB-CCCC"] = 2
+        info = await client.validate_license("FLAKY-AAAA-BBBB-CCCC")
+        ok &= report("503 responses are retried", info.status == LicenseStatus.ACTIVE,
+                     f"{requests_seen['FLAKY-AAAA-BBBB-CCCC']} attempts")
+
+        ok &= report("Feature checks are awaitable", await client.is_feature_enabled(keys[2], "export"))
+    await session.aclose()
+    return ok
+
+
+def test_async_client() -> bool:
+    """Check concurrent validation, coalescing, caching and retries"""
+    print("⚡ Async Client Test - AsyncLicenseClient")
+    print("=" * 60)
+    ok = asyncio.run(check_async_client())
+    print()
+    print("🎉 Async client works" if ok else "❌ Async client test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_async_client():
+        sys.exit(1)
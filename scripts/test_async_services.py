@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test Async Services - admin CRUD and token auth on AsyncSession
+
+Works in a throwaway schema through an asyncpg engine, the way the async
+endpoints do, and checks that the async customer, application and license
+services create, get, list and delete with their ownership checks, and that
+AsyncAuthService issues API tokens that verify_api_token accepts until they
+are deactivated, deleted or expire. Repeat verifications are answered from
+the worker's API token cache, and changing a token through the service
+evicts it.
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config import settings
+from app.core.exceptions import CustomerNotFoundException, LicenseNotFoundException
+from app.database.connection import engine
+from app.models.database import TokenScope
+from app.models.schemas import APITokenCreate, APITokenUpdate, ApplicationCreate, CustomerCreate, LicenseKeyCreate, UserCreate
+from app.services.application_service import AsyncApplicationService
+from app.services.auth_service import AsyncAuthService, api_token_cache
+from app.services.customer_service import AsyncCustomerService
+from app.services.license_service import AsyncLicenseService
+
+SCHEMA = "async_services_check"
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+async def raises(call, exception) -> bool:
+    try:
+        await call
+    except exception:
+        return True
+    return False
+
+
+async def check_crud(session_engine) -> bool:
+    ok = True
+    async with AsyncSession(session_engine, expire_on_commit=False) as db:
+        auth = AsyncAuthService(db)
+        owner_id = (await auth.create_user(UserCreate(
+            username="async-owner", email="async-owner@example.com", full_name="Owner", password="password123"
+        ))).id
+        other_id = (await auth.create_user(UserCreate(
+            username="async-other", email="async-other@example.com", full_name="Other", password="password123"
+        ))).id
+        owner = await auth.get_user_by_username("async-owner")
+        other = await auth.get_user_by_username("async-other")
+        ok &= report("Users are created", owner.id == owner_id and other.id == other_id)
+
+        customers = AsyncCustomerService(db)
+        applications = AsyncApplicationService(db)
+        licenses = AsyncLicenseService(db)
+
+        customer = await customers.create_customer(
+            CustomerCreate(name="Customer", email="customer@example.com"), owner
+        )
+        application = await applications.create_application(
+            ApplicationCreate(name="App", version="1.0.0", features={"export": True}), owner
+        )
+        created = await licenses.create_license(
+            LicenseKeyCreate(customer_id=customer.id, application_id=application.id, max_activations=3), owner
+        )
+        ok &= report("Customer, application and license are created", bool(created.license_key))
+
+        fetched = await licenses.get_license(created.id, owner)
+        by_key = await licenses.get_license_by_key(created.license_key, owner)
+        ok &= report("License is read back by id and by key",
+                     fetched.id == created.id and by_key is not None and by_key.id == created.id)
+        ok &= report("Customer and application are read back",
+                     (await customers.get_customer(customer.id, owner)).email == "customer@example.com"
+                     and (await applications.get_application(application.id, owner)).name == "App")
+
+        listed = await licenses.list_licenses(owner, include_relations=True)
+        ok &= report("Owner lists their license with its relations",
+                     len(listed) == 1 and listed[0].customer.id == customer.id
+                     and listed[0].application.id == application.id)
+        ok &= report("Another user lists nothing",
+                     not await licenses.list_licenses(other)
+                     and not await customers.list_customers(other)
+                     and not await applications.list_applications(other))
+        ok &= report("Another user cannot get the owner's rows",
+                     await raises(licenses.get_license(created.id, other), LicenseNotFoundException)
+                     and await raises(customers.get_customer(customer.id, other), CustomerNotFoundException))
+        ok &= report("Another user cannot delete the owner's rows",
+                     not await licenses.delete_license(created.id, other)
+                     and not await customers.delete_customer(customer.id, other)
+                     and not await applications.delete_application(application.id, other))
+
+        ok &= report("Owner deletes license, customer and application",
+                     await licenses.delete_license(created.id, owner)
+                     and await customers.delete_customer(customer.id, owner)
+                     and await applications.delete_application(application.id, owner))
+        ok &= report("Deleted rows are gone",
+                     await raises(licenses.get_license(created.id, owner), LicenseNotFoundException)
+                     and not await customers.list_customers(owner)
+                     and not await applications.list_applications(owner))
+    return ok
+
+
+async def check_token_auth(session_engine) -> bool:
+    ok = True
+    async with AsyncSession(session_engine, expire_on_commit=False) as db:
+        auth = AsyncAuthService(db)
+        owner = await auth.get_user_by_username("async-owner")
+
+        scopes = [TokenScope.LICENSE_READ, TokenScope.VALIDATION]
+        token = await auth.create_api_token(owner, APITokenCreate(name="async check", scopes=scopes))
+        token_hash = hashlib.sha256(token.token.encode()).hexdigest()
+        verified = await auth.verify_api_token(token.token)
+        ok &= report("A new API token verifies with its user and scopes",
+                     verified is not None and verified[0].id == owner.id and set(verified[1]) == set(scopes))
+        ok &= report("Verification records last use",
+                     (await auth.list_api_tokens(owner.id))[0].last_used_at is not None)
+
+        token_queries = []
+
+        def count_token_queries(conn, cursor, statement, parameters, context, executemany):
+            if "apitoken" in statement:
+                token_queries.append(statement)
+
+        event.listen(session_engine.sync_engine, "before_cursor_execute", count_token_queries)
+        try:
+            verified = await auth.verify_api_token(token.token)
+        finally:
+            event.remove(session_engine.sync_engine, "before_cursor_execute", count_token_queries)
+        ok &= report("A repeat verification is answered from the token cache",
+                     verified is not None and verified[0].id == owner.id and not token_queries,
+                     f"{len(token_queries)} token queries")
+        ok &= report("An unknown token is rejected", await auth.verify_api_token("not-a-token") is None)
+
+        expired = await auth.create_api_token(owner, APITokenCreate(
+            name="expired", scopes=scopes, expires_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+        ))
+        ok &= report("An expired token is rejected", await auth.verify_api_token(expired.token) is None)
+
+        await auth.update_api_token(owner.id, token.id, APITokenUpdate(is_active=False))
+        ok &= report("Deactivating a token evicts it from the cache",
+                     api_token_cache.get(token_hash) is None and await auth.verify_api_token(token.token) is None)
+        await auth.update_api_token(owner.id, token.id, APITokenUpdate(is_active=True))
+        ok &= report("A reactivated token verifies again", await auth.verify_api_token(token.token) is not None)
+
+        await auth.delete_api_token(owner.id, token.id)
+        ok &= report("A deleted token is evicted and rejected",
+                     api_token_cache.get(token_hash) is None and await auth.verify_api_token(token.token) is None)
+
+        session = await auth.create_login_session(owner)
+        user = await auth.verify_session_token(session.session_token)
+        ok &= report("A login session token verifies", user is not None and user.id == owner.id)
+    return ok
+
+
+async def check_async_services() -> bool:
+    session_engine = create_async_engine(
+        settings.database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+        poolclass=NullPool,
+        connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    try:
+        ok = await check_crud(session_engine)
+        ok &= await check_token_auth(session_engine)
+    finally:
+        await session_engine.dispose()
+    return ok
+
+
+def test_async_services() -> bool:
+    """Run the async services against a scratch schema"""
+    print("⚡ Async Services Test - admin CRUD and token auth on AsyncSession")
+    print("=" * 60)
+
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        SQLModel.metadata.create_all(conn)
+        conn.commit()
+
+    try:
+        ok = asyncio.run(check_async_services())
+    finally:
+        with engine.connect() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.commit()
+
+    print()
+    print("🎉 Async services work" if ok else "❌ Async services test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_async_services():
+        sys.exit(1)
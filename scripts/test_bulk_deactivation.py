@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test Bulk Deactivation - ActivationService.deactivate_machines
+
+Works in a throwaway schema with two users' licenses and activations and
+deactivates a mix of the caller's active and inactive activations, another
+user's activations and an id that does not exist, in one call. Checks that:
+- only the caller's activations are deleted, in a single statement
+- each license gives back one seat per active activation removed
+- a seat count that had already drifted below the active count stops at zero
+- the other user's activations, seats and counters are untouched
+- the caller's active_activations counter matches a full recount
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+from sqlmodel import Session, SQLModel, select
+from app.database.connection import engine
+from app.models.database import Activation, ActivationStatus, Application, LicenseKey, User, UserStats
+from app.services.activation_service import ActivationService
+from app.services.stats_service import StatsService
+
+SCHEMA = "bulk_deactivation_check"
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+def seed_license(db: Session, user: User, application: Application, name: str,
+                 statuses: list, current_activations: int) -> tuple:
+    """A license with one activation per status, holding current_activations seats"""
+    license_key = LicenseKey(
+        key_hash=f"deactivate-{name}", application_id=application.id, max_activations=10,
+        current_activations=current_activations, owner_user_id=user.id
+    )
+    db.add(license_key)
+    db.flush()
+    activations = [
+        Activation(license_key_id=license_key.id, machine_id=f"{name}-machine-{i}",
+                   status=status, owner_user_id=user.id)
+        for i, status in enumerate(statuses)
+    ]
+    db.add_all(activations)
+    db.flush()
+    return license_key.id, [activation.id for activation in activations]
+
+
+def seed(db: Session) -> dict:
+    owner = User(username="deactivate-owner", email="deactivate-owner@example.com", full_name="Owner",
+                 password_hash="x")
+    other = User(username="deactivate-other", email="deactivate-other@example.com", full_name="Other",
+                 password_hash="x")
+    db.add_all([owner, other])
+    db.flush()
+    application = Application(name="App", version="1.0.0", user_id=owner.id)
+    db.add(application)
+    db.flush()
+
+    active, inactive = ActivationStatus.ACTIVE, ActivationStatus.INACTIVE
+    ids = {"owner": owner.id, "other": other.id}
+    # Three seats held, two of them released
+    ids["kept"], ids["kept_activations"] = seed_license(db, owner, application, "kept", [active] * 3, 3)
+    # Seat count has drifted to one below the two active activations; an inactive one holds no seat
+    ids["drifted"], ids["drifted_activations"] = seed_license(
+        db, owner, application, "drifted", [active, active, inactive], 1
+    )
+    ids["foreign"], ids["foreign_activations"] = seed_license(db, other, application, "foreign", [active] * 2, 2)
+    db.commit()
+    for user_id in (owner.id, other.id):
+        StatsService(db).reconcile(user_id=user_id)
+    return ids
+
+
+def seats(db: Session, license_id: int) -> int:
+    db.expire_all()
+    return db.get(LicenseKey, license_id).current_activations
+
+
+def active_activations(db: Session, user_id: int) -> int:
+    db.expire_all()
+    return db.get(UserStats, user_id).active_activations
+
+
+def check_deactivation(db: Session, ids: dict) -> bool:
+    ok = True
+    owner = db.get(User, ids["owner"])
+    requested = (
+        ids["kept_activations"][:2] + ids["drifted_activations"] + ids["foreign_activations"] + [999999]
+    )
+    owner_before, other_before = active_activations(db, ids["owner"]), active_activations(db, ids["other"])
+
+    statements = []
+
+    def count_statements(conn, cursor, statement, parameters, context, executemany):
+        if "DELETE FROM activation" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statements)
+    try:
+        removed = ActivationService(db).deactivate_machines(requested, owner)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statements)
+
+    remaining = set(db.exec(select(Activation.id)).all())
+    ok &= report("Only the caller's requested activations are removed",
+                 removed == 5 and remaining == {ids["kept_activations"][2], *ids["foreign_activations"]},
+                 f"removed={removed}")
+    ok &= report("All of them go in one statement", len(statements) == 1, f"{len(statements)} statements")
+    ok &= report("A license gives back one seat per active activation removed",
+                 seats(db, ids["kept"]) == 1, f"seats={seats(db, ids['kept'])}")
+    ok &= report("A drifted seat count stops at zero", seats(db, ids["drifted"]) == 0,
+                 f"seats={seats(db, ids['drifted'])}")
+    ok &= report("The other user's seats are untouched", seats(db, ids["foreign"]) == 2)
+
+    counted = active_activations(db, ids["owner"])
+    StatsService(db).reconcile(user_id=ids["owner"])
+    recounted = active_activations(db, ids["owner"])
+    ok &= report("The caller's active activations drop by the active ones removed",
+                 counted == owner_before - 4 and counted == recounted,
+                 f"{owner_before}→{counted}, recount {recounted}")
+    ok &= report("The other user's counter is unchanged", active_activations(db, ids["other"]) == other_before)
+
+    ok &= report("Deactivating them again removes nothing",
+                 ActivationService(db).deactivate_machines(requested, owner) == 0
+                 and seats(db, ids["kept"]) == 1 and active_activations(db, ids["owner"]) == counted)
+    return ok
+
+
+def test_bulk_deactivation() -> bool:
+    """Run bulk deactivation against a scratch schema"""
+    print("🔌 Bulk Deactivation Test - seats, ownership and counters")
+    print("=" * 60)
+
+    @event.listens_for(engine, "connect")
+    def use_scratch_schema(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.close()
+
+    engine.dispose()
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            SQLModel.metadata.create_all(conn)
+
+        with Session(engine) as db:
+            ok = check_deactivation(db, seed(db))
+    finally:
+        event.remove(engine, "connect", use_scratch_schema)
+        engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print()
+    print("🎉 Bulk deactivation works" if ok else "❌ Bulk deactivation test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_bulk_deactivation():
+        sys.exit(1)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Test Bulk License Status - filter-based status transitions
+
+Works in a throwaway schema with two users whose licenses share the same
+customers and applications, and runs LicenseService.bulk_update_status with
+each filter (customer, application, status, expiry range, license ids).
+For every filter it checks that:
+- a dry run counts the matching licenses and changes nothing
+- the real run changes exactly those licenses, all owned by the caller
+- the updates run in keyset chunks of bulk_status_chunk_size
+- the caller's dashboard counters match a full recount, and the other user's
+  counters are untouched
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, event, text
+from sqlmodel import Session, SQLModel, select
+from app.config import settings
+from app.database.connection import engine
+from app.models.database import Application, Customer, LicenseKey, LicenseStatus, User, UserStats
+from app.models.schemas import LicenseBulkStatusAction, LicenseBulkStatusUpdate
+from app.services.license_service import BULK_ACTION_STATUS, LicenseService
+from app.services.stats_service import StatsService
+
+SCHEMA = "bulk_license_status_check"
+LICENSES_PER_USER = 30
+CHUNK_SIZE = 4
+
+COUNTERS = [
+    "licenses_active", "licenses_expired", "licenses_suspended", "licenses_revoked", "licenses_blocked",
+]
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+def seed_users(db: Session) -> dict:
+    """Two users, and two customers and applications that both users' licenses point at"""
+    owner = User(username="bulk-owner", email="bulk-owner@example.com", full_name="Owner", password_hash="x")
+    other = User(username="bulk-other", email="bulk-other@example.com", full_name="Other", password_hash="x")
+    db.add(owner)
+    db.add(other)
+    db.flush()
+    customers = [Customer(name=f"Customer {i}", email=f"customer{i}@example.com", user_id=owner.id) for i in range(2)]
+    applications = [Application(name=f"App {i}", version="1.0.0", user_id=owner.id) for i in range(2)]
+    db.add_all(customers + applications)
+    db.commit()
+    return {
+        "owner": owner.id,
+        "other": other.id,
+        "customers": [customer.id for customer in customers],
+        "applications": [application.id for application in applications],
+    }
+
+
+def seed_licenses(db: Session, ids: dict, now: datetime) -> None:
+    """The same spread of customers, applications, statuses and expiries for both users"""
+    db.execute(delete(LicenseKey))
+    for user_id in (ids["owner"], ids["other"]):
+        for i in range(LICENSES_PER_USER):
+            db.add(LicenseKey(
+                key_hash=f"bulk-{user_id}-{i}",
+                customer_id=ids["customers"][i % 2],
+                application_id=ids["applications"][(i // 2) % 2],
+                status=LicenseStatus.BLOCKED if i % 5 == 4 else LicenseStatus.ACTIVE,
+                expires_at=now + timedelta(days=3 * (i + 1)),
+                owner_user_id=user_id
+            ))
+    db.commit()
+    for user_id in (ids["owner"], ids["other"]):
+        StatsService(db).reconcile(user_id=user_id)
+
+
+def snapshot(db: Session) -> dict:
+    """Every license's owner, filter columns and status, keyed by id"""
+    rows = db.execute(select(
+        LicenseKey.id, LicenseKey.owner_user_id, LicenseKey.customer_id, LicenseKey.application_id,
+        LicenseKey.status, LicenseKey.expires_at
+    )).all()
+    return {row.id: row for row in rows}
+
+
+def stats(db: Session, user_id: int) -> dict:
+    db.expire_all()
+    row = db.get(UserStats, user_id)
+    return {column: getattr(row, column) for column in COUNTERS + ["change_version"]}
+
+
+def expected_ids(rows: dict, bulk_update: LicenseBulkStatusUpdate, owner_id: int) -> set:
+    """Licenses the bulk change should touch, worked out independently of the service"""
+    target = BULK_ACTION_STATUS[bulk_update.action]
+    matched = set()
+    for license_key in rows.values():
+        if license_key.owner_user_id != owner_id or license_key.status == target:
+            continue
+        if bulk_update.action == LicenseBulkStatusAction.UNBLOCK and license_key.status != LicenseStatus.BLOCKED:
+            continue
+        if bulk_update.status is not None and license_key.status != bulk_update.status:
+            continue
+        if bulk_update.customer_id is not None and license_key.customer_id != bulk_update.customer_id:
+            continue
+        if bulk_update.application_id is not None and license_key.application_id != bulk_update.application_id:
+            continue
+        if bulk_update.expires_after is not None and license_key.expires_at < bulk_update.expires_after:
+            continue
+        if bulk_update.expires_before is not None and license_key.expires_at >= bulk_update.expires_before:
+            continue
+        if bulk_update.license_ids is not None and license_key.id not in bulk_update.license_ids:
+            continue
+        matched.add(license_key.id)
+    return matched
+
+
+def check_case(db: Session, ids: dict, now: datetime, description: str, **filters) -> bool:
+    ok = True
+    seed_licenses(db, ids, now)
+    owner = db.get(User, ids["owner"])
+    service = LicenseService(db)
+    before = snapshot(db)
+    if filters.pop("other_license_ids", False):
+        # Half the caller's licenses and all of the other user's
+        filters["license_ids"] = [
+            license_id for license_id, row in before.items()
+            if row.owner_user_id == ids["other"] or license_id % 2 == 0
+        ]
+    bulk_update = LicenseBulkStatusUpdate(**filters)
+    expected = expected_ids(before, bulk_update, ids["owner"])
+    owner_stats, other_stats = stats(db, ids["owner"]), stats(db, ids["other"])
+
+    updates = []
+
+    def count_updates(conn, cursor, statement, parameters, context, executemany):
+        if "UPDATE licensekey" in statement:
+            updates.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_updates)
+    try:
+        dry_run = service.bulk_update_status(bulk_update.copy(update={"dry_run": True}), owner)
+        dry_updates = len(updates)
+        unchanged = snapshot(db) == before
+        result = service.bulk_update_status(bulk_update, owner)
+        chunks = len(updates) - dry_updates
+    finally:
+        event.remove(engine, "before_cursor_execute", count_updates)
+
+    after = snapshot(db)
+    changed = {license_id for license_id, row in after.items() if row.status != before[license_id].status}
+    target = BULK_ACTION_STATUS[bulk_update.action]
+
+    print(f"— {description}: {len(expected)} of the caller's licenses match")
+    ok &= report("Dry run counts the matches and changes nothing",
+                 dry_run.dry_run and dry_run.matched == len(expected) and dry_run.updated == 0
+                 and dry_updates == 0 and unchanged, f"matched={dry_run.matched}")
+    ok &= report("Exactly the matching licenses change, to the target status",
+                 result.updated == len(expected) and changed == expected
+                 and all(after[license_id].status == target for license_id in changed),
+                 f"updated={result.updated}")
+    ok &= report("The other user's licenses are untouched",
+                 all(after[license_id].owner_user_id == ids["owner"] for license_id in changed))
+    ok &= report(f"Updates run in chunks of {CHUNK_SIZE}", chunks == len(expected) // CHUNK_SIZE + 1,
+                 f"{chunks} statements")
+
+    counted = stats(db, ids["owner"])
+    StatsService(db).reconcile(user_id=ids["owner"])
+    recounted = stats(db, ids["owner"])
+    ok &= report("The caller's counters match a full recount",
+                 {column: counted[column] for column in COUNTERS} == {column: recounted[column] for column in COUNTERS},
+                 ", ".join(f"{column} {owner_stats[column]}→{counted[column]}"
+                           for column in COUNTERS if owner_stats[column] != counted[column]))
+    ok &= report("The caller's change version moved", counted["change_version"] > owner_stats["change_version"])
+    ok &= report("The other user's counters and change version are unchanged",
+                 stats(db, ids["other"]) == other_stats)
+    return ok
+
+
+def test_bulk_license_status() -> bool:
+    """Run every bulk filter against a scratch schema"""
+    print("📦 Bulk License Status Test - filters, dry runs, chunking and counters")
+    print("=" * 60)
+
+    @event.listens_for(engine, "connect")
+    def use_scratch_schema(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.close()
+
+    engine.dispose()
+    chunk_size = settings.bulk_status_chunk_size
+    settings.bulk_status_chunk_size = CHUNK_SIZE
+    ok = True
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            SQLModel.metadata.create_all(conn)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # expires_at is stored as naive UTC
+        with Session(engine) as db:
+            ids = seed_users(db)
+            ok &= check_case(db, ids, now, "Suspend by customer",
+                             action=LicenseBulkStatusAction.SUSPEND, customer_id=ids["customers"][0])
+            ok &= check_case(db, ids, now, "Block by application",
+                             action=LicenseBulkStatusAction.BLOCK, application_id=ids["applications"][1])
+            ok &= check_case(db, ids, now, "Unblock by status",
+                             action=LicenseBulkStatusAction.UNBLOCK, status=LicenseStatus.BLOCKED)
+            ok &= check_case(db, ids, now, "Revoke by expiry range",
+                             action=LicenseBulkStatusAction.REVOKE,
+                             expires_after=now + timedelta(days=5), expires_before=now + timedelta(days=40))
+            ok &= check_case(db, ids, now, "Block by license ids, including another user's",
+                             action=LicenseBulkStatusAction.BLOCK, other_license_ids=True)
+            ok &= check_case(db, ids, now, "Suspend by customer and application",
+                             action=LicenseBulkStatusAction.SUSPEND,
+                             customer_id=ids["customers"][1], application_id=ids["applications"][0])
+    finally:
+        settings.bulk_status_chunk_size = chunk_size
+        event.remove(engine, "connect", use_scratch_schema)
+        engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print()
+    print("🎉 Bulk status changes work" if ok else "❌ Bulk license status test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_bulk_license_status():
+        sys.exit(1)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test Cache Invalidation - LISTEN/NOTIFY eviction across workers
+
+Runs an InvalidationListener in this process (standing in for another
+worker) on a private channel and checks that:
+- a committed invalidate_on_commit() evicts the key through NOTIFY
+- a rolled back one sends nothing
+- large key sets are split across payloads and all arrive
+- after its connection is killed the listener flushes the caches, reconnects
+  and keeps receiving
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import time
+from sqlalchemy import text
+from sqlmodel import Session
+from app.config import settings
+from app.core import cache
+from app.database.connection import engine
+from app.database.invalidation import InvalidationListener, invalidate_on_commit
+
+CHANNEL = f"cache_invalidation_test_{os.getpid()}"
+TEST_CACHE = "invalidation_test"
+
+
+async def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        await asyncio.sleep(0.02)
+    return condition()
+
+
+def commit_invalidation(keys: list, rollback: bool = False) -> None:
+    """Queue an eviction in a sync session and commit (or roll back) it"""
+    with Session(engine) as db:
+        db.execute(text("SELECT 1"))
+        invalidate_on_commit(db, TEST_CACHE, keys)
+        db.rollback() if rollback else db.commit()
+
+
+async def check_invalidation() -> bool:
+    listener = InvalidationListener(settings.database_url, CHANNEL)
+    local = cache.get_cache(TEST_CACHE)
+    ok = True
+
+    # The committing session also evicts locally, so record what arrives by NOTIFY
+    heard = set()
+    on_notification = listener.on_notification
+
+    def record(connection, pid, channel, payload):
+        heard.update(json.loads(payload)["keys"])
+        on_notification(connection, pid, channel, payload)
+
+    listener.on_notification = record
+
+    # Publish on the test channel rather than the application's
+    channel = settings.cache_invalidation_channel
+    settings.cache_invalidation_channel = CHANNEL
+    listener.start()
+    try:
+        if not await wait_for(lambda: listener.connected):
+            print("❌ Listener did not connect")
+            return False
+        print("✅ Listener connected")
+
+        # Rolled back: nothing is sent or evicted
+        local.set("rolled-back", 1)
+        await asyncio.to_thread(commit_invalidation, ["rolled-back"], True)
+        await asyncio.sleep(0.3)
+        ok &= report("Rolled back invalidation is not sent", local.get("rolled-back") == 1 and not heard)
+
+        # Committed: evicted here and announced to every listener
+        local.set("committed", 1)
+        await asyncio.to_thread(commit_invalidation, ["committed"])
+        ok &= report("Committed invalidation arrives by NOTIFY",
+                     await wait_for(lambda: "committed" in heard) and local.get("committed") is None)
+
+        # Many keys: split across payloads, all delivered
+        keys = [f"{i:064x}" for i in range(1000)]
+        received = listener.received
+        await asyncio.to_thread(commit_invalidation, keys)
+        ok &= report("1000 keys split across payloads all arrive",
+                     await wait_for(lambda: heard.issuperset(keys)),
+                     f"{listener.received - received} messages")
+
+        # Kill the LISTEN connection: caches are flushed and the listener comes back
+        local.set("during-gap", 1)
+        with engine.connect() as conn:
+            conn.execute(text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE pid <> pg_backend_pid() AND query LIKE 'LISTEN%' AND query LIKE :channel"
+            ), {"channel": f"%{CHANNEL}%"})
+        ok &= report("Lost connection flushes local caches",
+                     await wait_for(lambda: listener.gaps == 1 and local.get("during-gap") is None))
+        ok &= report("Listener reconnects", await wait_for(lambda: listener.connected, timeout=10))
+
+        await asyncio.to_thread(commit_invalidation, ["after-reconnect"])
+        ok &= report("Invalidations arrive after reconnecting", await wait_for(lambda: "after-reconnect" in heard))
+    finally:
+        await listener.stop()
+        settings.cache_invalidation_channel = channel
+    return ok
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+def test_cache_invalidation() -> bool:
+    """Check NOTIFY-driven eviction, rollback, payload splitting and reconnection"""
+    print("📣 Cache Invalidation Test - LISTEN/NOTIFY across workers")
+    print("=" * 60)
+    ok = asyncio.run(check_invalidation())
+    print()
+    print("🎉 Cache invalidation bus works" if ok else "❌ Cache invalidation test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_cache_invalidation():
+        sys.exit(1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test Conditional GET - ETags from the per-user change version
+
+Needs the server running on localhost:8999 and the test users set up
+(braden's API token is used). Checks that:
+- list and detail endpoints return a weak ETag
+- repeating the request with If-None-Match answers 304 with no body
+- any write (create, update, delete) moves the ETag so the next GET is a 200
+"""
+import sys
+import os
+import requests
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.test_users import get_braden_api_token
+
+# Configuration
+BASE_URL = "http://localhost:8999/api/v1"
+
+
+def check(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+def test_conditional_get() -> bool:
+    """Exercise If-None-Match against the license, customer and application endpoints"""
+    print("🏷️  Conditional GET Test - ETags from the change version")
+    print("=" * 60)
+
+    token = get_braden_api_token()
+    if not token:
+        print("❌ No API token for braden; run scripts/setup_auth_database.py first")
+        return False
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+
+    ok = True
+    for path in ("/licenses/", "/customers/", "/applications/"):
+        first = session.get(f"{BASE_URL}{path}")
+        etag = first.headers.get("ETag")
+        ok &= check(f"GET {path} returns a weak ETag", first.status_code == 200 and bool(etag)
+                    and etag.startswith('W/"'), f"{first.status_code}, {etag}")
+        if not etag:
+            continue
+        again = session.get(f"{BASE_URL}{path}", headers={"If-None-Match": etag})
+        ok &= check(f"GET {path} with If-None-Match is 304", again.status_code == 304 and not again.content,
+                    f"{again.status_code}")
+    print()
+
+    # Every kind of write moves the ETag
+    etag = session.get(f"{BASE_URL}/customers/").headers.get("ETag")
+    created = session.post(f"{BASE_URL}/customers/", json={
+        "name": "Conditional GET Test", "email": "conditional-get@example.com"
+    })
+    if not check("Created a test customer", created.status_code == 201, f"{created.status_code}"):
+        return False
+    customer_id = created.json()["id"]
+
+    try:
+        after_create = session.get(f"{BASE_URL}/customers/", headers={"If-None-Match": etag})
+        ok &= check("Creating a customer changes the list ETag", after_create.status_code == 200
+                    and after_create.headers.get("ETag") != etag)
+        etag = after_create.headers.get("ETag")
+
+        detail = session.get(f"{BASE_URL}/customers/{customer_id}", headers={"If-None-Match": etag})
+        ok &= check("Detail shares the user's ETag", detail.status_code == 304, f"{detail.status_code}")
+
+        session.put(f"{BASE_URL}/customers/{customer_id}", json={"company": "Renamed"})
+        after_update = session.get(f"{BASE_URL}/customers/{customer_id}", headers={"If-None-Match": etag})
+        ok &= check("Updating a customer changes the ETag", after_update.status_code == 200
+                    and after_update.json().get("company") == "Renamed")
+        etag = after_update.headers.get("ETag")
+    finally:
+        session.delete(f"{BASE_URL}/customers/{customer_id}")
+
+    after_delete = session.get(f"{BASE_URL}/customers/", headers={"If-None-Match": etag})
+    ok &= check("Deleting a customer changes the ETag", after_delete.status_code == 200)
+
+    # No credentials, no 304
+    missing = session.get(f"{BASE_URL}/customers/", headers={"Authorization": "Bearer invalid", "If-None-Match": "*"})
+    ok &= check("Authentication runs before the ETag check", missing.status_code == 401, f"{missing.status_code}")
+
+    print()
+    print("🎉 Conditional GET works" if ok else "❌ Conditional GET test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_conditional_get():
+        sys.exit(1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test Connection Pool - statistics and background liveness checks
+
+Works on the server's pool (the async engine every endpoint and background
+job shares). Holds connections to check the reported pool statistics, then
+terminates every idle pooled backend (as a server restart or an idle-timeout
+firewall would) and checks that the liveness job notices and replaces them,
+so the next request succeeds without a pre-ping on checkout.
+"""
+import asyncio
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.database.connection import env
+from app.database.pool import check_pool_liveness, is_pgbouncer_mode, pool_statistics
+from app.database.postgres import async_engine
+
+
+def primary_stats() -> dict:
+    return next(stats for stats in pool_statistics() if stats["name"] == "primary")
+
+
+async def check_connection_pool() -> bool:
+    """Check pool statistics and that liveness checks replace dead connections"""
+    print("🏊 Connection Pool Test - statistics and liveness checks")
+    print("=" * 60)
+    print(f"⚙️  Profile {env}, mode {settings.database_pool_mode}")
+    if is_pgbouncer_mode():
+        print("ℹ️  PgBouncer mode keeps no pooled connections: nothing to check")
+        return True
+
+    ok = True
+
+    def check(description: str, passed: bool, detail: str = "") -> None:
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {description}{f': {detail}' if detail and not passed else ''}")
+
+    held = [await async_engine.connect() for _ in range(async_engine.sync_engine.pool.size())]
+    pids = [(await conn.execute(text("SELECT pg_backend_pid()"))).scalar() for conn in held]
+    stats = primary_stats()
+    check("Held connections are reported as checked out",
+          stats["checked_out"] == len(held), f"{stats['checked_out']} != {len(held)}")
+    for conn in held:
+        await conn.close()
+    stats = primary_stats()
+    check("Returned connections are reported as checked in",
+          stats["checked_out"] == 0 and stats["checked_in"] == len(held), str(stats))
+    check("Checkouts and wait times are recorded", stats["checkouts"] >= len(held), str(stats))
+
+    # Kill every idle pooled backend from outside the pool
+    admin = create_engine(settings.database_url, poolclass=NullPool)
+    with admin.connect() as conn:
+        conn.execute(text("SELECT pg_terminate_backend(pid) FROM unnest(CAST(:pids AS int[])) pid"), {"pids": pids})
+    admin.dispose()
+    print(f"💀 Terminated {len(pids)} idle pooled connections")
+
+    liveness = await check_pool_liveness()
+    check("Liveness check reports the database alive after replacing dead connections",
+          liveness.get("primary") is True, str(liveness))
+
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        check("First request after the liveness check succeeds", True)
+    except Exception as e:
+        check("First request after the liveness check succeeds", False, str(e))
+
+    print()
+    for stats in pool_statistics():
+        print(f"📊 {stats['name']}: {stats['checked_out']} out, {stats['checked_in']} idle, "
+              f"overflow {stats['overflow']}, avg wait {stats['avg_wait_ms']}ms, max {stats['max_wait_ms']}ms")
+
+    print()
+    print("🎉 Connection pool works" if ok else "❌ Connection pool test failed")
+    await async_engine.dispose()
+    return ok
+
+
+def test_connection_pool() -> bool:
+    """Check pool statistics and that liveness checks replace dead connections"""
+    return asyncio.run(check_connection_pool())
+
+
+if __name__ == "__main__":
+    if not test_connection_pool():
+        sys.exit(1)
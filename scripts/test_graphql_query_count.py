@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test GraphQL Query Count - nested queries must not issue N+1 statements
+
+Seeds a throwaway schema with licenses that each have a customer, an
+application, activations and activation forms, then runs nested GraphQL
+queries for a small and a large page and counts the SQL statements each
+one executes. The DataLoaders must keep the count constant: one statement
+for the root list plus one per relation, however many rows come back.
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config import settings
+from app.database.connection import engine
+from app.graphql.context import GraphQLContext
+from app.graphql.schema import schema
+from app.models.database import TokenScope, User
+
+SCHEMA = "graphql_query_count_check"
+
+# Seed sizes
+LICENSES = 500
+CUSTOMERS = 100
+APPLICATIONS = 10
+ACTIVATIONS_PER_LICENSE = 2
+FORMS_PER_LICENSE = 1
+
+SEED_SQL = [
+    """
+    INSERT INTO "user" (username, email, full_name, business_role, system_role, is_active,
+                        created_at, updated_at, password_hash)
+    SELECT 'user' || g, 'user' || g || '@example.com', 'User ' || g, 'USER', 'USER', true,
+           now(), now(), 'x'
+    FROM generate_series(1, 2) g
+    """,
+    f"""
+    INSERT INTO customer (name, email, company, user_id, created_at)
+    SELECT 'Customer ' || g, 'customer' || g || '@example.com', NULL, 1, now()
+    FROM generate_series(1, {CUSTOMERS}) g
+    """,
+    f"""
+    INSERT INTO application (name, version, description, features, user_id, created_at)
+    SELECT 'App ' || g, '1.0.0', NULL, '{{"tier": "pro"}}', 1, now()
+    FROM generate_series(1, {APPLICATIONS}) g
+    """,
+    f"""
+    INSERT INTO licensekey (key_hash, customer_id, application_id, status, expires_at,
+                            max_activations, current_activations, features, notes,
+                            created_at, updated_at, owner_user_id)
+    SELECT md5('key' || g), (g % {CUSTOMERS}) + 1, (g % {APPLICATIONS}) + 1, 'ACTIVE',
+           now() + interval '1 year', 5, {ACTIVATIONS_PER_LICENSE}, NULL, NULL, now(), now(), 1
+    FROM generate_series(1, {LICENSES}) g
+    """,
+    f"""
+    INSERT INTO activation (license_key_id, machine_id, machine_name, ip_address, status,
+                            activated_at, last_heartbeat, owner_user_id)
+    SELECT (g % {LICENSES}) + 1, md5('machine' || g), NULL, NULL, 'ACTIVE', now(), now(), 1
+    FROM generate_series(1, {LICENSES * ACTIVATIONS_PER_LICENSE}) g
+    """,
+    f"""
+    INSERT INTO activationform (license_key_id, machine_id, machine_name, request_code,
+                                activation_code, status, expires_at, created_at)
+    SELECT (g % {LICENSES}) + 1, md5('form' || g), NULL, upper(substr(md5('req' || g), 1, 16)),
+           NULL, 'pending', now() + interval '1 day', now()
+    FROM generate_series(1, {LICENSES * FORMS_PER_LICENSE}) g
+    """,
+]
+
+# (description, query, statements allowed, path to the root list)
+QUERIES = [
+    ("Licenses with customer, application, activations and forms", """
+        query ($limit: Int!) {
+          licenses(limit: $limit) {
+            id status features
+            customer { id name }
+            application { id name features }
+            activations { id machineId status }
+            activationForms { id requestCode status }
+          }
+        }
+     """, 5, "licenses"),
+    ("Customers with licenses, their activations and each activation's license", """
+        query ($limit: Int!) {
+          customers(limit: $limit) {
+            id
+            licenses { id activations { id license { id application { name } } } }
+          }
+        }
+     """, 5, "customers"),
+    ("Activations with license and customer", """
+        query ($limit: Int!) {
+          activations(limit: $limit) { id license { id customer { email } } }
+        }
+     """, 3, "activations"),
+]
+
+
+async def run_query(session_engine, query: str, limit: int) -> tuple:
+    """Execute one query for user 1 and count the SQL statements it issued"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(session_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        async with AsyncSession(session_engine, expire_on_commit=False) as db:
+            user = await db.get(User, 1)
+            statements.clear()
+            context = GraphQLContext(db, user, list(TokenScope))
+            result = await schema.execute(query, variable_values={"limit": limit}, context_value=context)
+    finally:
+        event.remove(session_engine.sync_engine, "before_cursor_execute", count)
+    return result, len(statements)
+
+
+async def check_query_counts() -> bool:
+    session_engine = create_async_engine(
+        settings.database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+        poolclass=NullPool,
+        connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    ok = True
+    try:
+        for description, query, allowed, root in QUERIES:
+            counts = {}
+            for limit in (10, LICENSES):
+                result, count = await run_query(session_engine, query, limit)
+                if result.errors:
+                    print(f"❌ {description}: {result.errors[0]}")
+                    return False
+                counts[limit] = (len(result.data[root]), count)
+
+            (small_rows, small), (large_rows, large) = counts[10], counts[LICENSES]
+            if small == large <= allowed:
+                print(f"✅ {description}: {large} statements for {small_rows} and {large_rows} rows")
+            else:
+                ok = False
+                print(f"❌ {description}: {small} statements for {small_rows} rows, "
+                      f"{large} for {large_rows} (allowed {allowed})")
+
+        # A second user's query sees none of the first user's data
+        async with AsyncSession(session_engine, expire_on_commit=False) as db:
+            other = await db.get(User, 2)
+            result = await schema.execute(
+                "{ licenses { id } customers { id } activations { id } activationForms { id } }",
+                context_value=GraphQLContext(db, other, list(TokenScope))
+            )
+        if result.errors or any(result.data.values()):
+            ok = False
+            print(f"❌ Another user can see the seeded data: {result.errors or result.data}")
+        else:
+            print("✅ Another user sees none of the seeded data")
+    finally:
+        await session_engine.dispose()
+    return ok
+
+
+def test_graphql_query_count() -> bool:
+    """Seed the scratch schema and check nested queries run a constant number of statements"""
+    print("🕸️  GraphQL Query Count Test - DataLoaders batch every relation")
+    print("=" * 60)
+
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        SQLModel.metadata.create_all(conn)
+        for statement in SEED_SQL:
+            conn.execute(text(statement))
+        conn.commit()
+    print(f"🌱 Seeded {LICENSES} licenses, {LICENSES * ACTIVATIONS_PER_LICENSE} activations, "
+          f"{CUSTOMERS} customers")
+    print()
+
+    try:
+        ok = asyncio.run(check_query_counts())
+    finally:
+        with engine.connect() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.commit()
+
+    print()
+    print("🎉 Nested GraphQL queries are batched" if ok else "❌ GraphQL query count test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_graphql_query_count():
+        sys.exit(1)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test Heartbeat - background license heartbeats in the client SDK
+
+Runs LicenseClient.start_heartbeat (thread) and AsyncLicenseClient.start_heartbeat
+(asyncio task) against a stub /validation/heartbeat and checks that:
+- heartbeats go through the client's pooled session
+- the status callback fires on the first result and on changes only
+- failures back off exponentially and recovery resets the schedule
+- intervals are jittered and first heartbeats are spread over an interval
+- close() stops heartbeats promptly
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import statistics
+import time
+from client_sdk.license_client import (
+    AsyncLicenseClient, LicenseClient, LicenseHeartbeat, LicenseStatus
+)
+from scripts.sdk_stub import StubServer, stub_async_session, stub_session
+
+INTERVAL = 0.05
+LICENSE_KEY = "AAAA-BBBB-CCCC-DDDD"
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def check_schedule() -> bool:
+    """Jitter and backoff of the delays alone"""
+    ok = True
+    heartbeat = LicenseHeartbeat(None, LICENSE_KEY, interval=300, jitter=0.1, retry_delay=30, max_backoff=3600)
+    first = [heartbeat._first_delay() for _ in range(1000)]
+    ok &= report("First heartbeats are spread over the interval", min(first) < 30 and max(first) > 270,
+                 f"{min(first):.0f}s to {max(first):.0f}s")
+    regular = [heartbeat._next_delay() for _ in range(1000)]
+    ok &= report("Intervals are jittered by up to 10%",
+                 270 <= min(regular) and max(regular) <= 330 and statistics.pstdev(regular) > 5,
+                 f"{min(regular):.0f}s to {max(regular):.0f}s")
+    backoff = []
+    for failures in range(1, 10):
+        heartbeat.failures = failures
+        backoff.append(max(heartbeat._next_delay() for _ in range(100)))
+    ok &= report("Failures back off exponentially up to max_backoff",
+                 backoff[0] <= 30 and backoff[3] > 120 and max(backoff) <= 3600,
+                 ", ".join(f"{delay:.0f}s" for delay in backoff))
+    return ok
+
+
+def check_thread() -> bool:
+    ok = True
+    session, server = stub_session()
+    changes = []
+
+    client = LicenseClient("http://stub", "HeartbeatTestApp", "1.0.0", session=session, max_retries=0)
+    heartbeat = client.start_heartbeat(
+        LICENSE_KEY, interval=INTERVAL, retry_delay=INTERVAL, max_backoff=INTERVAL * 8,
+        on_status_change=lambda previous, current: changes.append((previous, current))
+    )
+    ok &= report("Heartbeat thread runs", wait_for(lambda: len(server.request_times) >= 5),
+                 f"{len(server.request_times)} heartbeats")
+    ok &= report("Status callback fires once for the first result",
+                 len(changes) == 1 and changes[0][0] is None and changes[0][1].status == LicenseStatus.ACTIVE)
+    ok &= report("Heartbeats refresh the validation cache",
+                 client.validate_license(LICENSE_KEY).message == "License is active")
+
+    server.status = "suspended"
+    ok &= report("Status callback fires on a change",
+                 wait_for(lambda: len(changes) == 2) and changes[1][1].status == LicenseStatus.SUSPENDED
+                 and not changes[1][1].valid)
+
+    server.down = True
+    ok &= report("Failures are counted", wait_for(lambda: heartbeat.failures >= 4), f"{heartbeat.failures} in a row")
+    down = [b - a for a, b in zip(server.request_times[-4:], server.request_times[-3:])]
+    server.down = False
+    server.status = "active"
+    ok &= report("Failed heartbeats back off", down == sorted(down) or down[-1] > down[0],
+                 ", ".join(f"{gap * 1000:.0f}ms" for gap in down))
+    ok &= report("Recovery resets the failure count and reports the change",
+                 wait_for(lambda: heartbeat.failures == 0 and len(changes) == 3)
+                 and changes[2][1].status == LicenseStatus.ACTIVE)
+
+    start = time.perf_counter()
+    client.close()
+    stopped = time.perf_counter() - start
+    beats = len(server.request_times)
+    time.sleep(INTERVAL * 3)
+    ok &= report("close() stops the heartbeat promptly",
+                 not heartbeat.running and len(server.request_times) == beats and stopped < 1,
+                 f"{stopped * 1000:.1f}ms")
+    return ok
+
+
+async def check_task() -> bool:
+    ok = True
+    server = StubServer()
+    changes = []
+
+    async def on_status_change(previous, current):
+        changes.append((previous, current))
+
+    session = stub_async_session(server)
+    async with AsyncLicenseClient("http://stub", "HeartbeatTestApp", "1.0.0", session=session,
+                                  max_retries=0) as client:
+        heartbeat = client.start_heartbeat(LICENSE_KEY, interval=INTERVAL, on_status_change=on_status_change)
+        for _ in range(200):
+            if len(server.request_times) >= 3:
+                break
+            await asyncio.sleep(0.01)
+        ok &= report("Heartbeat task runs", len(server.request_times) >= 3, f"{len(server.request_times)} heartbeats")
+        server.status = "revoked"
+        for _ in range(200):
+            if len(changes) == 2:
+                break
+            await asyncio.sleep(0.01)
+        ok &= report("Async status callback is awaited on a change",
+                     len(changes) == 2 and changes[1][1].status == LicenseStatus.REVOKED)
+    ok &= report("Leaving 'async with' cancels the task", not heartbeat.running)
+    await session.aclose()
+    return ok
+
+
+def test_heartbeat() -> bool:
+    """Check scheduling, callbacks, backoff and shutdown of SDK heartbeats"""
+    print("💓 Heartbeat Test - background heartbeats in the client SDK")
+    print("=" * 60)
+    ok = check_schedule()
+    ok &= check_thread()
+    ok &= asyncio.run(check_task())
+    print()
+    print("🎉 Heartbeats work" if ok else "❌ Heartbeat test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_heartbeat():
+        sys.exit(1)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test Offline Code Redemption - each activation code is redeemed exactly once
+
+Works in a throwaway schema: seeds one license with free seats, several
+pending activation forms and a single offline activation code, then has
+every form try to complete with that code at the same moment. Exactly one
+completion may succeed and the license must gain exactly one activation.
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, func, text
+from sqlmodel import Session, SQLModel, select
+from app.database.connection import engine
+from app.models.database import (
+    Activation, ActivationForm, Application, Customer, LicenseKey, OfflineActivationCode, User
+)
+from app.models.schemas import ActivationFormComplete
+from app.services.activation_form_service import ActivationFormService
+
+SCHEMA = "offline_redemption_check"
+CONTENDERS = 8
+ACTIVATION_CODE = "REDEEMONCE000001"
+
+
+def seed(db: Session) -> int:
+    """Create a license with free seats, pending forms and one unused code"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    user = User(username="redeemer", email="redeemer@example.com", full_name="Redeemer", password_hash="x")
+    db.add(user)
+    db.flush()
+    customer = Customer(name="Customer", email="customer@example.com", user_id=user.id)
+    application = Application(name="App", version="1.0.0", user_id=user.id)
+    db.add(customer)
+    db.add(application)
+    db.flush()
+    license_key = LicenseKey(
+        key_hash="redemption-check", customer_id=customer.id, application_id=application.id,
+        max_activations=CONTENDERS, owner_user_id=user.id
+    )
+    db.add(license_key)
+    db.flush()
+    for i in range(CONTENDERS):
+        db.add(ActivationForm(
+            license_key_id=license_key.id, machine_id=f"machine-{i}",
+            request_code=f"REQUEST{i:09d}", expires_at=now + timedelta(hours=1)
+        ))
+    db.add(OfflineActivationCode(
+        license_key_id=license_key.id, activation_code=ACTIVATION_CODE, expires_at=now + timedelta(days=1)
+    ))
+    db.commit()
+    return license_key.id
+
+
+def test_offline_code_redemption() -> bool:
+    """Race every pending form for the same code and check a single redemption"""
+    print("🔐 Offline Code Redemption Test - one code, one activation")
+    print("=" * 60)
+
+    # Every pooled connection used by the contenders must see the scratch schema
+    @event.listens_for(engine, "connect")
+    def use_scratch_schema(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.close()
+
+    engine.dispose()
+    ok = True
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            SQLModel.metadata.create_all(conn)
+
+        with Session(engine) as db:
+            license_key_id = seed(db)
+
+        barrier = threading.Barrier(CONTENDERS)
+        successes, failures = [], []
+
+        def complete(i: int) -> None:
+            with Session(engine) as db:
+                service = ActivationFormService(db)
+                barrier.wait()
+                try:
+                    service.complete_activation_form(ActivationFormComplete(
+                        request_code=f"REQUEST{i:09d}", activation_code=ACTIVATION_CODE
+                    ))
+                    successes.append(i)
+                except ValueError as e:
+                    failures.append(str(e))
+
+        threads = [threading.Thread(target=complete, args=(i,)) for i in range(CONTENDERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if len(successes) == 1:
+            print(f"✅ One of {CONTENDERS} concurrent completions succeeded")
+        else:
+            ok = False
+            print(f"❌ {len(successes)} of {CONTENDERS} concurrent completions succeeded")
+        print(f"   Rejected: {sorted(set(failures))}")
+
+        with Session(engine) as db:
+            code = db.exec(
+                select(OfflineActivationCode).where(OfflineActivationCode.activation_code == ACTIVATION_CODE)
+            ).one()
+            license_key = db.get(LicenseKey, license_key_id)
+            activations = db.exec(
+                select(func.count()).select_from(Activation).where(Activation.license_key_id == license_key_id)
+            ).one()
+            completed = db.exec(
+                select(func.count()).select_from(ActivationForm).where(ActivationForm.status == "completed")
+            ).one()
+
+            if code.is_used and code.used_at is not None:
+                print("✅ Code marked used")
+            else:
+                ok = False
+                print("❌ Code not marked used")
+
+            if license_key.current_activations == 1 and activations == 1 and completed == 1:
+                print("✅ Exactly one activation, one seat taken and one form completed")
+            else:
+                ok = False
+                print(f"❌ current_activations={license_key.current_activations}, "
+                      f"activations={activations}, completed forms={completed}")
+    finally:
+        event.remove(engine, "connect", use_scratch_schema)
+        engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print()
+    print("🎉 Offline codes are redeemed exactly once" if ok else "❌ Offline code redemption test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_offline_code_redemption():
+        sys.exit(1)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Test Query Plans - hot service queries must use index scans
+
+Builds a throwaway schema with the Alembic migrations (so the indexes they
+add are the ones checked), seeds it with a realistic amount of data, runs
+EXPLAIN on the queries the services issue on every request, and fails if
+any of them falls back to a sequential scan on the table being looked up.
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta, timezone
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import NullPool
+from sqlmodel import func, select
+from app.config import settings
+from app.core.constants import PROJECT_ROOT
+from app.database.connection import engine
+from app.models.database import (
+    Activation, ActivationForm, ActivationStatus, APIToken, Application,
+    Customer, LicenseKey, LicenseStatus, Session as DBSession
+)
+
+SCHEMA = "query_plan_check"
+
+# Seed sizes
+USERS = 200
+CUSTOMERS_PER_USER = 50
+APPLICATIONS_PER_USER = 5
+LICENSES = 20000
+ACTIVATIONS = 40000
+ACTIVATION_FORMS = 10000
+SESSIONS = 5000
+API_TOKENS = 2000
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan", "Bitmap Heap Scan"}
+
+SEED_SQL = [
+    f"""
+    INSERT INTO "user" (username, email, full_name, business_role, system_role, is_active,
+                        created_at, updated_at, password_hash)
+    SELECT 'user' || g, 'user' || g || '@example.com', 'User ' || g, 'USER', 'USER', true,
+           now(), now(), 'x'
+    FROM generate_series(1, {USERS}) g
+    """,
+    f"""
+    INSERT INTO customer (name, email, company, user_id, created_at)
+    SELECT 'Customer ' || g, 'customer' || g || '@example.com', NULL,
+           (g % {USERS}) + 1, now()
+    FROM generate_series(1, {USERS * CUSTOMERS_PER_USER}) g
+    """,
+    f"""
+    INSERT INTO application (name, version, description, features, user_id, created_at)
+    SELECT 'App ' || g, '1.0.0', NULL, NULL, (g % {USERS}) + 1, now()
+    FROM generate_series(1, {USERS * APPLICATIONS_PER_USER}) g
+    """,
+    f"""
+    INSERT INTO licensekey (key_hash, customer_id, application_id, status, expires_at,
+                            max_activations, current_activations, features, notes,
+                            created_at, updated_at, owner_user_id)
+    SELECT md5('key' || g), (g % {USERS * CUSTOMERS_PER_USER}) + 1,
+           (g % {USERS * APPLICATIONS_PER_USER}) + 1, 'ACTIVE',
+           now() + (g % 730) * interval '1 day', 5, 0, NULL, NULL, now(), now(),
+           (SELECT user_id FROM customer WHERE id = (g % {USERS * CUSTOMERS_PER_USER}) + 1)
+    FROM generate_series(1, {LICENSES}) g
+    """,
+    f"""
+    INSERT INTO activation (license_key_id, machine_id, machine_name, ip_address, status,
+                            activated_at, last_heartbeat, owner_user_id)
+    SELECT (g % {LICENSES}) + 1, md5('machine' || g), NULL, NULL,
+           CASE WHEN g % 4 = 0 THEN 'INACTIVE' ELSE 'ACTIVE' END::activationstatus,
+           now(), now(),
+           (SELECT owner_user_id FROM licensekey WHERE id = (g % {LICENSES}) + 1)
+    FROM generate_series(1, {ACTIVATIONS}) g
+    """,
+    f"""
+    INSERT INTO activationform (license_key_id, machine_id, machine_name, request_code,
+                                activation_code, status, expires_at, created_at)
+    SELECT (g % {LICENSES}) + 1, md5('form' || g), NULL, upper(substr(md5('req' || g), 1, 16)),
+           NULL, CASE WHEN g % 20 = 0 THEN 'pending' ELSE 'completed' END,
+           now() + interval '1 day', now()
+    FROM generate_series(1, {ACTIVATION_FORMS}) g
+    """,
+    f"""
+    INSERT INTO session (user_id, session_token, is_revoked, expires_at, created_at, last_activity)
+    SELECT (g % {USERS}) + 1, md5('session' || g), false, now() + interval '1 hour', now(), now()
+    FROM generate_series(1, {SESSIONS}) g
+    """,
+    f"""
+    INSERT INTO apitoken (name, token_hash, scopes, is_active, created_at, user_id)
+    SELECT 'token ' || g, md5('token' || g), '[]', true, now(), (g % {USERS}) + 1
+    FROM generate_series(1, {API_TOKENS}) g
+    """,
+]
+
+
+def hot_queries():
+    """(description, table that must be index-scanned, statement) for each hot query"""
+    user_id = 42
+    soon = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=7)
+    return [
+        ("ActivationService.handle_activation existing activation", "activation",
+         select(Activation).where(
+             Activation.license_key_id == 123,
+             Activation.machine_id == "0123456789abcdef",
+             Activation.status == ActivationStatus.ACTIVE
+         )),
+        ("ActivationFormService.complete_activation_form by request_code", "activationform",
+         select(ActivationForm).where(ActivationForm.request_code == "0123456789ABCDEF")),
+        ("ActivationFormService.list_activation_forms pending", "activationform",
+         select(ActivationForm).where(ActivationForm.status == "pending").limit(100)),
+        ("ActivationFormService.sweep_expired overdue forms", "activationform",
+         select(ActivationForm.id).where(
+             ActivationForm.status == "pending",
+             ActivationForm.expires_at <= soon - timedelta(days=7)
+         ).limit(1000)),
+        ("CustomerService.list_customers", "customer",
+         select(Customer).where(Customer.user_id == user_id).limit(100)),
+        ("ApplicationService.list_applications", "application",
+         select(Application).where(Application.user_id == user_id).limit(100)),
+        ("LicenseService.get_license ownership lookup", "licensekey",
+         select(LicenseKey).where(LicenseKey.id == 123, LicenseKey.owner_user_id == user_id)),
+        ("LicenseService.list_licenses", "licensekey",
+         select(LicenseKey).where(LicenseKey.owner_user_id == user_id).limit(100)),
+        ("ActivationService.list_activations_for_user", "activation",
+         select(Activation).where(Activation.owner_user_id == user_id).limit(100)),
+        ("Licenses for a customer", "licensekey",
+         select(LicenseKey).where(LicenseKey.customer_id == 77)),
+        ("Licenses for an application", "licensekey",
+         select(LicenseKey).where(LicenseKey.application_id == 77)),
+        ("Licenses expiring within a week", "licensekey",
+         select(LicenseKey).where(LicenseKey.expires_at < soon)),
+        ("StatsService.count_expiring", "licensekey",
+         select(func.count()).where(
+             LicenseKey.owner_user_id == user_id,
+             LicenseKey.status == LicenseStatus.ACTIVE,
+             LicenseKey.expires_at > soon - timedelta(days=7),
+             LicenseKey.expires_at <= soon + timedelta(days=23)
+         )),
+        ("ActivationService.reap_stale_activations candidates", "activation",
+         select(Activation.id).where(
+             Activation.status == ActivationStatus.ACTIVE,
+             Activation.last_heartbeat < soon - timedelta(days=97)
+         ).order_by(Activation.last_heartbeat).limit(500)),
+        ("Sessions for a user", "session",
+         select(DBSession).where(DBSession.user_id == user_id)),
+        ("AuthService.list_api_tokens", "apitoken",
+         select(APIToken).where(APIToken.user_id == user_id)),
+    ]
+
+
+def collect_scans(plan: dict, scans: list) -> list:
+    """Flatten (node type, relation, index) for every scan node in an EXPLAIN JSON plan"""
+    if "Relation Name" in plan or "Index Name" in plan:
+        scans.append((plan["Node Type"], plan.get("Relation Name"), plan.get("Index Name")))
+    for child in plan.get("Plans", []):
+        collect_scans(child, scans)
+    return scans
+
+
+def test_query_plans() -> bool:
+    """Seed the scratch schema and check every hot query plan"""
+    print("🔎 Query Plan Test - hot queries must use indexes")
+    print("=" * 60)
+
+    failures = 0
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.commit()
+
+    # Every connection sees only the scratch schema, alembic_version included
+    schema_engine = create_engine(
+        settings.database_url, poolclass=NullPool,
+        connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    with schema_engine.connect() as conn:
+        try:
+            config = Config(str(PROJECT_ROOT / "alembic.ini"))
+            config.attributes["connection"] = conn
+            command.upgrade(config, "head")
+            print("🏗️  Built the schema with alembic upgrade head")
+
+            for statement in SEED_SQL:
+                conn.execute(text(statement))
+            conn.execute(text("ANALYZE"))
+            print(f"🌱 Seeded {LICENSES} licenses, {ACTIVATIONS} activations, "
+                  f"{USERS * CUSTOMERS_PER_USER} customers")
+            print()
+
+            for description, table_name, statement in hot_queries():
+                compiled = statement.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True}
+                )
+                plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()[0]["Plan"]
+                scans = [scan for scan in collect_scans(plan, []) if scan[1] in (table_name, None)]
+                index_scans = [scan for scan in scans if scan[0] in INDEX_SCANS]
+                seq_scans = [scan for scan in scans if scan[0] == "Seq Scan"]
+
+                if index_scans and not seq_scans:
+                    indexes = sorted({scan[2] for scan in index_scans if scan[2]})
+                    print(f"✅ {description}: {', '.join(indexes)}")
+                else:
+                    failures += 1
+                    print(f"❌ {description}: {[scan[0] for scan in scans]} on {table_name}")
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.commit()
+    schema_engine.dispose()
+
+    print()
+    if failures:
+        print(f"❌ {failures} hot queries are not using an index")
+        return False
+    print("🎉 All hot queries use index scans")
+    return True
+
+
+if __name__ == "__main__":
+    if not test_query_plans():
+        sys.exit(1)
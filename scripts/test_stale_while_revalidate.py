@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test Stale While Revalidate - SDK license checks while the server is slow or down
+
+Runs LicenseClient and AsyncLicenseClient against a stub validation endpoint
+that can be made slow or unreachable, and checks that:
+- results close to expiry are refreshed ahead in the background
+- expired results within the grace period are returned at once and revalidated
+- is_license_valid / is_feature_enabled keep answering from the cache while the
+  server is down
+- the circuit breaker stops requests after repeated failures, fails fast while
+  open and closes again after a successful trial request
+- results past the grace period are no longer served
+- cancelled requests (closing the client, a cancelled trial) never count as
+  server failures
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+import requests
+from client_sdk.license_client import AsyncLicenseClient, CircuitOpenError, CircuitState, LicenseClient
+from scripts.sdk_stub import StubServer, stub_async_session, stub_session
+
+LICENSE_KEY = "AAAA-BBBB-CCCC-DDDD"
+TTL = 0.3
+GRACE = 1.0
+RESET_TIMEOUT = 0.3
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def timed(call) -> tuple:
+    start = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - start
+
+
+def check_sync_client() -> bool:
+    ok = True
+    session, server = stub_session()
+    client = LicenseClient("http://stub", "SwrTestApp", "1.0.0", session=session, max_retries=0,
+                           stale_grace=GRACE, refresh_ahead=0.5, breaker_threshold=3,
+                           breaker_reset_timeout=RESET_TIMEOUT)
+    client.set_cache_duration(TTL)
+
+    client.validate_license(LICENSE_KEY)
+    ok &= report("First validation calls the server", server.calls == 1)
+
+    # Past refresh_ahead but not expired: served, refreshed in the background
+    time.sleep(TTL * 0.6)
+    server.delay = 0.2
+    info, elapsed = timed(lambda: client.validate_license(LICENSE_KEY))
+    ok &= report("A result close to expiry is returned at once", elapsed < 0.05 and info.valid,
+                 f"{elapsed * 1000:.1f}ms")
+    ok &= report("...and refreshed ahead in the background",
+                 wait_for(lambda: client.validate_license(LICENSE_KEY).message.endswith("(2)")))
+    server.delay = 0.0
+
+    # Expired, server down: stale result served without waiting
+    time.sleep(TTL * 1.2)
+    server.unreachable = True
+    server.delay = 0.5
+    valid, elapsed = timed(lambda: client.is_license_valid(LICENSE_KEY))
+    feature = client.is_feature_enabled(LICENSE_KEY, "export")
+    ok &= report("Expired result is served while the server is down",
+                 valid and feature and elapsed < 0.05, f"{elapsed * 1000:.1f}ms")
+    ok &= report("...and a background revalidation was attempted", wait_for(lambda: server.calls == 3))
+    server.delay = 0.0
+
+    # Repeated failures open the circuit
+    for _ in range(3):
+        try:
+            client.validate_license(LICENSE_KEY, force_refresh=True)
+        except requests.ConnectionError:
+            pass
+    calls = server.calls
+    try:
+        _, elapsed = timed(lambda: client.validate_license(LICENSE_KEY, force_refresh=True))
+        failed_fast = False
+    except CircuitOpenError:
+        failed_fast = True
+    ok &= report("Circuit opens after 3 consecutive failures",
+                 client.circuit_breaker.state == CircuitState.OPEN and failed_fast and server.calls == calls)
+    ok &= report("License checks still answer from the cache while it is open",
+                 client.is_license_valid(LICENSE_KEY) and server.calls == calls)
+
+    # After the reset timeout one trial request goes through and closes the circuit
+    server.unreachable = False
+    time.sleep(RESET_TIMEOUT * 1.2)
+    info = client.validate_license(LICENSE_KEY, force_refresh=True)
+    ok &= report("A successful trial request closes the circuit",
+                 info.valid and client.circuit_breaker.state == CircuitState.CLOSED)
+
+    # Beyond the grace period nothing is served
+    server.unreachable = True
+    time.sleep(TTL + GRACE + 0.1)
+    ok &= report("Results past the grace period are not served", not client.is_license_valid(LICENSE_KEY))
+    client.close()
+    return ok
+
+
+async def check_async_client() -> bool:
+    ok = True
+    server = StubServer()
+    session = stub_async_session(server)
+    async with AsyncLicenseClient("http://stub", "SwrTestApp", "1.0.0", session=session, max_retries=0,
+                                  stale_grace=GRACE, refresh_ahead=0.5, breaker_threshold=3,
+                                  breaker_reset_timeout=RESET_TIMEOUT) as client:
+        client.set_cache_duration(TTL)
+        await client.validate_license(LICENSE_KEY)
+        await asyncio.sleep(TTL * 1.2)
+        server.unreachable = True
+        start = time.perf_counter()
+        valid = await client.is_license_valid(LICENSE_KEY)
+        elapsed = time.perf_counter() - start
+        ok &= report("Async client serves the expired result", valid and elapsed < 0.05,
+                     f"{elapsed * 1000:.1f}ms")
+        for _ in range(100):
+            if server.calls == 2 and not client._in_flight:
+                break
+            await asyncio.sleep(0.01)
+        ok &= report("...and revalidates it in a background task", server.calls == 2 and not client._in_flight)
+    await session.aclose()
+    return ok
+
+
+async def check_cancellation() -> bool:
+    ok = True
+    server = StubServer()
+    session = stub_async_session(server)
+    client = AsyncLicenseClient("http://stub", "SwrTestApp", "1.0.0", session=session, max_retries=0,
+                                breaker_threshold=1, breaker_reset_timeout=RESET_TIMEOUT)
+    breaker = client.circuit_breaker
+
+    # A trial request cancelled while half-open hands the trial to the next request
+    breaker.record_failure()
+    await asyncio.sleep(RESET_TIMEOUT * 1.2)
+    server.delay = 1.0
+    trial = asyncio.ensure_future(client.validate_license(LICENSE_KEY))
+    await asyncio.sleep(0.05)
+    half_open = breaker.state == CircuitState.HALF_OPEN
+    for task in list(client._in_flight.values()):
+        task.cancel()
+    await asyncio.gather(trial, return_exceptions=True)
+    ok &= report("A cancelled trial request does not leave the circuit half-open",
+                 half_open and breaker.state == CircuitState.OPEN and breaker.retry_in() == 0)
+    server.delay = 0.0
+    info = await client.validate_license(LICENSE_KEY, force_refresh=True)
+    ok &= report("...and the next request closes it", info.valid and breaker.state == CircuitState.CLOSED)
+
+    # Closing the client cancels requests still in flight
+    server.delay = 1.0
+    pending = asyncio.ensure_future(client.validate_license(LICENSE_KEY, force_refresh=True))
+    await asyncio.sleep(0.05)
+    await client.close()
+    await asyncio.gather(pending, return_exceptions=True)
+    ok &= report("Requests cancelled by close() are not counted as failures",
+                 pending.cancelled() and breaker.state == CircuitState.CLOSED and breaker.failures == 0)
+    await session.aclose()
+    return ok
+
+
+def test_stale_while_revalidate() -> bool:
+    """Check refresh-ahead, stale-while-revalidate and the circuit breaker"""
+    print("🛟 Stale While Revalidate Test - license checks with a slow or failing server")
+    print("=" * 60)
+    ok = check_sync_client()
+    ok &= asyncio.run(check_async_client())
+    ok &= asyncio.run(check_cancellation())
+    print()
+    print("🎉 Stale-while-revalidate and circuit breaker work" if ok else "❌ Stale-while-revalidate test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_stale_while_revalidate():
+        sys.exit(1)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Test Stats Counters - dashboard counters kept in step by the services
+
+Works in a throwaway schema and drives the sync services through the writes
+that move a user's dashboard counters: creating customers, applications and
+licenses, updating and deleting licenses, blocking and unblocking them, bulk
+status changes and machine activation and deactivation. After every step the
+incrementally maintained counters must equal a full recount, and another
+user's counters must not move. It also checks that the expiring-soon counts
+are worked out when the stats are read, so they follow the clock without a
+recount, and that a recount racing an uncommitted write does not overwrite
+that write's delta.
+"""
+import sys
+import os
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, text, update
+from sqlmodel import Session, SQLModel, select
+from app.database.connection import engine
+from app.models.database import Application, LicenseKey, LicenseStatus, User, UserStats
+from app.models.schemas import (
+    ApplicationCreate, CustomerCreate, LicenseBulkStatusAction, LicenseBulkStatusUpdate, LicenseKeyCreate,
+    LicenseKeyUpdate
+)
+from app.services.activation_service import ActivationService
+from app.services.application_service import ApplicationService
+from app.services.customer_service import CustomerService
+from app.services.license_service import LicenseService
+from app.services.stats_service import StatsService, record_stats_delta
+
+SCHEMA = "stats_counters_check"
+
+COUNTERS = [
+    "customers", "applications",
+    "licenses_active", "licenses_expired", "licenses_suspended", "licenses_revoked", "licenses_blocked",
+    "active_activations",
+]
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+def counters(db: Session, user_id: int) -> dict:
+    db.expire_all()
+    row = db.get(UserStats, user_id)
+    return {column: getattr(row, column) for column in COUNTERS}
+
+
+def matches_recount(db: Session, user_id: int, other_id: int, other_before: dict, description: str) -> bool:
+    """The counters after a step equal a full recount, and the other user's are unchanged"""
+    counted = counters(db, user_id)
+    StatsService(db).reconcile(user_id=user_id)
+    recounted = counters(db, user_id)
+    drift = ", ".join(f"{column} {counted[column]} vs {recounted[column]}"
+                      for column in COUNTERS if counted[column] != recounted[column])
+    return report(f"{description}: counters match a recount",
+                  not drift and counters(db, other_id) == other_before, drift)
+
+
+def seed_users(db: Session) -> tuple:
+    owner = User(username="stats-owner", email="stats-owner@example.com", full_name="Owner", password_hash="x")
+    other = User(username="stats-other", email="stats-other@example.com", full_name="Other", password_hash="x")
+    db.add(owner)
+    db.add(other)
+    db.commit()
+    for user in (owner, other):
+        StatsService(db).reconcile(user_id=user.id)
+    return db.get(User, owner.id), db.get(User, other.id)
+
+
+def check_counters(db: Session, owner: User, other: User, now: datetime) -> bool:
+    ok = True
+    other_before = counters(db, other.id)
+
+    def step(description: str) -> bool:
+        return matches_recount(db, owner.id, other.id, other_before, description)
+
+    customer = CustomerService(db).create_customer(
+        CustomerCreate(name="Customer", email="customer@example.com"), owner
+    )
+    application = ApplicationService(db).create_application(
+        ApplicationCreate(name="App", version="1.0.0"), owner
+    )
+    ok &= step("Create customer and application")
+
+    licenses = LicenseService(db)
+    created = [
+        licenses.create_license(LicenseKeyCreate(
+            customer_id=customer.id, application_id=application.id, max_activations=3,
+            expires_at=now + timedelta(days=days) if days else None
+        ), owner)
+        for days in (2, 20, 60, None)
+    ]
+    ok &= step("Create licenses")
+
+    licenses.update_license(created[1].id, LicenseKeyUpdate(status=LicenseStatus.SUSPENDED), owner)
+    licenses.update_license(created[2].id, LicenseKeyUpdate(expires_at=now + timedelta(days=5)), owner)
+    ok &= step("Update status and expiry")
+
+    licenses.block_license(created[0].id, owner)
+    ok &= step("Block a license")
+    licenses.unblock_license(created[0].id, owner)
+    ok &= step("Unblock it")
+
+    licenses.bulk_update_status(LicenseBulkStatusUpdate(
+        action=LicenseBulkStatusAction.REVOKE, status=LicenseStatus.SUSPENDED
+    ), owner)
+    ok &= step("Bulk revoke")
+    licenses.bulk_update_status(LicenseBulkStatusUpdate(
+        action=LicenseBulkStatusAction.SUSPEND, license_ids=[created[3].id]
+    ), owner)
+    ok &= step("Bulk suspend")
+
+    activations = ActivationService(db)
+    activation_ids = []
+    for machine_id in ("machine-1", "machine-2", "machine-3"):
+        result = activations.handle_activation(db.get(LicenseKey, created[0].id), machine_id)
+        activation_ids.append(result["activation_id"])
+    activations.handle_activation(db.get(LicenseKey, created[0].id), "machine-1")  # heartbeat only
+    ok &= step("Activate machines")
+
+    activations.deactivate_machine(activation_ids[0], owner)
+    ok &= step("Deactivate one machine")
+    activations.deactivate_machines(activation_ids[1:], owner)
+    ok &= step("Deactivate machines in bulk")
+
+    licenses.delete_license(created[3].id, owner)
+    ok &= step("Delete a license")
+    return ok
+
+
+def check_expiring(db: Session, owner: User, now: datetime) -> bool:
+    """Licenses left active: one expiring in 2 days and one in 5 (updated from 60)"""
+    ok = True
+    service = StatsService(db)
+    stats = service.get_stats(owner)
+    ok &= report("Expiring counts cover active licenses in each window",
+                 stats.expiring_7_days == 2 and stats.expiring_30_days == 2,
+                 f"7d={stats.expiring_7_days} 30d={stats.expiring_30_days}")
+
+    # Let time pass for one license without any write through the services
+    reconciled_at = db.get(UserStats, owner.id).reconciled_at
+    db.execute(
+        update(LicenseKey)
+        .where(LicenseKey.owner_user_id == owner.id, LicenseKey.expires_at < now + timedelta(days=3))
+        .values(expires_at=now - timedelta(minutes=1))
+    )
+    db.commit()
+    stats = service.get_stats(owner)
+    ok &= report("A license that has since expired drops out without a recount",
+                 stats.expiring_7_days == 1 and stats.expiring_30_days == 1
+                 and stats.reconciled_at == reconciled_at,
+                 f"7d={stats.expiring_7_days} 30d={stats.expiring_30_days}")
+    return ok
+
+
+def check_concurrent_reconcile(db: Session, owner: User) -> bool:
+    """A recount started while a write is still open must not lose that write's delta"""
+    application_id = db.exec(select(Application.id).where(Application.user_id == owner.id)).first()
+    before = counters(db, owner.id)["licenses_active"]
+
+    def reconcile():
+        with Session(engine) as reconcile_db:
+            StatsService(reconcile_db).reconcile(user_id=owner.id)
+
+    with Session(engine) as writer:
+        writer.add(LicenseKey(key_hash="stats-concurrent", application_id=application_id, owner_user_id=owner.id))
+        record_stats_delta(writer, owner.id, licenses_active=1)
+        writer.flush()
+        recount = threading.Thread(target=reconcile)
+        recount.start()
+        time.sleep(0.5)  # the recount now waits for the counters row
+        waited = recount.is_alive()
+        writer.commit()
+    recount.join()
+
+    counted = counters(db, owner.id)["licenses_active"]
+    StatsService(db).reconcile(user_id=owner.id)
+    recounted = counters(db, owner.id)["licenses_active"]
+    return report("A recount waits for an open write and keeps its delta",
+                  waited and counted == before + 1 == recounted,
+                  f"licenses_active {before}→{counted}, recount {recounted}")
+
+
+def test_stats_counters() -> bool:
+    """Run the counter checks against a scratch schema"""
+    print("📊 Stats Counters Test - counters against a full recount")
+    print("=" * 60)
+
+    @event.listens_for(engine, "connect")
+    def use_scratch_schema(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.close()
+
+    engine.dispose()
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            SQLModel.metadata.create_all(conn)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # expires_at is stored as naive UTC
+        with Session(engine) as db:
+            owner, other = seed_users(db)
+            ok = check_counters(db, owner, other, now)
+            ok &= check_expiring(db, owner, now)
+            ok &= check_concurrent_reconcile(db, owner)
+    finally:
+        event.remove(engine, "connect", use_scratch_schema)
+        engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print()
+    print("🎉 Dashboard counters stay in step" if ok else "❌ Stats counters test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_stats_counters():
+        sys.exit(1)
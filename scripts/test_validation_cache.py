@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test Validation Cache - the SDK's two-tier validation cache
+
+Checks ValidationCache and LicenseClient(cache_path=...) without a server:
+- the memory tier stays within max_entries (least recently used dropped)
+- entries expire after the TTL in both tiers
+- a new process (a new cache on the same file) starts warm
+- altered entries, entries from another machine and corrupt files are rejected
+- concurrent threads can share one cache
+- a restarted LicenseClient validates from disk without calling the server
+"""
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlite3
+import tempfile
+import threading
+import time
+from client_sdk.license_client import LicenseClient, LicenseStatus
+from client_sdk.utils.validation_cache import ValidationCache
+from scripts.sdk_stub import stub_session
+
+RESPONSE = {
+    "valid": True, "license_id": 1, "customer_id": 1, "application_id": 1, "status": "active",
+    "expires_at": None, "features": {"export": True}, "remaining_activations": 2, "message": "License is valid"
+}
+
+
+def report(description: str, ok: bool, details: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {description}" + (f" ({details})" if details else ""))
+    return ok
+
+
+def check_cache(directory: str) -> bool:
+    ok = True
+    path = os.path.join(directory, "cache", "validations.db")
+    key = ValidationCache.entry_key("AAAA-BBBB-CCCC-DDDD", "machine-1")
+
+    # Bounded memory
+    cache = ValidationCache(ttl=60, max_entries=100, path=path, secret=b"machine-1")
+    for i in range(1000):
+        cache.set(ValidationCache.entry_key(f"KEY-{i}", "machine-1"), {"n": i})
+    first = ValidationCache.entry_key("KEY-0", "machine-1")
+    ok &= report("Memory tier is bounded", len(cache) == 100, f"{len(cache)} of 1000 entries in memory")
+    ok &= report("Evicted entries are still found on disk",
+                 cache.get(first, disk=False) is None and cache.get(first) == {"n": 0})
+
+    # Persistence across processes
+    cache.set(key, RESPONSE)
+    cache.close()
+    reopened = ValidationCache(ttl=60, path=path, secret=b"machine-1")
+    ok &= report("A new cache on the same file starts warm", reopened.get(key) == RESPONSE)
+    reopened.close()
+
+    # Another machine's secret does not verify
+    other = ValidationCache(ttl=60, path=path, secret=b"machine-2")
+    ok &= report("Entries copied from another machine are rejected", other.get(key) is None)
+    other.close()
+
+    # A stored entry altered outside the cache (its checksum no longer matches)
+    cache = ValidationCache(ttl=60, path=path, secret=b"machine-1")
+    cache.set(key, RESPONSE)
+    cache.close()
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE validations SET payload = replace(payload, 'active', 'forged') WHERE entry_key = ?", (key,))
+        db.execute("UPDATE validations SET stored_at = stored_at + 3600")
+    cache = ValidationCache(ttl=60, path=path, secret=b"machine-1")
+    ok &= report("Altered entries fail the integrity check", cache.get(key) is None)
+    cache.close()
+
+    # TTL in both tiers
+    cache = ValidationCache(ttl=0.2, path=path, secret=b"machine-1")
+    cache.set(key, RESPONSE)
+    time.sleep(0.3)
+    ok &= report("Entries expire after the TTL", cache.get(key) is None)
+    cache.close()
+
+    # Corrupt file
+    with open(path, "wb") as f:
+        f.write(b"not a database" * 100)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    cache = ValidationCache(ttl=60, path=path, secret=b"machine-1")
+    cache.set(key, RESPONSE)
+    ok &= report("A corrupt cache file is replaced", cache.persistent and cache.get(key) == RESPONSE)
+
+    # Threads sharing one cache
+    errors = []
+
+    def worker(n: int):
+        try:
+            for i in range(200):
+                entry = ValidationCache.entry_key(f"T{n}-{i % 50}", "machine-1")
+                cache.set(entry, {"n": i})
+                cache.get(entry)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ok &= report("Concurrent threads share the cache", not errors and cache.persistent,
+                 f"{len(errors)} errors" if errors else "8 threads x 200 set/get")
+    cache.close()
+    return ok
+
+
+def check_client(directory: str) -> bool:
+    ok = True
+    path = os.path.join(directory, "client.db")
+
+    session, server = stub_session()
+    with LicenseClient("http://stub", "CacheTestApp", "1.0.0", session=session, cache_path=path) as client:
+        client.validate_license("AAAA-BBBB-CCCC-DDDD")
+        client.validate_license("AAAA-BBBB-CCCC-DDDD")
+    ok &= report("Repeated validation is served from the cache", server.calls == 1)
+
+    # The application restarts
+    session, server = stub_session()
+    with LicenseClient("http://stub", "CacheTestApp", "1.0.0", session=session, cache_path=path) as client:
+        info = client.validate_license("AAAA-BBBB-CCCC-DDDD")
+        ok &= report("Cold start validates from disk", server.calls == 0 and info.status == LicenseStatus.ACTIVE)
+        client.clear_cache()
+    session, server = stub_session()
+    with LicenseClient("http://stub", "CacheTestApp", "1.0.0", session=session, cache_path=path) as client:
+        client.validate_license("AAAA-BBBB-CCCC-DDDD")
+    ok &= report("clear_cache() also clears the disk tier", server.calls == 1)
+    return ok
+
+
+def test_validation_cache() -> bool:
+    """Check bounds, TTLs, persistence, integrity and thread safety"""
+    print("💾 Validation Cache Test - memory LRU + SQLite")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as directory:
+        ok = check_cache(directory)
+        ok &= check_client(directory)
+    print()
+    print("🎉 Validation cache works" if ok else "❌ Validation cache test failed")
+    return ok
+
+
+if __name__ == "__main__":
+    if not test_validation_cache():
+        sys.exit(1)